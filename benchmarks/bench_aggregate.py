@@ -0,0 +1,82 @@
+"""
+Benchmark: operador de agregación por hash vs pandas.groupby.agg.
+
+Agrega N filas con varias métricas por columna (sum, mean, min, max, count)
+para distintas cardinalidades de la clave, en una pasada (batch) y como
+parciales por chunks combinados (streaming/paralelo). La clave se prueba como
+string y como `category`.
+
+Uso:
+    python benchmarks/bench_aggregate.py --rows 2000000
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position
+from harness import bench_parser, timed
+from dsl.dsl_aggregate import finalize_aggregate, merge_partials, partial_aggregate
+
+PARAMS = {"group_by": "clave",
+          "metrics": {"importe": ["sum", "mean", "min", "max"], "cantidad": ["sum", "count"]}}
+
+
+def pandas_groupby(df: pd.DataFrame) -> pd.DataFrame:
+    """Referencia: groupby.agg con named aggregation (la implementación anterior)."""
+    return df.groupby("clave").agg(
+        importe_sum=("importe", "sum"), importe_mean=("importe", "mean"),
+        importe_min=("importe", "min"), importe_max=("importe", "max"),
+        cantidad_sum=("cantidad", "sum"), cantidad_count=("cantidad", "count"),
+    ).reset_index()
+
+
+def hash_batch(df: pd.DataFrame) -> pd.DataFrame:
+    """Operador por hash en una pasada."""
+    return finalize_aggregate(partial_aggregate(df, PARAMS), PARAMS)
+
+
+def hash_chunked(df: pd.DataFrame, chunks: int = 8) -> pd.DataFrame:
+    """Parciales por chunk combinados al final."""
+    size = -(-len(df) // chunks)
+    partials = [partial_aggregate(df.iloc[i:i + size], PARAMS) for i in range(0, len(df), size)]
+    return finalize_aggregate(merge_partials(partials), PARAMS)
+
+
+def best_of_three(func, df) -> float:
+    """Mejor de tres corridas, en segundos."""
+    return min(timed(lambda: func(df))[0] for _ in range(3))
+
+
+def main():
+    """Punto de entrada del benchmark."""
+    parser = bench_parser(__doc__)
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"Filas: {args.rows:,}\n")
+    print(f"{'grupos':>10} {'clave':<9}{'pandas s':>10}{'hash s':>10}"
+          f"{'chunks s':>10}{'speedup':>9}")
+    for cardinality in (10, 1_000, 100_000, 1_000_000):
+        codes = rng.integers(0, cardinality, args.rows)
+        df = pd.DataFrame({
+            "clave": pd.Series(codes).map(lambda code: f"k{code:07d}"),
+            "importe": rng.random(args.rows) * 100,
+            "cantidad": rng.integers(0, 20, args.rows),
+        })
+        for label in ("string", "category"):
+            if label == "category":
+                df["clave"] = df["clave"].astype("category")
+            reference = best_of_three(pandas_groupby, df)
+            batch = best_of_three(hash_batch, df)
+            chunked = best_of_three(hash_chunked, df)
+            print(f"{cardinality:>10,} {label:<9}{reference:>10.3f}{batch:>10.3f}"
+                  f"{chunked:>10.3f}{reference / batch:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
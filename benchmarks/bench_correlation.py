@@ -0,0 +1,56 @@
+"""
+Benchmark: matriz de correlación de un CSV ancho con pandas vs por chunks.
+
+Compara `read_csv().corr()` con `correlation.correlation` leyendo por chunks
+(un proceso y `--workers` procesos). Cada variante corre en un proceso aparte
+para medir su RSS máximo, y se reporta la diferencia máxima contra pandas.
+
+Uso:
+    python benchmarks/bench_correlation.py --rows 2000000 --columns 20 --workers 4
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position
+from bench_outliers import wide_csv
+from harness import bench_parser, run_case, work_dir
+from correlation import correlation
+
+
+def pandas_corr(src, _args):
+    """Carga el CSV entero y usa DataFrame.corr()."""
+    return pd.read_csv(src).corr()
+
+
+def chunked(workers):
+    """Acumulador por chunks con `workers` procesos."""
+    return lambda src, args: correlation(src, chunk_rows=args.chunk_rows, workers=workers)
+
+
+def main():
+    """Punto de entrada del benchmark."""
+    parser = bench_parser(__doc__, workers_help="Procesos de la variante paralela")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Filas del CSV")
+    parser.add_argument("--columns", type=int, default=20, help="Columnas numéricas")
+    parser.add_argument("--chunk-rows", type=int, default=100_000, help="Filas por chunk")
+    args = parser.parse_args()
+
+    with work_dir() as tmp:
+        src = wide_csv(tmp, args)
+        print(f"{'variante':<24}{'segundos':>10}{'RSS MB':>9}{'dif. máx':>12}")
+        expected = None
+        for label, variant in [("pandas", pandas_corr), ("chunks", chunked(1)),
+                               (f"chunks ({args.workers} procesos)", chunked(args.workers))]:
+            seconds, rss, matrix = run_case(variant, src, args)
+            expected = matrix if expected is None else expected
+            diff = float(np.nanmax(np.abs(matrix.to_numpy() - expected.to_numpy())))
+            print(f"{label:<24}{seconds:>10.2f}{rss:>9.0f}{diff:>12.1e}")
+
+
+if __name__ == "__main__":
+    main()
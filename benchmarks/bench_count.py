@@ -0,0 +1,43 @@
+"""
+Benchmark: contar filas y previsualizar un CSV sin parsearlo entero.
+
+Compara `len(pd.read_csv(...))` contra el recorrido memory-mapped de saltos de
+línea (csv_scan.py), y la lectura completa contra leer sólo las primeras filas.
+
+Uso:
+    python benchmarks/bench_count.py --mb 500
+"""
+import os
+import sys
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position
+from harness import bench_parser, sales_csv, timed, work_dir
+import datasets
+from csv_scan import count_lines
+
+
+def main():
+    """Punto de entrada del benchmark."""
+    args = bench_parser(__doc__, mb_help="Tamaño del CSV de entrada").parse_args()
+
+    with work_dir() as tmp:
+        src = sales_csv(tmp, args.mb)
+
+        print(f"CSV: {os.path.getsize(src) / 1e6:,.0f} MB\n")
+        print(f"{'operación':<32}{'segundos':>10}{'resultado':>14}")
+        for name, func in [
+            ("len(read_csv)", lambda: len(pd.read_csv(src))),
+            ("count_lines (mmap)", lambda: count_lines(src) - 1),
+            ("read_csv completo + head(10)", lambda: len(pd.read_csv(src).head(10))),
+            ("read_head(10)", lambda: len(datasets.read_head(src, 10))),
+        ]:
+            seconds, result = timed(func)
+            print(f"{name:<32}{seconds:>10.3f}{result:>14,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark: deduplicar un CSV por una columna con pandas vs `dedupe_csv`.
+
+Cada variante corre en un proceso aparte para medir su RSS máximo: pandas
+carga el archivo entero; `dedupe_csv` guarda sólo un hash por fila (o
+particiona a disco con `--memory-mb`), y la estimación con filtro de Bloom no
+escribe salida.
+
+Uso:
+    python benchmarks/bench_dedupe.py --mb 500 --memory-mb 16
+"""
+import os
+import sys
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position
+from harness import bench_parser, run_case, sales_csv, work_dir
+from dedupe import DEFAULT_MEMORY_MB
+from functions.data_ops import dedupe_csv
+
+
+def pandas_dedupe(src, out, _args):
+    """Deduplica cargando todo el CSV."""
+    df = pd.read_csv(src)
+    unique = df.drop_duplicates("id")
+    unique.to_csv(out, index=False)
+    return f"{len(df) - len(unique)} duplicadas"
+
+
+def exact(memory_mb):
+    """Variante exacta con el presupuesto dado."""
+    return lambda src, out, _args: dedupe_csv(src, out, columns="id", memory_mb=memory_mb)
+
+
+def bloom(src, _out, _args):
+    """Sólo la estimación con filtro de Bloom."""
+    return dedupe_csv(src, columns="id", approximate=True)
+
+
+def main():
+    """Punto de entrada del benchmark."""
+    parser = bench_parser(__doc__, mb_help="Tamaño del CSV de entrada")
+    parser.add_argument("--memory-mb", type=float, default=8,
+                        help="Presupuesto de la variante particionada")
+    args = parser.parse_args()
+
+    # Las particiones van a .orion_cache/spill relativo al cwd
+    with work_dir() as tmp:
+        src = sales_csv(tmp, args.mb)
+        print(f"CSV: {os.path.getsize(src) / 1e6:,.0f} MB\n")
+        print(f"{'variante':<26}{'segundos':>10}{'RSS MB':>9}  resultado")
+        for label, variant in [("pandas", pandas_dedupe),
+                               ("dedupe_csv", exact(DEFAULT_MEMORY_MB)),
+                               (f"dedupe_csv ({args.memory_mb:g} MB)", exact(args.memory_mb)),
+                               ("estimación (Bloom)", bloom)]:
+            seconds, rss, result = run_case(variant, src, os.path.join(tmp, "unicos.csv"), args)
+            print(f"{label:<26}{seconds:>10.2f}{rss:>9.0f}  {result.split(': ', 1)[-1]}")
+
+
+if __name__ == "__main__":
+    main()
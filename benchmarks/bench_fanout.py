@@ -0,0 +1,78 @@
+"""
+Benchmark: pipeline DSL sobre una fuente particionada con distinto paralelismo.
+
+Genera N archivos CSV diarios y ejecuta el mismo pipeline de agregación sobre
+el directorio con 1, 2, 4... procesos, mostrando tiempo y throughput.
+
+Uso:
+    python benchmarks/bench_fanout.py --files 8 --rows 500000
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position
+from harness import bench_parser, timed, work_dir
+from dsl.dsl_engine import execute_dsl
+
+
+def build_partitions(parts_dir: str, files: int, rows: int):
+    """Escribe `files` CSVs de `rows` filas cada uno."""
+    rng = np.random.default_rng(7)
+    for day in range(files):
+        pd.DataFrame({
+            "region": rng.choice(["norte", "sur", "este", "oeste"], rows),
+            "cantidad": rng.integers(0, 100, rows),
+            "precio": rng.random(rows) * 1000,
+            "nota": ["sin observaciones"] * rows,
+        }).to_csv(os.path.join(parts_dir, f"ventas_{day:03d}.csv"), index=False)
+
+
+def run_case(parts_dir: str, out_dir: str, workers: int) -> dict:
+    """Ejecuta el pipeline de referencia con `workers` procesos."""
+    dsl = {
+        "source": {"type": "csv", "path": parts_dir},
+        "steps": [
+            {"filter": {"column": "cantidad", "op": ">=", "value": 10}},
+            {"aggregate": {"group_by": "region",
+                           "metrics": {"cantidad": "sum", "precio": "mean"}}},
+        ],
+        "output": {"type": "csv", "path": os.path.join(out_dir, f"out_{workers}.csv")},
+    }
+    seconds, stats = timed(lambda: execute_dsl(dsl, workers=workers))
+    stats["seconds"] = seconds
+    return stats
+
+
+def main():
+    """Punto de entrada del benchmark."""
+    parser = bench_parser(__doc__)
+    parser.add_argument("--files", type=int, default=8)
+    parser.add_argument("--rows", type=int, default=250_000)
+    args = parser.parse_args()
+
+    with work_dir() as tmp:
+        parts_dir = os.path.join(tmp, "diario")
+        os.makedirs(parts_dir)
+        build_partitions(parts_dir, args.files, args.rows)
+
+        print(f"Archivos: {args.files}  Filas por archivo: {args.rows:,}  "
+              f"CPUs: {os.cpu_count()}\n")
+        print(f"{'workers':<10}{'segundos':>10}{'filas/s':>14}{'speedup':>10}")
+        baseline = None
+        workers = 1
+        while workers <= min(args.files, os.cpu_count() or 1):
+            stats = run_case(parts_dir, tmp, workers)
+            baseline = baseline or stats["seconds"]
+            print(f"{workers:<10}{stats['seconds']:>10.3f}"
+                  f"{stats['rows_in'] / stats['seconds']:>14,.0f}"
+                  f"{baseline / stats['seconds']:>10.2f}")
+            workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark: handoff en memoria entre pasos de un pipeline vs materializar a disco.
+
+Ejecuta el mismo pipeline (transform_data -> analyze_data -> convert_csv_to_json)
+con el intermedio pasado en memoria y con todos los intermedios escritos a
+disco, y muestra el tiempo y el I/O contra el disco de cada variante.
+
+Uso:
+    python benchmarks/bench_handoff.py --rows 1000000
+"""
+import contextlib
+import io
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position
+from harness import bench_parser, timed, work_dir
+import datasets
+from runner import run_pipeline
+
+PIPELINE = """pipeline:
+  name: bench_handoff
+  steps:
+    - action: transform_data
+      input: ventas.csv
+      output: out/ventas_filtradas.csv
+      steps:
+        - filter: {column: cantidad, op: ">=", value: 10}
+        - select_columns: {columns: [region, cantidad, precio]}
+    - action: analyze_data
+      input: out/ventas_filtradas.csv
+      output: out/analisis.json
+    - action: convert_csv_to_json
+      input: out/ventas_filtradas.csv
+      output: out/ventas_filtradas.json
+"""
+
+
+def run_case(materialize: bool) -> dict:
+    """Ejecuta el pipeline (sin cache) y devuelve tiempo e I/O."""
+    datasets.reset_io_stats()
+    with contextlib.redirect_stdout(io.StringIO()):
+        seconds, _ = timed(lambda: run_pipeline("pipeline.yaml", force=True,
+                                                materialize=materialize))
+    stats = dict(datasets.io_stats)
+    stats["seconds"] = seconds
+    return stats
+
+
+def main():
+    """Punto de entrada del benchmark."""
+    parser = bench_parser(__doc__)
+    parser.add_argument("--rows", type=int, default=500_000)
+    args = parser.parse_args()
+
+    # El dispatcher normaliza rutas a relativas: trabajar dentro del temp dir
+    with work_dir():
+        rng = np.random.default_rng(0)
+        pd.DataFrame({
+            "region": rng.choice(["norte", "sur", "este", "oeste"], args.rows),
+            "cantidad": rng.integers(0, 50, args.rows),
+            "precio": rng.random(args.rows) * 100,
+            "nota": ["sin observaciones"] * args.rows,
+        }).to_csv("ventas.csv", index=False)
+        with open("pipeline.yaml", "w", encoding="utf-8") as f:
+            f.write(PIPELINE)
+
+        print(f"Filas: {args.rows:,}\n")
+        print(f"{'variante':<14}{'segundos':>10}{'lecturas':>10}{'MB leídos':>11}"
+              f"{'escrituras':>12}{'MB escritos':>13}{'handoffs':>10}")
+        for label, materialize in (("materializado", True), ("en memoria", False)):
+            stats = run_case(materialize)
+            print(f"{label:<14}{stats['seconds']:>10.3f}{stats['reads']:>10}"
+                  f"{stats['bytes_read'] / 1e6:>11.1f}{stats['writes']:>12}"
+                  f"{stats['bytes_written'] / 1e6:>13.1f}{stats['memory_reads']:>10}")
+
+
+if __name__ == "__main__":
+    main()
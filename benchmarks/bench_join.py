@@ -0,0 +1,68 @@
+"""
+Benchmark: join de un CSV grande con una tabla chica, con pandas vs `join_csv`.
+
+Cada variante corre en un proceso aparte para medir su RSS máximo: pandas
+carga los dos archivos y el resultado entero; `join_csv` carga sólo la tabla
+chica y escribe el resultado por chunks. La variante "grace" fuerza el
+particionado a disco con un presupuesto de `--memory-mb`.
+
+Uso:
+    python benchmarks/bench_join.py --mb 500 --dim-rows 1000000 --memory-mb 16
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position
+from harness import bench_parser, run_case, sales_csv, work_dir
+from functions.data_ops import join_csv
+from hash_join import DEFAULT_MEMORY_MB
+
+
+def write_dimension(src: str, path: str, rows: int):
+    """Tabla chica con los primeros `rows` ids del CSV grande y un atributo por id."""
+    ids = pd.read_csv(src, usecols=["id"], nrows=rows)["id"].unique()
+    rng = np.random.default_rng(1)
+    pd.DataFrame({"id": ids, "segmento": rng.choice(["a", "b", "c"], len(ids)),
+                  "score": rng.random(len(ids))}).to_csv(path, index=False)
+
+
+def pandas_join(src, dim, out, _args):
+    """Join cargando los dos CSV."""
+    pd.read_csv(src).merge(pd.read_csv(dim), on="id").to_csv(out, index=False)
+
+
+def hash_join(memory_mb):
+    """Variante con `join_csv` y el presupuesto dado para la tabla chica."""
+    return lambda src, dim, out, _args: join_csv(src, dim, "id", out, memory_mb=memory_mb)
+
+
+def main():
+    """Punto de entrada del benchmark."""
+    parser = bench_parser(__doc__, mb_help="Tamaño del CSV grande")
+    parser.add_argument("--dim-rows", type=int, default=500_000, help="Filas de la tabla chica")
+    parser.add_argument("--memory-mb", type=float, default=8,
+                        help="Presupuesto de la variante grace")
+    args = parser.parse_args()
+
+    # Las particiones van a .orion_cache/spill relativo al cwd
+    with work_dir() as tmp:
+        src, dim = sales_csv(tmp, args.mb), os.path.join(tmp, "clientes.csv")
+        write_dimension(src, dim, args.dim_rows)
+        print(f"CSV: {os.path.getsize(src) / 1e6:,.0f} MB, tabla chica: "
+              f"{os.path.getsize(dim) / 1e6:,.1f} MB\n")
+        print(f"{'variante':<24}{'segundos':>10}{'RSS MB':>9}")
+        for label, variant in [("pandas", pandas_join),
+                               ("join_csv", hash_join(DEFAULT_MEMORY_MB)),
+                               (f"join_csv (grace {args.memory_mb:g} MB)",
+                                hash_join(args.memory_mb))]:
+            seconds, rss, _ = run_case(variant, src, dim, os.path.join(tmp, "unido.csv"), args)
+            print(f"{label:<24}{seconds:>10.2f}{rss:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark: conversión CSV -> JSON en memoria vs por chunks.
+
+Compara la conversión anterior (cargar todo el CSV, `to_dict(orient="records")`
+y `json.dump(indent=4)`) con `convert_csv_to_json` por chunks en sus tres
+variantes (array indentado, array compacto y NDJSON). Cada variante corre en un
+proceso aparte para medir su RSS máximo sin arrastrar el de las anteriores.
+
+Uso:
+    python benchmarks/bench_json.py --mb 2000
+"""
+import json
+import os
+import sys
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position
+from harness import bench_parser, run_case, sales_csv, work_dir
+from functions.data_ops import convert_csv_to_json
+
+
+def legacy_convert(input_path, output_path):
+    """La conversión anterior: todo el archivo como lista de dicts en RAM."""
+    df = pd.read_csv(input_path)
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(df.to_dict(orient="records"), f, indent=4)
+
+
+VARIANTS = {
+    "anterior": lambda src, out: legacy_convert(src, out + ".json"),
+    "json": lambda src, out: convert_csv_to_json(src, out + ".json"),
+    "json compacto": lambda src, out: convert_csv_to_json(src, out + ".json", compact=True),
+    "ndjson": lambda src, out: convert_csv_to_json(src, out + ".ndjson"),
+}
+
+
+def main():
+    """Punto de entrada del benchmark."""
+    parser = bench_parser(__doc__, mb_help="Tamaño del CSV de entrada")
+    parser.add_argument("--skip-legacy", action="store_true",
+                        help="No correr la conversión anterior (si no entra en RAM)")
+    args = parser.parse_args()
+
+    with work_dir() as tmp:
+        src = sales_csv(tmp, args.mb)
+        size_mb = os.path.getsize(src) / 1e6
+        print(f"CSV: {size_mb:,.0f} MB\n")
+        print(f"{'variante':<15}{'segundos':>10}{'MB/s':>8}{'RSS MB':>9}{'salida MB':>11}")
+        for label, variant in VARIANTS.items():
+            if label == "anterior" and args.skip_legacy:
+                continue
+            out = os.path.join(tmp, label.replace(" ", "_"))
+            seconds, rss, _ = run_case(variant, src, out)
+            out_path = out + (".ndjson" if label == "ndjson" else ".json")
+            print(f"{label:<15}{seconds:>10.2f}{size_mb / seconds:>8.1f}{rss:>9.0f}"
+                  f"{os.path.getsize(out_path) / 1e6:>11.0f}")
+            os.remove(out_path)
+
+
+if __name__ == "__main__":
+    main()
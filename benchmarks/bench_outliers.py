@@ -0,0 +1,83 @@
+"""
+Benchmark: outliers de todas las columnas numéricas de un CSV ancho.
+
+Compara llamar a `detect_outliers` una vez por columna, `detect_outliers_all`
+en memoria (todas las columnas con una matriz NumPy) y `detect_outliers_all`
+en streaming (dos pasadas por chunks, cuartiles aproximados). Cada variante
+corre en un proceso aparte para medir su RSS máximo, sobre su propia copia del
+CSV (así ninguna aprovecha la copia columnar que dejó otra).
+
+Uso:
+    python benchmarks/bench_outliers.py --rows 2000000 --columns 20
+"""
+import os
+import shutil
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position
+from harness import bench_parser, run_case, work_dir
+from core.plugins.data_analyzer.plugin import DataAnalyzerPlugin
+from registry import get_function
+
+
+def write_wide_csv(path: str, rows: int, columns: int):
+    """CSV con `columns` columnas numéricas con colas pesadas."""
+    rng = np.random.default_rng(0)
+    block = 200_000
+    with open(path, "w", encoding="utf-8") as f:
+        for start in range(0, rows, block):
+            size = min(block, rows - start)
+            pd.DataFrame({f"m{i}": np.round(rng.standard_t(3, size) * 10, 3)
+                          for i in range(columns)}).to_csv(f, index=False, header=start == 0)
+
+
+def wide_csv(tmp: str, args) -> str:
+    """Escribe el CSV ancho de `--rows` x `--columns` en `tmp` y lo describe."""
+    src = os.path.join(tmp, "metricas.csv")
+    write_wide_csv(src, args.rows, args.columns)
+    print(f"CSV: {os.path.getsize(src) / 1e6:,.0f} MB, {args.rows:,} filas x "
+          f"{args.columns} columnas\n")
+    return src
+
+
+def per_column(src, _args):
+    """Una llamada a detect_outliers por columna."""
+    detect = get_function("detect_outliers")["function"]
+    for column in pd.read_csv(src, nrows=0).columns:
+        detect(src, column)
+
+
+def all_columns(streaming):
+    """detect_outliers_all, en memoria o en streaming."""
+    return lambda src, _args: get_function("detect_outliers_all")["function"](
+        src, streaming=streaming)
+
+
+def main():
+    """Punto de entrada del benchmark."""
+    parser = bench_parser(__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Filas del CSV")
+    parser.add_argument("--columns", type=int, default=20, help="Columnas numéricas")
+    args = parser.parse_args()
+
+    # La copia columnar va a .orion_cache relativo al cwd
+    with work_dir() as tmp:
+        src = wide_csv(tmp, args)
+        print(f"{'variante':<28}{'segundos':>10}{'RSS MB':>9}")
+        for index, (label, variant) in enumerate([
+                ("detect_outliers x columna", per_column),
+                ("detect_outliers_all", all_columns(False)),
+                ("detect_outliers_all (stream)", all_columns(True))]):
+            copy = shutil.copy(src, os.path.join(tmp, f"metricas_{index}.csv"))
+            seconds, rss, _ = run_case(variant, copy, args,
+                                       setup=DataAnalyzerPlugin().register_functions)
+            print(f"{label:<28}{seconds:>10.2f}{rss:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
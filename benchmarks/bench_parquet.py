@@ -0,0 +1,87 @@
+"""
+Benchmark: pipeline DSL sobre CSV vs Parquet (con proyección y filtros empujados).
+
+Genera un dataset sintético ordenado por fecha, lo guarda como CSV y como
+Parquet (varios row groups) y ejecuta el mismo pipeline sobre ambos.
+
+Uso:
+    python benchmarks/bench_parquet.py --rows 2000000
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position
+from harness import bench_parser, timed, work_dir
+from dsl.dsl_engine import execute_dsl
+
+
+def build_dataset(rows: int) -> pd.DataFrame:
+    """Dataset ancho con una columna `dia` creciente (útil para podar row groups)."""
+    rng = np.random.default_rng(42)
+    data = {
+        "dia": np.arange(rows) // max(1, rows // 365),
+        "region": rng.choice(["norte", "sur", "este", "oeste"], rows),
+        "cantidad": rng.integers(0, 100, rows),
+        "precio": rng.random(rows) * 1000,
+    }
+    for i in range(8):
+        data[f"extra_{i}"] = rng.random(rows)
+    return pd.DataFrame(data)
+
+
+def run_case(source_type: str, path: str, out_dir: str, streaming: bool) -> dict:
+    """Ejecuta el pipeline de referencia y mide el tiempo."""
+    dsl = {
+        "source": {"type": source_type, "path": path},
+        "steps": [
+            {"filter": {"column": "dia", "op": ">=", "value": 330}},
+            {"select_columns": {"columns": ["region", "cantidad", "precio"]}},
+            {"aggregate": {"group_by": "region",
+                           "metrics": {"cantidad": "sum", "precio": "mean"}}},
+        ],
+        "output": {"type": "csv", "path": os.path.join(out_dir, f"out_{source_type}.csv")},
+    }
+    seconds, stats = timed(lambda: execute_dsl(dsl, streaming=streaming))
+    stats["seconds"] = seconds
+    return stats
+
+
+def main():
+    """Punto de entrada del benchmark."""
+    parser = bench_parser(__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--row-group-size", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with work_dir() as tmp:
+        df = build_dataset(args.rows)
+        csv_path = os.path.join(tmp, "datos.csv")
+        parquet_path = os.path.join(tmp, "datos.parquet")
+        df.to_csv(csv_path, index=False)
+        df.to_parquet(parquet_path, index=False, row_group_size=args.row_group_size)
+        del df
+
+        print(f"Filas: {args.rows:,}")
+        print(f"CSV:     {os.path.getsize(csv_path) / 1e6:8.1f} MB")
+        print(f"Parquet: {os.path.getsize(parquet_path) / 1e6:8.1f} MB\n")
+
+        print(f"{'fuente':<10}{'modo':<11}{'segundos':>10}{'MB leídos':>12}{'row groups':>12}")
+        for streaming in (False, True):
+            mode = "streaming" if streaming else "batch"
+            csv_stats = run_case("csv", csv_path, tmp, streaming)
+            pq_stats = run_case("parquet", parquet_path, tmp, streaming)
+            scan = pq_stats["scan"]
+            print(f"{'csv':<10}{mode:<11}{csv_stats['seconds']:>10.3f}"
+                  f"{os.path.getsize(csv_path) / 1e6:>12.1f}{'-':>12}")
+            print(f"{'parquet':<10}{mode:<11}{pq_stats['seconds']:>10.3f}"
+                  f"{scan['bytes_read'] / 1e6:>12.1f}"
+                  f"{scan['row_groups_read']:>6}/{scan['row_groups_total']:<5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark: analyze_data exacto vs con muestreo (bloques y reservoir).
+
+Mide el análisis completo por chunks, el muestreo por bloques (la primera vez
+construye el índice de offsets, después lo reutiliza) y el reservoir en una
+pasada, junto con el error real de la media de `precio` y la cota reportada.
+
+Uso:
+    python benchmarks/bench_sampling.py --mb 500
+"""
+import functools
+import json
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position
+from harness import bench_parser, sales_csv, timed, work_dir
+import datasets
+import sampling
+from functions.data_ops import analyze_data
+
+
+def main():
+    """Punto de entrada del benchmark."""
+    parser = bench_parser(__doc__, mb_help="Tamaño del CSV de entrada")
+    parser.add_argument("--sample", type=int, default=sampling.DEFAULT_SAMPLE_ROWS,
+                        help="Filas de la muestra")
+    args = parser.parse_args()
+
+    with work_dir() as tmp:
+        src = sales_csv(tmp, args.mb)
+        out = os.path.join(tmp, "analisis.json")
+        sampling.row_index = sampling.RowIndex(cache_dir=os.path.join(tmp, "offsets"))
+        # Sin copia columnar: medir contra el CSV
+        datasets.sidecar_cache.min_bytes = float("inf")
+
+        print(f"CSV: {os.path.getsize(src) / 1e6:,.0f} MB, muestra de {args.sample:,} filas\n")
+        print(f"{'modo':<28}{'segundos':>10}{'media precio':>16}{'cota 95%':>12}")
+        exact = None
+        for name, kwargs in [
+            ("exacto (streaming)", {"streaming": True}),
+            ("bloques (índice nuevo)", {"sample": args.sample, "sample_method": "blocks"}),
+            ("bloques (índice cacheado)", {"sample": args.sample, "sample_method": "blocks"}),
+            ("reservoir", {"sample": args.sample, "sample_method": "reservoir"}),
+        ]:
+            datasets.dataset_cache.clear()
+            seconds, _ = timed(functools.partial(analyze_data, src, out, **kwargs))
+            with open(out, "r", encoding="utf-8") as f:
+                analysis = json.load(f)
+            mean = analysis["estadisticas"]["precio"]["mean"]
+            exact = mean if exact is None else exact
+            bound = analysis.get("muestra", {}).get("error_media", {}).get("precio", 0.0)
+            print(f"{name:<28}{seconds:>10.3f}{mean:>16.4f}{bound:>12.4f}")
+        print(f"\nMedia exacta: {exact:.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Benchmark: lectura de un CSV parseándolo vs desde su copia columnar (sidecar).
+
+Mide la primera lectura (parseo + escritura de la copia Feather), una lectura
+desde la copia memory-mapped en un "proceso nuevo" (sin la cache en memoria)
+y un recorrido por chunks desde la copia.
+
+Uso:
+    python benchmarks/bench_sidecar.py --mb 500
+"""
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position
+from harness import bench_parser, sales_csv, timed, work_dir
+import datasets
+from sidecar import SidecarCache
+
+
+def main():
+    """Punto de entrada del benchmark."""
+    args = bench_parser(__doc__, mb_help="Tamaño del CSV de entrada").parse_args()
+
+    with work_dir() as tmp:
+        src = sales_csv(tmp, args.mb)
+        datasets.sidecar_cache = SidecarCache(cache_dir=os.path.join(tmp, "columnar"))
+
+        def fresh_load():
+            datasets.dataset_cache.clear()
+            datasets.load_dataset(src)
+
+        def fresh_chunks():
+            datasets.dataset_cache.clear()
+            for _ in datasets.iter_dataset(src, 100_000):
+                pass
+
+        print(f"CSV: {os.path.getsize(src) / 1e6:,.0f} MB\n")
+        print(f"{'lectura':<32}{'segundos':>10}")
+        print(f"{'CSV (parseo + copia columnar)':<32}{timed(fresh_load)[0]:>10.3f}")
+        print(f"{'copia columnar (mmap)':<32}{timed(fresh_load)[0]:>10.3f}")
+        print(f"{'copia columnar por chunks':<32}{timed(fresh_chunks)[0]:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
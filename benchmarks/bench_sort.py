@@ -0,0 +1,52 @@
+"""
+Benchmark: ordenar un CSV con pandas vs con el sort externo (`sort_csv`).
+
+Cada variante corre en un proceso aparte para medir su RSS máximo: pandas
+carga el archivo entero, el sort externo queda acotado por `--run-rows`.
+
+Uso:
+    python benchmarks/bench_sort.py --mb 1000 --run-rows 500000 --workers 4
+"""
+import os
+import sys
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position
+from harness import bench_parser, run_case, sales_csv, work_dir
+from functions.data_ops import sort_csv
+
+
+def pandas_sort(src, out, _args):
+    """Ordena cargando todo el CSV."""
+    pd.read_csv(src).sort_values("precio", kind="stable").to_csv(out, index=False)
+
+
+def external(workers):
+    """Variante con el sort externo y `workers` procesos para los runs."""
+    return lambda src, out, args: sort_csv(src, "precio", out, run_rows=args.run_rows,
+                                           workers=workers)
+
+
+def main():
+    """Punto de entrada del benchmark."""
+    parser = bench_parser(__doc__, mb_help="Tamaño del CSV de entrada",
+                          workers_help="Procesos para generar los runs")
+    parser.add_argument("--run-rows", type=int, default=500_000, help="Filas por run")
+    args = parser.parse_args()
+
+    # Los runs van a .orion_cache/spill relativo al cwd
+    with work_dir() as tmp:
+        src = sales_csv(tmp, args.mb)
+        print(f"CSV: {os.path.getsize(src) / 1e6:,.0f} MB, runs de {args.run_rows:,} filas\n")
+        print(f"{'variante':<24}{'segundos':>10}{'RSS MB':>9}")
+        for label, variant in [("pandas", pandas_sort), ("externo", external(1)),
+                               (f"externo ({args.workers} procesos)", external(args.workers))]:
+            seconds, rss, _ = run_case(variant, src, os.path.join(tmp, "ordenado.csv"), args)
+            print(f"{label:<24}{seconds:>10.2f}{rss:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark: tiempo desde el arranque hasta la primera fila, con y sin la cache
+de pipelines compilados.
+
+Ejecuta muchas veces un pipeline DSL chico (el caso de las corridas
+programadas) y separa el costo de cargar el pipeline (parseo + validación +
+compilación, o lectura de la cache) del tiempo hasta la primera fila escrita.
+También mide el proceso completo `python runner.py` en frío y con la cache.
+
+Uso:
+    python benchmarks/bench_startup.py --runs 200
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+# pylint: disable=wrong-import-position
+from harness import bench_parser, timed, work_dir
+from dsl.dsl_compiled import load_compiled
+from dsl.dsl_engine import execute_dsl
+
+PIPELINE = """name: bench_startup
+source: {type: csv, path: ventas.csv}
+steps:
+  - filter: {column: cantidad, op: ">=", value: 3}
+  - rename_column: {from: cantidad, to: unidades}
+  - convert_type: {column: unidades, to: float}
+  - select_columns: {columns: [region, unidades, precio]}
+  - aggregate: {group_by: region, metrics: {unidades: sum, precio: mean}}
+output: {type: csv, path: out/resumen.csv}
+"""
+
+
+def run_in_process(runs: int, cache_dir) -> dict:
+    """Mide carga y primera fila dentro del mismo proceso."""
+    load_times, first_rows = [], []
+    for _ in range(runs):
+        started = time.perf_counter()
+        dsl, plan = load_compiled("pipeline.yaml", cache_dir)
+        load_times.append(time.perf_counter() - started)
+        stats = execute_dsl(dsl, plan=plan, started=started)
+        first_rows.append(stats["first_row_s"])
+    return {"load_ms": statistics.median(load_times) * 1000,
+            "first_row_ms": statistics.median(first_rows) * 1000}
+
+
+def run_cli(runs: int, cache_dir: str, clear: bool) -> float:
+    """Mediana del tiempo de `python runner.py` completo (en ms)."""
+    times = []
+    for _ in range(runs):
+        if clear:
+            for name in os.listdir(cache_dir) if os.path.isdir(cache_dir) else []:
+                os.remove(os.path.join(cache_dir, name))
+        seconds, _ = timed(lambda: subprocess.run(
+            [sys.executable, os.path.join(ROOT, "runner.py"), "pipeline.yaml", "--force"],
+            check=True, stdout=subprocess.DEVNULL))
+        times.append(seconds)
+    return statistics.median(times) * 1000
+
+
+def main():
+    """Punto de entrada del benchmark."""
+    parser = bench_parser(__doc__)
+    parser.add_argument("--runs", type=int, default=100)
+    parser.add_argument("--cli-runs", type=int, default=5)
+    args = parser.parse_args()
+
+    with work_dir():
+        pd.DataFrame({
+            "region": ["norte", "sur", "este", "oeste"] * 25,
+            "cantidad": list(range(100)),
+            "precio": [float(i) for i in range(100)],
+        }).to_csv("ventas.csv", index=False)
+        with open("pipeline.yaml", "w", encoding="utf-8") as f:
+            f.write(PIPELINE)
+        cache_dir = os.path.join(".orion_cache", "compiled")
+
+        print(f"Corridas en proceso: {args.runs}  Corridas CLI: {args.cli_runs}\n")
+        print(f"{'variante':<14}{'carga ms':>10}{'1ra fila ms':>13}")
+        for label, directory in (("sin cache", None), ("con cache", cache_dir)):
+            result = run_in_process(args.runs, directory)
+            print(f"{label:<14}{result['load_ms']:>10.3f}{result['first_row_ms']:>13.3f}")
+
+        print(f"\n{'CLI':<14}{'total ms':>10}")
+        print(f"{'sin cache':<14}{run_cli(args.cli_runs, cache_dir, True):>10.1f}")
+        print(f"{'con cache':<14}{run_cli(args.cli_runs, cache_dir, False):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Utilidades compartidas por los benchmarks.
+
+`run_case` corre cada variante en un proceso nuevo, así su RSS máximo no
+arrastra la memoria de las variantes anteriores. `work_dir` es un directorio
+temporal que además pasa a ser el cwd mientras dura: las caches y los spill de
+ORION van a `.orion_cache/` relativo al cwd y el dispatcher normaliza rutas a
+relativas.
+
+También genera el CSV sintético de ventas que usan los benchmarks con `--mb`.
+"""
+import argparse
+import contextlib
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position
+from profiler import _max_rss_mb  # pylint: disable=protected-access
+
+
+def timed(func) -> tuple:
+    """(segundos, resultado) de `func()` en este proceso."""
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def _measure(variant, args, setup, queue):
+    if setup is not None:
+        setup()
+    seconds, result = timed(lambda: variant(*args))
+    queue.put((seconds, _max_rss_mb(), result))
+
+
+def run_case(variant, *args, setup=None) -> tuple:
+    """
+    Corre `variant(*args)` en un proceso nuevo.
+
+    `setup` corre antes en ese proceso, fuera de la medición (ej: registrar
+    las funciones de un plugin).
+
+    Returns:
+        tuple: (segundos, RSS máximo en MB, resultado de la variante).
+    """
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_measure, args=(variant, args, setup, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def bench_parser(description: str, mb_help=None, workers_help=None) -> argparse.ArgumentParser:
+    """
+    Parser de argumentos con las opciones comunes.
+
+    Args:
+        description: Docstring del benchmark.
+        mb_help: Si se da, agrega `--mb` (tamaño del CSV sintético, 200 por defecto).
+        workers_help: Si se da, agrega `--workers` (por defecto, un proceso por CPU).
+    """
+    parser = argparse.ArgumentParser(description=description)
+    if mb_help:
+        parser.add_argument("--mb", type=int, default=200, help=mb_help)
+    if workers_help:
+        parser.add_argument("--workers", type=int, default=os.cpu_count(), help=workers_help)
+    return parser
+
+
+def write_csv(path: str, target_mb: int):
+    """Escribe un CSV sintético de aproximadamente `target_mb` MB."""
+    rng = np.random.default_rng(0)
+    block = 200_000
+    with open(path, "w", encoding="utf-8") as f:
+        header = True
+        while f.tell() < target_mb * 1e6:
+            pd.DataFrame({
+                "id": rng.integers(0, 10**9, block),
+                "region": rng.choice(["norte", "sur", "este", "oeste"], block),
+                "producto": rng.choice(["manzanas", "naranjas", "bananas"], block),
+                "cantidad": rng.integers(0, 50, block),
+                "precio": np.round(rng.random(block) * 100, 2),
+            }).to_csv(f, index=False, header=header)
+            header = False
+
+
+def sales_csv(tmp: str, target_mb: int) -> str:
+    """Escribe `ventas.csv` (ver write_csv) en `tmp` y devuelve su ruta."""
+    path = os.path.join(tmp, "ventas.csv")
+    write_csv(path, target_mb)
+    return path
+
+
+@contextlib.contextmanager
+def work_dir():
+    """Directorio temporal que es el cwd mientras dura el bloque."""
+    old_cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            yield tmp
+        finally:
+            os.chdir(old_cwd)
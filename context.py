@@ -56,18 +56,13 @@ class ContextManager:
             if path:
                 self.context["last_folder"] = normalize_path(path)
 
-        elif function_name == "download_file":
+        elif function_name in ("download_file", "convert_csv_to_json", "analyze_data"):
             path = args.get("output_path")
             if path:
                 self.context["last_file"] = normalize_path(path)
 
-        elif function_name == "convert_csv_to_json":
-            path = args.get("output_path")
-            if path:
-                self.context["last_file"] = normalize_path(path)
-
-        elif function_name == "analyze_data":
-            path = args.get("output_path")
+        elif function_name in ("count_rows", "preview_data"):
+            path = args.get("input_path")
             if path:
                 self.context["last_file"] = normalize_path(path)
 
@@ -11,13 +11,103 @@ from core.plugins.plugin_base import PluginBase
 from registry import register_function
 
 
+def _load(csv_path: str, sample, sample_method: str):
+    """
+    Dataset completo, o una muestra si se pidió `sample` (ver sampling.py).
+
+    Returns:
+        tuple: (DataFrame, Sample o None)
+    """
+    # pylint: disable=import-outside-toplevel
+    import datasets
+    import sampling
+
+    if not sample:
+        return datasets.load_dataset(csv_path), None
+    drawn = sampling.sample_dataset(csv_path, sample, sample_method)
+    return drawn.df, drawn
+
+
+def _sampled_outliers(drawn, values, is_outlier) -> str:
+    """Estimación de outliers en todo el dataset a partir de la muestra."""
+    rate, error = drawn.proportion(is_outlier)
+    q1_low, q1_high = drawn.quantile_bounds(values, 0.25)
+    q3_low, q3_high = drawn.quantile_bounds(values, 0.75)
+    return (
+        f"Estimación sobre {drawn.describe()}: "
+        f"~{rate * drawn.total_rows:,.0f} valores atípicos "
+        f"(± {error * drawn.total_rows:,.0f}, 95%)\n"
+        f"Q1 en [{q1_low:.2f}, {q1_high:.2f}], Q3 en [{q3_low:.2f}, {q3_high:.2f}] (95%)\n"
+    )
+
+
+def _outlier_summary(csv_path: str, method: str, threshold, streaming, chunk_rows: int):
+    """
+    Resumen de atípicos de todas las columnas numéricas (ver outliers.py).
+
+    Returns:
+        tuple: (resumen por columna, si se calculó en streaming)
+    """
+    # pylint: disable=import-outside-toplevel
+    import datasets
+    import outliers
+    from functions.data_ops import STREAMING_THRESHOLD_MB
+
+    if streaming is None:
+        streaming = (csv_path.endswith(".csv") and not datasets.in_memory(csv_path)
+                     and os.path.getsize(csv_path) > STREAMING_THRESHOLD_MB * 1024 * 1024)
+    if streaming:
+        bounds = outliers.streaming_bounds(datasets.iter_dataset(csv_path, chunk_rows),
+                                           method, threshold)
+        return outliers.find_outliers(datasets.iter_dataset(csv_path, chunk_rows), bounds), True
+    df = datasets.load_dataset(csv_path)
+    return outliers.find_outliers([df], outliers.frame_bounds(df, method, threshold)), False
+
+
+def _outlier_report(summary: dict, method: str, streaming: bool) -> str:
+    """Una línea por columna: atípicos y rango normal."""
+    approximate = ", cuartiles aproximados" if streaming and method == "iqr" else ""
+    result = f"Valores atípicos por columna ({method}{approximate}):\n"
+    for column, info in summary.items():
+        result += (f"  {column}: {info['atipicos']} de {info['valores']} "
+                   f"({info['porcentaje']:.1%}), rango normal "
+                   f"[{info['limite_inferior']:.2f}, {info['limite_superior']:.2f}]\n")
+    return result
+
+
+def _correlation_paths(output_path: str):
+    """Rutas del JSON y de la imagen que escribe correlation_matrix."""
+    if output_path.endswith('.json'):
+        return output_path, output_path[:-len('.json')] + '.png'
+    return output_path + '_correlation.json', output_path + '_correlation.png'
+
+
+def _correlations(csv_path: str, streaming, workers: int, chunk_rows: int):
+    """Matriz de correlación de las columnas numéricas, en memoria o por chunks."""
+    # pylint: disable=import-outside-toplevel
+    import correlation
+    import datasets
+    import outliers
+    from functions.data_ops import STREAMING_THRESHOLD_MB
+
+    if streaming is None:
+        streaming = workers > 1 or (
+            csv_path.endswith(".csv") and not datasets.in_memory(csv_path)
+            and os.path.getsize(csv_path) > STREAMING_THRESHOLD_MB * 1024 * 1024)
+    if streaming:
+        return correlation.correlation(csv_path, chunk_rows=chunk_rows, workers=workers)
+    df = datasets.load_dataset(csv_path)
+    stats, _ = correlation.frame_stats(df, outliers.numeric_columns(df), chunk_rows)
+    return stats.corr()
+
+
 class DataAnalyzerPlugin(PluginBase):
     """
     Plugin for advanced data analysis operations.
 
     Provides:
     - Chart generation from CSV data
-    - Statistical outlier detection
+    - Statistical outlier detection (one column, or all numeric columns at once)
     - Correlation matrix generation
 
     Note: Requires matplotlib and seaborn for visualizations.
@@ -68,9 +158,11 @@ class DataAnalyzerPlugin(PluginBase):
                 "csv_path": "str",
                 "chart_type": "str",
                 "output_path": "str"
-            }
+            },
+            dataset_inputs=True
         )
-        def generate_chart(csv_path: str, chart_type: str, output_path: str) -> str:
+        def generate_chart(csv_path: str, chart_type: str, output_path: str,
+                           sample=None, sample_method: str = "auto") -> str:
             """
             Generate a chart from CSV data.
 
@@ -78,19 +170,21 @@ class DataAnalyzerPlugin(PluginBase):
                 csv_path: Path to CSV file
                 chart_type: Type of chart (bar, line, scatter, pie)
                 output_path: Path to save the chart image
+                sample: Rows to sample instead of plotting the whole dataset
+                sample_method: "auto", "blocks" or "reservoir"
 
             Returns:
                 Status message
             """
             try:
                 # pylint: disable=import-outside-toplevel
-                import pandas as pd
                 import matplotlib.pyplot as plt
+                import datasets
 
-                if not os.path.exists(csv_path):
+                if not datasets.exists(csv_path):
                     return f"Error: Archivo '{csv_path}' no existe"
 
-                df = pd.read_csv(csv_path)
+                df, drawn = _load(csv_path, sample, sample_method)
 
                 # Create output directory
                 output_dir = os.path.dirname(output_path)
@@ -123,6 +217,8 @@ class DataAnalyzerPlugin(PluginBase):
                 plt.savefig(output_path, dpi=300, bbox_inches='tight')
                 plt.close()
 
+                if drawn:
+                    return f"Gráfico generado: {output_path} ({drawn.describe()})"
                 return f"Gráfico generado: {output_path}"
 
             except ImportError:
@@ -136,27 +232,33 @@ class DataAnalyzerPlugin(PluginBase):
             argument_types={
                 "csv_path": "str",
                 "column": "str"
-            }
+            },
+            dataset_inputs=True,
+            pure=True
         )
-        def detect_outliers(csv_path: str, column: str) -> str:
+        def detect_outliers(csv_path: str, column: str, sample=None,  # pylint: disable=too-many-locals
+                            sample_method: str = "auto") -> str:
             """
             Detect outliers in a column using IQR method.
 
             Args:
                 csv_path: Path to CSV file
                 column: Column name to analyze
+                sample: Rows to sample; the report estimates the total count
+                    with a 95% error bound
+                sample_method: "auto", "blocks" or "reservoir"
 
             Returns:
                 Report of outliers found
             """
             try:
                 # pylint: disable=import-outside-toplevel
-                import pandas as pd
+                import datasets
 
-                if not os.path.exists(csv_path):
+                if not datasets.exists(csv_path):
                     return f"Error: Archivo '{csv_path}' no existe"
 
-                df = pd.read_csv(csv_path)
+                df, drawn = _load(csv_path, sample, sample_method)
 
                 if column not in df.columns:
                     msg = f"Error: Columna '{column}' no existe."
@@ -172,19 +274,22 @@ class DataAnalyzerPlugin(PluginBase):
                 upper_bound = q3 + 1.5 * iqr
 
                 # Find outliers
-                outliers = df[(df[column] < lower_bound) | (df[column] > upper_bound)]
+                is_outlier = (df[column] < lower_bound) | (df[column] > upper_bound)
+                outliers = df[is_outlier]
+                estimate = _sampled_outliers(drawn, df[column], is_outlier) if drawn else ""
 
                 if len(outliers) == 0:
-                    return f"No se detectaron valores atípicos en '{column}'"
+                    return f"{estimate}No se detectaron valores atípicos en '{column}'"
 
                 result = (
+                    f"{estimate}"
                     f"Detectados {len(outliers)} valores atípicos en '{column}':\n"
                     f"Rango normal: [{lower_bound:.2f}, {upper_bound:.2f}]\n\n"
                     f"Valores atípicos:\n"
                 )
 
-                for idx, row in outliers.head(10).iterrows():
-                    result += f"  Fila {idx}: {row[column]}\n"
+                for idx, value in outliers[column].head(10).items():
+                    result += f"  Fila {idx}: {value}\n"
 
                 if len(outliers) > 10:
                     result += f"\n(Mostrando primeros 10 de {len(outliers)} valores atípicos)"
@@ -194,54 +299,107 @@ class DataAnalyzerPlugin(PluginBase):
             except Exception as e:  # pylint: disable=broad-except
                 return f"Error al detectar outliers: {str(e)}"
 
+        @register_function(
+            name="detect_outliers_all",
+            description=("Detecta valores atípicos en todas las columnas numéricas a la vez "
+                         "(método iqr o zscore)"),
+            argument_types={"csv_path": "str"},
+            dataset_inputs=True,
+            pure=True
+        )
+        def detect_outliers_all(csv_path: str, output_path: str = None, *,  # pylint: disable=too-many-arguments
+                                method: str = "iqr", threshold=None, streaming=None,
+                                chunk_rows: int = 100_000) -> str:
+            """
+            Detect outliers in every numeric column at once (see outliers.py).
+
+            Args:
+                csv_path: Path to CSV file
+                output_path: Optional JSON path for the per-column summary
+                method: "iqr" (Q1/Q3 +- threshold * IQR) or "zscore"
+                    (mean +- threshold * std)
+                threshold: IQR factor (1.5) or z-score (3) by default
+                streaming: Two passes over chunks with approximate quartiles;
+                    automatic for CSVs above STREAMING_THRESHOLD_MB
+                chunk_rows: Rows per chunk when streaming
+
+            Returns:
+                Per-column report
+            """
+            try:
+                # pylint: disable=import-outside-toplevel
+                import datasets
+
+                if not datasets.exists(csv_path):
+                    return f"Error: Archivo '{csv_path}' no existe"
+
+                summary, streaming = _outlier_summary(csv_path, method, threshold, streaming,
+                                                      chunk_rows)
+                if not summary:
+                    return "Error: No hay columnas numéricas en el dataset"
+
+                result = _outlier_report(summary, method, streaming)
+                if output_path:
+                    output_dir = os.path.dirname(output_path)
+                    if output_dir:
+                        os.makedirs(output_dir, exist_ok=True)
+                    with open(output_path, 'w', encoding='utf-8') as f:
+                        json.dump(summary, f, indent=2)
+                    result += f"Resumen guardado en {output_path}"
+
+                return result
+
+            except Exception as e:  # pylint: disable=broad-except
+                return f"Error al detectar outliers: {str(e)}"
+
         @register_function(
             name="correlation_matrix",
             description="Genera una matriz de correlación de todas las columnas numéricas",
             argument_types={
                 "csv_path": "str",
                 "output_path": "str"
-            }
+            },
+            dataset_inputs=True,
+            pure=True,
+            outputs=lambda args: _correlation_paths(args["output_path"])
         )
-        def correlation_matrix(csv_path: str, output_path: str) -> str:
+        def correlation_matrix(csv_path: str, output_path: str, streaming=None,  # pylint: disable=too-many-arguments
+                               workers: int = 1, chunk_rows: int = 100_000) -> str:
             """
             Generate a correlation matrix heatmap.
 
             Args:
                 csv_path: Path to CSV file
                 output_path: Path to save the correlation matrix
+                streaming: Read the CSV in chunks instead of loading it;
+                    automatic for CSVs above STREAMING_THRESHOLD_MB or with workers
+                workers: Processes summarizing chunks in parallel
+                chunk_rows: Rows per chunk
 
             Returns:
                 Status message with correlation info
             """
             try:
                 # pylint: disable=import-outside-toplevel
-                import pandas as pd
+                import datasets
 
-                if not os.path.exists(csv_path):
+                if not datasets.exists(csv_path):
                     return f"Error: Archivo '{csv_path}' no existe"
 
-                df = pd.read_csv(csv_path)
-
-                # Select only numeric columns
-                numeric_df = df.select_dtypes(include=['number'])
+                # Pearson por pares con el acumulador combinable (ver correlation.py)
+                corr_matrix = _correlations(csv_path, streaming, int(workers), int(chunk_rows))
+                columns = list(corr_matrix.columns)
 
-                if numeric_df.empty:
+                if not columns:
                     return "Error: No hay columnas numéricas en el dataset"
 
-                # Calculate correlation matrix
-                corr_matrix = numeric_df.corr()
-
                 # Create output directory
                 output_dir = os.path.dirname(output_path)
                 if output_dir:
                     os.makedirs(output_dir, exist_ok=True)
 
                 # Save as JSON
-                if not output_path.endswith('.json'):
-                    json_path = output_path + '_correlation.json'
-                else:
-                    json_path = output_path
-
+                json_path, img_path = _correlation_paths(output_path)
                 with open(json_path, 'w', encoding='utf-8') as f:
                     json.dump(corr_matrix.to_dict(), f, indent=2)
 
@@ -256,10 +414,6 @@ class DataAnalyzerPlugin(PluginBase):
                     plt.title('Correlation Matrix')
                     plt.tight_layout()
 
-                    img_path = output_path.replace('.json', '.png')
-                    if not img_path.endswith('.png'):
-                        img_path += '_correlation.png'
-
                     plt.savefig(img_path, dpi=300, bbox_inches='tight')
                     plt.close()
 
@@ -267,13 +421,13 @@ class DataAnalyzerPlugin(PluginBase):
                         f"Matriz de correlación generada:\n"
                         f"  JSON: {json_path}\n"
                         f"  Imagen: {img_path}\n"
-                        f"Columnas analizadas: {list(numeric_df.columns)}"
+                        f"Columnas analizadas: {columns}"
                     )
 
                 except ImportError:
                     return (
                         f"Matriz de correlación generada: {json_path}\n"
-                        f"Columnas analizadas: {list(numeric_df.columns)}\n"
+                        f"Columnas analizadas: {columns}\n"
                         f"(Instalá matplotlib y seaborn para generar visualización)"
                     )
 
@@ -0,0 +1,89 @@
+"""
+Matriz de correlación de Pearson por chunks, sin cargar el archivo.
+
+Cada chunk se resume en un `streaming_stats.CorrelationStats` (n, medias, M2 y
+co-momentos por par de columnas) y los resúmenes se combinan: el resultado es
+el de `DataFrame.corr()` (pares con filas completas) salvo redondeo. Con
+`workers > 1` cada chunk de un CSV lo resume un proceso distinto, leyendo su
+rango de bytes (los offsets salen de csv_scan.row_offsets), y el proceso
+principal sólo combina matrices p x p.
+
+Las columnas son las numéricas de las primeras filas; si alguna trae texto más
+adelante se descarta al final, como haría `select_dtypes` sobre el archivo
+entero (los pares son independientes, así que sacarla no cambia el resto).
+"""
+import io
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+import datasets
+from csv_scan import row_offsets
+from outliers import numeric_columns
+from streaming_stats import CorrelationStats
+
+DEFAULT_CHUNK_ROWS = 100_000
+
+# Filas leídas para decidir qué columnas son numéricas
+HEAD_ROWS = 1_000
+
+
+def _values(chunk: pd.DataFrame, columns: list, mixed: set) -> np.ndarray:
+    """Matriz float de `columns`; las que no son numéricas en el chunk van a `mixed`."""
+    numeric = set(numeric_columns(chunk))
+    values = np.full((len(chunk), len(columns)), np.nan)
+    for position, column in enumerate(columns):
+        if column in numeric:
+            values[:, position] = chunk[column].to_numpy(dtype=np.float64, na_value=np.nan)
+        else:
+            mixed.add(column)
+    return values
+
+
+def frame_stats(df: pd.DataFrame, columns: list, chunk_rows: int = DEFAULT_CHUNK_ROWS):
+    """Acumulado de un DataFrame en memoria, por bloques de filas (acota las copias)."""
+    stats, mixed = CorrelationStats(columns), set()
+    for start in range(0, len(df), chunk_rows):
+        stats.update(_values(df.iloc[start:start + chunk_rows], columns, mixed))
+    return stats, mixed
+
+
+def _range_stats(job: tuple):
+    """Resume un rango de bytes del CSV (en un proceso aparte)."""
+    path, start, end, names, columns = job
+    with open(path, "rb") as f:
+        f.seek(start)
+        df = pd.read_csv(io.BytesIO(f.read(end - start)), header=None, names=names)
+    return frame_stats(df, columns)
+
+
+def correlation(path: str, *, chunk_rows=DEFAULT_CHUNK_ROWS, workers=1,
+                min_periods=1) -> pd.DataFrame:
+    """
+    Correlación de las columnas numéricas de un dataset, leído por chunks.
+
+    Args:
+        path: Dataset (CSV o cualquier formato de datasets).
+        chunk_rows: Filas por chunk (la memoria queda acotada a un chunk por proceso).
+        workers: Procesos para resumir los chunks de un CSV en paralelo.
+        min_periods: Filas completas mínimas por par (como en `DataFrame.corr`).
+    """
+    head = datasets.read_head(path, HEAD_ROWS)
+    columns = numeric_columns(head)
+    stats, mixed = CorrelationStats(columns), set()
+
+    if workers > 1 and path.endswith(".csv") and datasets.loaded(path) is None:
+        offsets, _ = row_offsets(path, chunk_rows)
+        jobs = [(path, int(offsets[i]), int(offsets[i + 1]), list(head.columns), columns)
+                for i in range(len(offsets) - 1)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for part, part_mixed in executor.map(_range_stats, jobs):
+                stats.merge(part)
+                mixed |= part_mixed
+    else:
+        for chunk in datasets.iter_dataset(path, chunk_rows):
+            part, part_mixed = frame_stats(chunk, columns, chunk_rows)
+            stats.merge(part)
+            mixed |= part_mixed
+
+    keep = [column for column in columns if column not in mixed]
+    return stats.corr(min_periods).loc[keep, keep]
@@ -0,0 +1,133 @@
+"""
+Conteo rápido de líneas de CSV (y offsets de filas) sin parsearlos.
+
+Para saber cuántas filas tiene un archivo no hace falta convertirlo en
+DataFrame: se mapea en memoria (mmap) y se cuentan los saltos de línea por
+bloques. Un salto de línea dentro de un campo entre comillas no separa filas;
+un bloque sin comillas se cuenta con `bytes.count`, y uno con comillas se
+recorre vectorizado con numpy llevando la paridad de comillas abiertas entre
+bloques (las comillas escapadas `""` cambian la paridad dos veces, así que no
+la alteran).
+"""
+import mmap
+import os
+import numpy as np
+
+# Bytes por bloque del recorrido: acota la memoria auxiliar de numpy
+SCAN_CHUNK_BYTES = 8 * 1024 * 1024
+
+QUOTE = ord('"')
+NEWLINE = ord("\n")
+LINE_ENDINGS = (NEWLINE, ord("\r"))
+
+
+def _unquoted_newlines(block: bytes, inside: bool):
+    """
+    Máscara de los saltos de línea del bloque que no caen dentro de comillas.
+
+    Returns:
+        tuple: (máscara booleana, si el bloque termina con comillas abiertas)
+    """
+    values = np.frombuffer(block, dtype=np.uint8)
+    newlines = values == NEWLINE
+    if not inside and block.find(b'"') == -1:
+        return newlines, False
+    # uint8 desborda, pero la paridad de la suma acumulada se conserva
+    parity = np.cumsum(values == QUOTE, dtype=np.uint8) & 1
+    if inside:
+        parity ^= 1
+    return newlines & (parity == 0), bool(parity[-1])
+
+
+def _data_end(mm, size: int) -> int:
+    """Fin de los datos sin los saltos de línea finales."""
+    end = size
+    while end and mm[end - 1] in LINE_ENDINGS:
+        end -= 1
+    return end
+
+
+def count_lines(path: str, quoted: bool = True, chunk_bytes: int = SCAN_CHUNK_BYTES) -> int:
+    """
+    Cuenta las líneas (registros) de un archivo de texto.
+
+    Los saltos de línea al final del archivo no cuentan como líneas vacías,
+    y la última línea cuenta aunque no termine en salto de línea. Las líneas
+    en blanco intermedias sí se cuentan (pandas las saltea al leer).
+
+    Args:
+        path: Ruta del archivo.
+        quoted: Si los saltos de línea entre comillas dobles no separan
+            registros (CSV). Para NDJSON no hace falta: JSON los escapa.
+        chunk_bytes: Tamaño de cada bloque del recorrido.
+    """
+    size = os.path.getsize(path)
+    if size == 0:
+        return 0
+
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        end = _data_end(mm, size)
+        if end == 0:
+            return 0
+
+        newlines, inside = 0, False
+        for start in range(0, end, chunk_bytes):
+            block = mm[start:min(start + chunk_bytes, end)]
+            if not quoted or (not inside and block.find(b'"') == -1):
+                newlines += block.count(b"\n")
+            else:
+                mask, inside = _unquoted_newlines(block, inside)
+                newlines += int(np.count_nonzero(mask))
+    return newlines + 1
+
+
+def record_end(path: str, start: int, end: int, chunk_bytes: int = SCAN_CHUNK_BYTES) -> int:
+    """
+    Posición siguiente al último fin de registro (salto de línea fuera de
+    comillas) en [start, end), o `start` si no hay ninguno.
+
+    `start` tiene que ser el inicio de un registro, donde no hay comillas
+    abiertas: el recorrido va hacia adelante llevando la paridad, porque
+    desde el final no se puede saber si un salto de línea está entre comillas.
+    """
+    if end <= start:
+        return start
+
+    last, inside = start, False
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for block_start in range(start, end, chunk_bytes):
+            block = mm[block_start:min(block_start + chunk_bytes, end)]
+            mask, inside = _unquoted_newlines(block, inside)
+            positions = np.flatnonzero(mask)
+            if len(positions):
+                last = block_start + int(positions[-1]) + 1
+    return last
+
+
+def row_offsets(path: str, every: int, chunk_bytes: int = SCAN_CHUNK_BYTES):
+    """
+    Offsets en bytes donde empiezan las filas 0, every, 2*every... de un CSV.
+
+    Con estos offsets se puede leer cualquier bloque de `every` filas sin
+    recorrer lo anterior (ej: para muestrear bloques al azar).
+
+    Returns:
+        tuple: (array de offsets más el fin de los datos como último
+            elemento, cantidad de filas sin contar el encabezado)
+    """
+    size = os.path.getsize(path)
+    if size == 0:
+        return np.zeros(1, dtype=np.int64), 0
+
+    starts, newlines, inside = [], 0, False
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        end = _data_end(mm, size)
+        for start in range(0, end, chunk_bytes):
+            mask, inside = _unquoted_newlines(mm[start:min(start + chunk_bytes, end)], inside)
+            positions = np.flatnonzero(mask)
+            # La fila r empieza después del salto de línea número r (el 0 cierra el encabezado)
+            first = -newlines % every
+            starts.append(positions[first::every].astype(np.int64) + start + 1)
+            newlines += len(positions)
+    starts.append(np.array([end], dtype=np.int64))
+    return np.concatenate(starts), newlines
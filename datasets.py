@@ -0,0 +1,367 @@
+"""
+Carga y guardado de datasets para ORION.
+
+Punto único por el que las funciones de datos leen y escriben DataFrames.
+Durante un pipeline, el runner puede marcar rutas intermedias para que se
+pasen en memoria entre pasos (handoff) en lugar de escribirse en disco y
+volver a leerse en el paso siguiente.
+
+Además, los archivos leídos quedan en una cache de proceso (`dataset_cache`)
+para que varias funciones seguidas sobre el mismo archivo (analizar, detectar
+outliers, correlaciones...) lo parseen una sola vez, y los CSV grandes dejan
+una copia columnar en disco (`sidecar_cache`) que evita volver a parsearlos en
+otros procesos. Esos CSV grandes se cargan con tipos compactos inferidos
+(`schema_cache`, ver schemas.py).
+"""
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+import pandas as pd
+from csv_scan import count_lines
+from schemas import SchemaCache
+from sidecar import SidecarCache
+from utils import normalize_path
+
+DEFAULT_CACHE_MB = 1024
+
+# Extensiones de JSON por líneas (un registro por línea)
+NDJSON_EXTENSIONS = (".ndjson", ".jsonl")
+
+# Memoria (bytes) de cada dataset cargado con tipos compactos y sin ellos
+memory_stats = {}
+
+# Rutas que el runner decidió mantener en memoria y sus DataFrames
+_memory_paths = set()
+_frames = {}
+
+# Contadores de I/O real contra el disco (y filas que pasan por este módulo)
+io_stats = {"reads": 0, "bytes_read": 0, "writes": 0, "bytes_written": 0,
+            "memory_reads": 0, "memory_writes": 0, "sidecar_reads": 0,
+            "rows_read": 0, "rows_written": 0}
+
+
+class DatasetCache:
+    """
+    Cache LRU de DataFrames leídos de disco, compartida por todo el proceso.
+
+    Cada entrada se valida contra (tamaño, mtime) del archivo: si cambió, se
+    descarta y se vuelve a leer. El total se acota por el tamaño en memoria de
+    los DataFrames (`memory_usage(deep=True)`), desalojando los menos usados.
+
+    Args:
+        max_mb (float): Presupuesto de memoria de la cache.
+    """
+
+    def __init__(self, max_mb=DEFAULT_CACHE_MB):
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes = 0
+        self._entries = OrderedDict()  # ruta -> (huella, DataFrame, bytes)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _fingerprint(path: str):
+        stat = os.stat(path)
+        return stat.st_size, stat.st_mtime_ns
+
+    def get(self, path: str):
+        """DataFrame cacheado de `path` si el archivo no cambió, o None."""
+        key = normalize_path(path)
+        fingerprint = self._fingerprint(path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == fingerprint:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry:
+                self._drop(key)
+            self.misses += 1
+            return None
+
+    def put(self, path: str, df: pd.DataFrame):
+        """Guarda un DataFrame recién leído de `path` (si entra en el presupuesto)."""
+        nbytes = int(df.memory_usage(index=True, deep=True).sum())
+        if nbytes > self.max_bytes:
+            return
+        key = normalize_path(path)
+        fingerprint = self._fingerprint(path)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (fingerprint, df, nbytes)
+            self.bytes += nbytes
+            while self.bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, path: str):
+        """Descarta la entrada de `path` (ej: porque se va a sobrescribir)."""
+        with self._lock:
+            self._drop(normalize_path(path))
+
+    def clear(self):
+        """Vacía la cache y pone en cero sus contadores."""
+        with self._lock:
+            self._entries.clear()
+            self.bytes = self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        """Aciertos, fallos, desalojos y memoria usada."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "entries": len(self._entries), "mb": round(self.bytes / (1024 * 1024), 2)}
+
+    def _drop(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry:
+            self.bytes -= entry[2]
+
+
+dataset_cache = DatasetCache()
+sidecar_cache = SidecarCache()
+schema_cache = SchemaCache()
+
+
+@contextmanager
+def handoff(paths):
+    """
+    Mantiene en memoria las rutas indicadas mientras dure el bloque.
+
+    Las escrituras a esas rutas guardan el DataFrame en memoria y las lecturas
+    lo devuelven directamente. Al salir se descartan los DataFrames.
+    """
+    keys = {normalize_path(path) for path in paths}
+    _memory_paths.update(keys)
+    try:
+        yield
+    finally:
+        _memory_paths.difference_update(keys)
+        for key in keys:
+            _frames.pop(key, None)
+
+
+def in_memory(path: str) -> bool:
+    """Indica si la ruta está marcada para handoff en memoria."""
+    return normalize_path(path) in _memory_paths
+
+
+def exists(path: str) -> bool:
+    """Como os.path.exists, pero también ve los datasets en memoria."""
+    return normalize_path(path) in _frames or os.path.exists(path)
+
+
+def load_dataset(path: str) -> pd.DataFrame:
+    """
+    Carga un dataset (CSV, JSON de registros o Parquet según la extensión).
+
+    Si la ruta es un intermedio en memoria, o el archivo ya se leyó y no cambió
+    desde entonces (`dataset_cache`), devuelve ese DataFrame sin tocar el
+    disco; quien lo reciba no debe modificarlo in-place.
+    """
+    key = normalize_path(path)
+    if key in _frames:
+        io_stats["memory_reads"] += 1
+        io_stats["rows_read"] += len(_frames[key])
+        return _frames[key]
+
+    df = dataset_cache.get(path)
+    if df is not None:
+        io_stats["rows_read"] += len(df)
+        return df
+
+    if path.endswith(NDJSON_EXTENSIONS):
+        df = pd.read_json(path, orient="records", lines=True)
+    elif path.endswith(".json"):
+        df = pd.read_json(path, orient="records")
+    elif path.endswith(".parquet"):
+        df = pd.read_parquet(path)
+    else:
+        df = sidecar_cache.load(path)
+        if df is not None:
+            io_stats["sidecar_reads"] += 1
+            io_stats["rows_read"] += len(df)
+            _record_memory(key, schema_cache.cached(path))
+            dataset_cache.put(path, df)
+            return df
+        if schema_cache.eligible(path):
+            df, schema = schema_cache.load(path)
+            _record_memory(key, schema)
+        else:
+            df = pd.read_csv(path)
+        sidecar_cache.store(path, df)
+
+    io_stats["reads"] += 1
+    io_stats["bytes_read"] += os.path.getsize(path)
+    io_stats["rows_read"] += len(df)
+    dataset_cache.put(path, df)
+    return df
+
+
+def _record_memory(key: str, schema):
+    if schema and "memory" in schema:
+        memory_stats[key] = schema["memory"]
+
+
+def memory_saved(path: str):
+    """
+    Memoria del dataset cargado con tipos compactos y la estimada sin ellos.
+
+    Returns:
+        dict: {"bytes", "bytes_default"} o None si el archivo se cargó con los
+            tipos por defecto (o todavía no se cargó).
+    """
+    return memory_stats.get(normalize_path(path))
+
+
+def iter_dataset(path: str, chunk_rows: int, dtype=None):
+    """
+    Itera un dataset en chunks de hasta `chunk_rows` filas.
+
+    Sólo los CSV en disco se leen por partes (de su copia columnar si existe,
+    en batches de esa copia); un intermedio en memoria, un archivo ya cacheado
+    o un JSON/Parquet se entrega como un único chunk. Leer por partes no llena
+    las caches (la idea es no tener el archivo entero en memoria).
+
+    `dtype` fuerza tipos al parsear un CSV por partes: cada parte infiere los
+    suyos, mientras que las demás fuentes ya tienen un único tipo por columna.
+    """
+    if normalize_path(path) in _frames or path.endswith((".json", ".parquet") + NDJSON_EXTENSIONS):
+        yield load_dataset(path)
+        return
+
+    df = dataset_cache.get(path)
+    if df is not None:
+        io_stats["rows_read"] += len(df)
+        yield df
+        return
+
+    batches = sidecar_cache.iter_batches(path)
+    if batches is not None:
+        io_stats["sidecar_reads"] += 1
+        for batch in batches:
+            io_stats["rows_read"] += len(batch)
+            yield batch
+        return
+
+    io_stats["reads"] += 1
+    io_stats["bytes_read"] += os.path.getsize(path)
+    for chunk in pd.read_csv(path, chunksize=chunk_rows, dtype=dtype):
+        io_stats["rows_read"] += len(chunk)
+        yield chunk
+
+
+def loaded(path: str):
+    """DataFrame ya en memoria (intermedio o cache) sin tocar el disco, o None."""
+    key = normalize_path(path)
+    if key in _frames:
+        return _frames[key]
+    return dataset_cache.get(path)
+
+
+def count_rows(path: str) -> int:
+    """
+    Cantidad de filas de un dataset sin parsearlo.
+
+    Si el dataset ya está en memoria es su largo; un CSV o NDJSON se cuenta
+    recorriendo sus saltos de línea (csv_scan.py) y un Parquet se responde
+    desde sus metadatos. Sólo un JSON de registros necesita cargarse.
+    """
+    df = loaded(path)
+    if df is not None:
+        return len(df)
+    if path.endswith(NDJSON_EXTENSIONS):
+        return count_lines(path, quoted=False)
+    if path.endswith(".json"):
+        return len(load_dataset(path))
+    if path.endswith(".parquet"):
+        # pylint: disable=import-outside-toplevel
+        import pyarrow.parquet
+        return pyarrow.parquet.ParquetFile(path).metadata.num_rows
+    # El encabezado no es una fila
+    return max(count_lines(path) - 1, 0)
+
+
+def read_head(path: str, rows: int) -> pd.DataFrame:
+    """Primeras `rows` filas de un dataset, parseando sólo esas filas si es posible."""
+    df = loaded(path)
+    if df is not None:
+        return df.head(rows)
+    if path.endswith(NDJSON_EXTENSIONS):
+        return pd.read_json(path, orient="records", lines=True, nrows=rows)
+    if path.endswith((".json", ".parquet")):
+        return load_dataset(path).head(rows)
+    return pd.read_csv(path, nrows=rows)
+
+
+def save_chunks(chunks, path: str, writer) -> bool:
+    """
+    Guarda un dataset que llega por chunks sin juntarlo en memoria.
+
+    Args:
+        chunks: Iterable de DataFrames.
+        path: Ruta de salida.
+        writer: Callable(chunks, file) que escribe los chunks en el archivo
+            abierto en modo texto y devuelve la cantidad de filas escritas.
+
+    Returns:
+        bool: True si se escribió en disco, False si quedó en memoria.
+    """
+    key = normalize_path(path)
+    if key in _memory_paths:
+        # El siguiente paso lo quiere en memoria: no hay disco que ahorrar
+        df = pd.concat(list(chunks), ignore_index=True)
+        io_stats["rows_written"] += len(df)
+        _frames[key] = df
+        io_stats["memory_writes"] += 1
+        return False
+
+    dataset_cache.invalidate(path)
+    dirname = os.path.dirname(path)
+    if dirname:
+        os.makedirs(dirname, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        io_stats["rows_written"] += writer(chunks, f)
+
+    io_stats["writes"] += 1
+    io_stats["bytes_written"] += os.path.getsize(path)
+    return True
+
+
+def save_dataset(df: pd.DataFrame, path: str, writer) -> bool:
+    """
+    Guarda un DataFrame producido por una función de datos.
+
+    Args:
+        df: Datos a guardar.
+        path: Ruta de salida.
+        writer: Callable(df, path) que escribe el formato concreto en disco.
+
+    Returns:
+        bool: True si se escribió en disco, False si quedó en memoria.
+    """
+    key = normalize_path(path)
+    io_stats["rows_written"] += len(df)
+    if key in _memory_paths:
+        _frames[key] = df
+        io_stats["memory_writes"] += 1
+        return False
+
+    dataset_cache.invalidate(path)
+    dirname = os.path.dirname(path)
+    if dirname:
+        os.makedirs(dirname, exist_ok=True)
+    writer(df, path)
+
+    io_stats["writes"] += 1
+    io_stats["bytes_written"] += os.path.getsize(path)
+    return True
+
+
+def reset_io_stats():
+    """Pone en cero los contadores de I/O."""
+    for key in io_stats:
+        io_stats[key] = 0
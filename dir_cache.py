@@ -0,0 +1,79 @@
+"""
+Directorio de cache con desalojo LRU (base de StepCache y SidecarCache).
+
+Cada entrada es un subdirectorio `<cache_dir>/<clave>/` con sus archivos y un
+`meta.json` que se escribe al final, de forma atómica: una entrada sin
+`meta.json` está incompleta y no cuenta. El mtime de `meta.json` marca el
+último uso y el tamaño total se acota desalojando las entradas menos usadas.
+"""
+import json
+import os
+import shutil
+
+META_FILE = "meta.json"
+
+
+class DirectoryCache:
+    """
+    Entradas en subdirectorios con metadatos en JSON y tamaño acotado.
+
+    Args:
+        cache_dir (str): Directorio de la cache.
+        max_mb (float): Tamaño máximo del directorio antes de desalojar.
+    """
+
+    def __init__(self, cache_dir: str, max_mb: float):
+        self.cache_dir = cache_dir
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def read_meta(entry_dir: str):
+        """Metadatos de una entrada completa, o None si no existe."""
+        meta_path = os.path.join(entry_dir, META_FILE)
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    @staticmethod
+    def write_meta(entry_dir: str, meta: dict):
+        """Escribe meta.json de forma atómica (marca la entrada como completa y usada)."""
+        tmp_path = os.path.join(entry_dir, META_FILE + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, default=str)
+        os.replace(tmp_path, os.path.join(entry_dir, META_FILE))
+
+    @staticmethod
+    def touch(entry_dir: str):
+        """Marca la entrada como recién usada."""
+        os.utime(os.path.join(entry_dir, META_FILE))
+
+    def entries(self) -> list:
+        """Lista (último uso, bytes, directorio) de cada entrada completa."""
+        if not os.path.isdir(self.cache_dir):
+            return []
+
+        found = []
+        for name in os.listdir(self.cache_dir):
+            entry_dir = os.path.join(self.cache_dir, name)
+            meta_path = os.path.join(entry_dir, META_FILE)
+            if not os.path.exists(meta_path):
+                continue
+            size = sum(entry.stat().st_size for entry in os.scandir(entry_dir))
+            found.append((os.path.getmtime(meta_path), size, entry_dir))
+        return found
+
+    def evict(self) -> int:
+        """Desaloja entradas (LRU) hasta quedar bajo `max_bytes`."""
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        evicted = 0
+        for _, size, entry_dir in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total -= size
+            evicted += 1
+        return evicted
@@ -1,11 +1,44 @@
+import datasets
 from registry import get_function
+from result_cache import ResultCache
 from utils import normalize_path
 
+# Resultados de funciones registradas con pure=True
+result_cache = ResultCache()
+
+
+def _cacheable(function_info: dict, arguments: dict) -> bool:
+    """Una función pura es cacheable salvo que lea un intermedio en memoria."""
+    return function_info.get('pure', False) and not any(
+        isinstance(value, str) and datasets.in_memory(value) for value in arguments.values())
+
+
+def _call(function_name: str, function_info: dict, arguments: dict, use_cache: bool):
+    """Ejecuta la función (o la responde desde la cache). Devuelve (resultado, hit)."""
+    cacheable = _cacheable(function_info, arguments)
+    if cacheable and use_cache:
+        cached = result_cache.lookup(function_name, arguments)
+        if cached is not None:
+            return cached, True
+
+    # Ejecutar la función real
+    result = function_info['function'](**arguments)
+    # Los plugins informan errores como texto en lugar de excepciones
+    if cacheable and isinstance(result, str) and not result.startswith("Error"):
+        outputs = function_info.get('outputs')
+        result_cache.store(function_name, arguments, result,
+                           outputs(arguments) if outputs else None)
+    return result, False
+
 
 # pylint: disable=too-many-return-statements
-def dispatch(function_name: str, arguments: dict, context_manager=None):
+def dispatch(function_name: str, arguments: dict, context_manager=None, use_cache=True):
     """
-    Ejecuta funciones registradas con manejo elegante de errores
+    Ejecuta funciones registradas con manejo elegante de errores.
+
+    Las funciones puras se responden desde `result_cache` si sus entradas no
+    cambiaron (el resultado sale marcado con "(cache)"); `use_cache=False`
+    fuerza la ejecución.
     """
 
     # Normalizar nombres de argumentos del DSL
@@ -41,14 +74,13 @@ def dispatch(function_name: str, arguments: dict, context_manager=None):
                 f"[ERROR] Faltan argumentos para '{function_name}': {missing_args}. "
                 f"Argumentos requeridos: {list(required_args)}")
 
-        # Ejecutar la función real
-        result = function_info['function'](**arguments)
+        result, cached = _call(function_name, function_info, arguments, use_cache)
 
         # Actualizar contexto si existe el manager
         if context_manager:
             context_manager.infer_update(function_name, arguments, result)
 
-        return f"[OK] {result}"
+        return f"[OK] (cache) {result}" if cached else f"[OK] {result}"
 
     except FileNotFoundError as e:
         return f"[ERROR] Archivo no encontrado: {str(e)}"
@@ -0,0 +1,212 @@
+# dsl_aggregate.py
+"""
+Operador de agregación por hash para el DSL de ORION.
+
+Las claves de agrupación se codifican a enteros (códigos de la categoría si la
+columna ya es `category`, o `pd.factorize` en otro caso) y se combinan en un
+único id denso por grupo. Las métricas numéricas se reducen con NumPy sobre
+esos ids (`bincount` para sumas y conteos, `ufunc.at` para mínimos y máximos)
+en una sola pasada por columna: cada parte (sum, count, min, max) se calcula
+una vez aunque varias funciones la usen (ej: `[sum, mean]`).
+
+El resultado es un agregado parcial combinable: `merge_partials` vuelve a
+pasar las partes por el mismo operador, así que sirve igual para chunks
+(streaming) y para particiones procesadas en paralelo.
+"""
+import numpy as np
+import pandas as pd
+from dsl.dsl_optimizer import group_keys, metric_specs
+
+# Partes que guarda cada función de agregación y cómo se combinan entre chunks
+PARTIAL_PARTS = {
+    "sum": ("sum",),
+    "count": ("count",),
+    "mean": ("sum", "count"),
+    "min": ("min",),
+    "max": ("max",),
+}
+MERGE_PARTS = {"sum": "sum", "count": "sum", "min": "min", "max": "max"}
+
+GLOBAL_KEY = "__orion_all__"
+
+# Por encima de este producto de cardinalidades se recomprimen los códigos
+_MAX_COMBINED_CODE = 2 ** 40
+
+
+def _encode(values):
+    """
+    Códigos enteros densos (-1 = nulo) y el Index de valores de cada código.
+
+    Una columna `category` usa sus códigos sin volver a hashear los valores y
+    conserva el tipo categórico (ordenar el resultado ordena enteros).
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        categorical = values.array  # Categorical, venga de una Series o de un Index
+        codes = categorical.codes.astype(np.int64)
+        total = len(categorical.categories)
+        used = np.flatnonzero(np.bincount(codes[codes >= 0], minlength=total))
+        if len(used) < total:
+            remap = np.full(total, -1, dtype=np.int64)
+            remap[used] = np.arange(len(used))
+            codes = np.where(codes >= 0, remap[codes], -1)
+        return codes, pd.CategoricalIndex(pd.Categorical.from_codes(used, dtype=values.dtype))
+    codes, uniques = pd.factorize(values)
+    return codes.astype(np.int64, copy=False), pd.Index(uniques)
+
+
+def group_ids(keys: list):
+    """
+    Asigna a cada fila un id de grupo denso a partir de las claves.
+
+    Args:
+        keys (list): Series o Index (uno por clave), todos del mismo largo.
+
+    Returns:
+        tuple: (ids por fila con -1 para claves nulas, cantidad de grupos,
+            Index/MultiIndex con los valores de clave de cada grupo)
+    """
+    names = [getattr(key, "name", None) for key in keys]
+    encoded = [_encode(key) for key in keys]
+    if len(encoded) == 1:
+        # Una sola clave: los códigos ya son ids densos
+        codes, uniques = encoded[0]
+        return codes, len(uniques), uniques.rename(names[0])
+
+    combined = encoded[0][0].copy()
+    cardinality = len(encoded[0][1])
+    for codes, uniques in encoded[1:]:
+        if cardinality * len(uniques) > _MAX_COMBINED_CODE:
+            combined, _ = pd.factorize(combined)
+            cardinality = int(combined.max()) + 1 if len(combined) else 0
+        combined = combined * len(uniques) + codes
+        cardinality *= len(uniques)
+
+    # Filas con alguna clave nula quedan fuera, como en pandas.groupby
+    valid = np.ones(len(combined), dtype=bool)
+    for codes, _ in encoded:
+        valid &= codes >= 0
+    rows = np.flatnonzero(valid)
+    dense, _ = pd.factorize(combined[rows])
+    ids = np.full(len(combined), -1, dtype=np.int64)
+    ids[rows] = dense
+    ngroups = int(dense.max()) + 1 if len(dense) else 0
+
+    # factorize numera por orden de aparición: la primera fila de cada grupo
+    # es donde el máximo acumulado de los ids sube
+    running = np.maximum.accumulate(dense) if len(dense) else dense
+    first = rows[np.concatenate(([True], running[1:] > running[:-1]))[:len(rows)]]
+
+    arrays = [uniques.take(codes[first]) for codes, uniques in encoded]
+    return ids, ngroups, pd.MultiIndex.from_arrays(arrays, names=names)
+
+
+def _reduce_numeric(values: np.ndarray, ids: np.ndarray, ngroups: int, part: str):
+    present = ids >= 0
+    if values.dtype.kind == "f":
+        present &= ~np.isnan(values)
+    group, data = ids[present], values[present]
+
+    if part == "count":
+        return np.bincount(group, minlength=ngroups)
+    if part == "sum":
+        if data.dtype.kind == "f":
+            return np.bincount(group, weights=data, minlength=ngroups)
+        out = np.zeros(ngroups, dtype=np.int64)
+        np.add.at(out, group, data.astype(np.int64, copy=False))
+        return out
+
+    if data.dtype.kind == "b":
+        data = data.astype(np.int64)
+    if data.dtype.kind == "f":
+        fill = np.inf if part == "min" else -np.inf
+    else:
+        info = np.iinfo(data.dtype)
+        fill = info.max if part == "min" else info.min
+    out = np.full(ngroups, fill, dtype=data.dtype)
+    (np.minimum if part == "min" else np.maximum).at(out, group, data)
+    if data.dtype.kind == "f":
+        out[np.bincount(group, minlength=ngroups) == 0] = np.nan
+    return out
+
+
+def reduce_part(values: pd.Series, ids: np.ndarray, ngroups: int, part: str) -> np.ndarray:
+    """Reduce una columna por grupo (sum, count, min o max)."""
+    extension = isinstance(values.dtype, pd.api.extensions.ExtensionDtype)
+    if values.dtype.kind in "fiub" and not extension:
+        return _reduce_numeric(values.to_numpy(), ids, ngroups, part)
+
+    # Strings, fechas y tipos nullable: pandas sobre los ids ya calculados
+    present = ids >= 0
+    grouped = pd.Series(values.to_numpy()[present]).groupby(ids[present]).agg(part)
+    return grouped.reindex(range(ngroups)).to_numpy()
+
+
+def hash_aggregate(keys: list, columns: dict) -> pd.DataFrame:
+    """
+    Agrega columnas por las claves en una pasada.
+
+    Args:
+        keys (list): Series/Index de claves.
+        columns (dict): nombre de salida -> (Series de valores, parte).
+
+    Returns:
+        DataFrame indexado por las claves con una columna por entrada.
+    """
+    ids, ngroups, index = group_ids(keys)
+    data = {name: reduce_part(values, ids, ngroups, part)
+            for name, (values, part) in columns.items()}
+    return pd.DataFrame(data, index=index)
+
+
+def partial_aggregate(df: pd.DataFrame, params: dict) -> pd.DataFrame:
+    """
+    Calcula el agregado parcial de un chunk.
+
+    Devuelve un DataFrame indexado por las claves de agrupación con una columna
+    `<columna>__<parte>` por cada parte necesaria (ej: mean -> sum y count).
+    """
+    keys = group_keys(params)
+    key_series = [df[key] for key in keys] or [pd.Series(0, index=df.index, name=GLOBAL_KEY)]
+
+    columns = {}
+    for column, func, _ in metric_specs(params):
+        for part in PARTIAL_PARTS[func]:
+            columns[f"{column}__{part}"] = (df[column], part)
+    return hash_aggregate(key_series, columns)
+
+
+def merge_partials(partials: list) -> pd.DataFrame:
+    """Combina varios agregados parciales en uno solo."""
+    partials = [p for p in partials if p is not None]
+    if len(partials) == 1:
+        return partials[0]
+    return combine_partial(pd.concat(partials))
+
+
+def combine_partial(partial: pd.DataFrame) -> pd.DataFrame:
+    """Combina las filas de un parcial que comparten clave (ej: tras re-etiquetarlo)."""
+    index = partial.index
+    keys = [index.get_level_values(i) for i in range(index.nlevels)]
+    columns = {name: (partial[name], MERGE_PARTS[name.rsplit("__", 1)[1]])
+               for name in partial.columns}
+    return hash_aggregate(keys, columns)
+
+
+def finalize_aggregate(partial: pd.DataFrame, params: dict) -> pd.DataFrame:
+    """
+    Convierte un agregado parcial en el resultado final de `aggregate`.
+
+    Los grupos salen ordenados por clave, como en pandas.groupby.
+    """
+    partial = partial.sort_index()
+    result = pd.DataFrame(index=partial.index)
+    for column, func, output in metric_specs(params):
+        if func == "mean":
+            result[output] = partial[f"{column}__sum"] / partial[f"{column}__count"]
+        else:
+            result[output] = partial[f"{column}__{func}"]
+
+    result = result.reset_index()
+    if GLOBAL_KEY in result.columns:
+        result = result.drop(columns=[GLOBAL_KEY])
+    return result
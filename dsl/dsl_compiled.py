@@ -0,0 +1,89 @@
+# dsl_compiled.py
+"""
+Cache en disco de pipelines ya parseados, validados y compilados.
+
+La clave es el SHA-256 del YAML más ENGINE_VERSION: si el archivo no cambió,
+una nueva ejecución carga el pipeline (y el plan lógico optimizado, si es un
+pipeline DSL) desde un pickle sin volver a parsear ni validar. Cambiar el YAML
+o la versión del motor produce otra clave; las entradas menos usadas se
+desalojan al superar DEFAULT_MAX_ENTRIES.
+"""
+import hashlib
+import os
+import pickle
+import yaml
+from dsl.dsl_parser import DSLValidationError
+from dsl.dsl_engine import ENGINE_VERSION, plan_dsl
+
+DEFAULT_CACHE_DIR = os.path.join(".orion_cache", "compiled")
+DEFAULT_MAX_ENTRIES = 256
+
+# Contadores del proceso (útiles en benchmarks y tests)
+compile_stats = {"hits": 0, "misses": 0}
+
+
+def compiled_key(raw: bytes) -> str:
+    """Clave de cache: hash del contenido del YAML y de la versión del motor."""
+    digest = hashlib.sha256(raw)
+    digest.update(f"\0engine={ENGINE_VERSION}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def load_compiled(path: str, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Carga un pipeline desde la cache de compilados o lo compila y lo guarda.
+
+    Args:
+        path (str): Ruta al YAML del pipeline.
+        cache_dir (str): Directorio de la cache (None la desactiva).
+
+    Returns:
+        tuple: (dsl, plan). `plan` es el LogicalPlan optimizado para pipelines
+            DSL (source/steps/output) y None para pipelines de acciones.
+
+    Raises:
+        DSLValidationError: Si el archivo no se puede leer o no es válido.
+    """
+    try:
+        with open(path, "rb") as f:
+            raw = f.read()
+    except OSError as e:
+        raise DSLValidationError(f"Error cargando DSL: {e}") from e
+
+    entry_path = os.path.join(cache_dir, f"{compiled_key(raw)}.pkl") if cache_dir else None
+    if entry_path and os.path.exists(entry_path):
+        try:
+            with open(entry_path, "rb") as f:
+                compiled = pickle.load(f)
+            os.utime(entry_path)
+            compile_stats["hits"] += 1
+            return compiled
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            pass  # Entrada corrupta o de otra versión del código: recompilar
+
+    compile_stats["misses"] += 1
+    try:
+        dsl = yaml.safe_load(raw)
+    except yaml.YAMLError as e:
+        raise DSLValidationError(f"Error cargando DSL: {e}") from e
+
+    plan = plan_dsl(dsl) if isinstance(dsl, dict) and "source" in dsl else None
+    if entry_path:
+        _store(entry_path, (dsl, plan))
+    return dsl, plan
+
+
+def _store(entry_path: str, compiled):
+    """Guarda la entrada de forma atómica y desaloja las menos usadas."""
+    cache_dir = os.path.dirname(entry_path)
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = f"{entry_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(compiled, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, entry_path)
+
+    entries = [e for e in os.scandir(cache_dir) if e.name.endswith(".pkl")]
+    if len(entries) > DEFAULT_MAX_ENTRIES:
+        entries.sort(key=lambda e: e.stat().st_mtime)
+        for entry in entries[:len(entries) - DEFAULT_MAX_ENTRIES]:
+            os.remove(entry.path)
@@ -0,0 +1,655 @@
+# dsl_engine.py
+"""
+Motor de ejecución del DSL de ORION.
+
+Ejecuta pipelines validados (source -> steps -> output) sobre pandas a partir
+del plan lógico optimizado (ver dsl_optimizer), ya sea
+cargando el dataset completo (modo batch) o en modo streaming: la fuente se lee
+en chunks de memoria acotada, las operaciones fila a fila se aplican por chunk,
+`aggregate` se calcula como agregados parciales combinables y el resultado se
+escribe de forma incremental. Si la fuente es un glob o un directorio, cada
+archivo se procesa en un proceso distinto y los parciales se combinan al final.
+"""
+import copy
+import glob
+import math
+import operator
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import numpy as np
+import pandas as pd
+from pandas.tseries.frequencies import to_offset
+from dsl.dsl_aggregate import (
+    combine_partial, finalize_aggregate, merge_partials, partial_aggregate)
+from dsl.dsl_parser import DSLValidationError, validate_dsl
+from dsl.dsl_parquet import ParquetScan, ParquetSink
+from dsl.dsl_spec import ROW_WISE_OPERATIONS, WINDOW_OPERATIONS
+from dsl.dsl_optimizer import (
+    LogicalPlan, compile_plan, group_keys, metric_specs, optimize, rolling_output)
+
+# Incrementar al cambiar el formato del plan o la semántica de las operaciones:
+# invalida los pipelines compilados guardados en cache (ver dsl_compiled)
+ENGINE_VERSION = "2"
+
+DEFAULT_CHUNK_ROWS = 100_000
+MIN_CHUNK_ROWS = 1_000
+SAMPLE_ROWS = 1_000
+
+_DAY_NANOS = 86_400 * 10 ** 9
+
+# Fracción del límite de memoria que puede ocupar un chunk crudo. El resto queda
+# como margen para las copias intermedias de pandas y la tabla de agregados.
+CHUNK_MEMORY_FRACTION = 0.25
+
+_FILTER_FUNCS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+}
+
+_CAST_TYPES = {"int": "int64", "float": "float64", "str": "str", "bool": "bool"}
+
+
+# --- Operaciones ---
+
+
+def _op_drop_na(df, params):
+    return df.dropna(subset=params.get("columns"))
+
+
+def _op_convert_type(df, params):
+    column = params["column"]
+    return df.assign(**{column: df[column].astype(_CAST_TYPES[params["to"]])})
+
+
+def _op_filter(df, params):
+    compare = _FILTER_FUNCS[params.get("op", "==")]
+    return df[compare(df[params["column"]], params["value"])]
+
+
+def _op_rename_column(df, params):
+    # El optimizador fusiona renames consecutivos en un único `mapping`
+    mapping = params.get("mapping") or {params["from"]: params["to"]}
+    return df.rename(columns=mapping)
+
+
+def _op_select_columns(df, params):
+    return df[list(params["columns"])]
+
+
+def _op_aggregate(df, params):
+    return finalize_aggregate(partial_aggregate(df, params), params)
+
+
+def _op_rolling(df, params):
+    return rolling_chunk(df, params)[0]
+
+
+def _op_resample(df, params):
+    return finalize_step(partial_step(df, {"resample": params}), {"resample": params})
+
+
+OPERATIONS = {
+    "drop_na": _op_drop_na,
+    "convert_type": _op_convert_type,
+    "filter": _op_filter,
+    "rename_column": _op_rename_column,
+    "select_columns": _op_select_columns,
+    "aggregate": _op_aggregate,
+    "rolling": _op_rolling,
+    "resample": _op_resample,
+}
+
+
+def apply_step(df: pd.DataFrame, step: dict) -> pd.DataFrame:
+    """Aplica un step del DSL ({operacion: parametros}) a un DataFrame."""
+    op_name, params = next(iter(step.items()))
+    return OPERATIONS[op_name](df, params or {})
+
+
+def apply_steps(df: pd.DataFrame, steps: list) -> pd.DataFrame:
+    """Aplica una secuencia de steps en orden."""
+    for step in steps:
+        df = apply_step(df, step)
+    return df
+
+
+# --- Agregados parciales ---
+
+
+def _resample_params(params: dict) -> dict:
+    """Un resample es un aggregate cuya última clave es el bucket de tiempo."""
+    return {"group_by": group_keys(params) + [params["time_column"]],
+            "metrics": params["metrics"]}
+
+
+def _time_buckets(series: pd.Series, rule: str) -> pd.Series:
+    """
+    Bucket base de cada timestamp: un intervalo que cae entero dentro de un
+    intervalo de `rule`, para cualquier origen que elija pandas.resample.
+
+    Frecuencias fijas (Tick): el MCD entre la frecuencia y un día (los
+    intervalos de pandas arrancan a la medianoche del primer día). Frecuencias
+    de calendario (día, semana, mes...): el día.
+    """
+    times = pd.to_datetime(series)
+    offset = to_offset(rule)
+    if isinstance(offset, pd.offsets.Tick):
+        return times.dt.floor(pd.Timedelta(math.gcd(offset.nanos, _DAY_NANOS)))
+    return times.dt.normalize()
+
+
+def _resample_bins(buckets: pd.DatetimeIndex, rule: str):
+    """
+    Intervalos de pandas.resample para un grupo de buckets base.
+
+    Returns:
+        tuple: (etiqueta del intervalo de cada bucket, todas las etiquetas
+            entre el primero y el último, incluidos los vacíos)
+    """
+    unique = buckets.dropna().unique().sort_values()
+    firsts = pd.Series(unique, index=unique).resample(rule).first()
+    occupied = firsts.dropna()
+    # Cada bucket va al último intervalo no vacío cuyo primer bucket no lo supera
+    positions = np.searchsorted(occupied.to_numpy(), buckets.to_numpy(), side="right") - 1
+    labels = occupied.index[positions.clip(0)]
+    # Sin timestamp no hay intervalo (pandas.resample descarta esas filas)
+    return labels.where(~buckets.isna(), pd.NaT), firsts.index
+
+
+def _finalize_resample(partial: pd.DataFrame, params: dict) -> pd.DataFrame:
+    """
+    Re-etiqueta los buckets base del parcial con los intervalos de
+    pandas.resample (calculados por grupo, como en groupby().resample()),
+    combina los que caen en el mismo intervalo y agrega los intervalos vacíos.
+    """
+    time_column = params["time_column"]
+    keys = group_keys(params)
+    index = partial.index.to_frame(index=False)
+    labels = pd.Series(pd.NaT, index=index.index, dtype=index[time_column].dtype)
+    bins = {}
+    for key, frame in (index.groupby(keys, sort=False) if keys else [((), index)]):
+        group_labels, bins[key] = _resample_bins(pd.DatetimeIndex(frame[time_column]),
+                                                 params["rule"])
+        labels.iloc[frame.index] = group_labels
+
+    index[time_column] = labels
+    partial = combine_partial(partial.set_axis(pd.MultiIndex.from_frame(index)))
+    return _fill_empty_bins(finalize_aggregate(partial, _resample_params(params)), params, bins)
+
+
+def _fill_empty_bins(result: pd.DataFrame, params: dict, bins: dict) -> pd.DataFrame:
+    """
+    Agrega los intervalos vacíos entre el primero y el último de cada grupo,
+    como hace pandas.resample (sum/count en 0, el resto en NaN).
+    """
+    if result.empty:
+        return result
+    time_column = params["time_column"]
+    keys = group_keys(params)
+    groups = result.groupby(keys, sort=False) if keys else [((), result)]
+
+    filled = []
+    for key, frame in groups:
+        frame = frame.set_index(time_column).drop(columns=keys).reindex(bins[key])
+        frame.index.name = time_column
+        filled.append(frame.reset_index().assign(**dict(zip(keys, key))))
+
+    outputs = [output for _, _, output in metric_specs(params)]
+    out = pd.concat(filled, ignore_index=True)[keys + [time_column] + outputs]
+    for _, func, output in metric_specs(params):
+        if func in ("sum", "count"):
+            out[output] = out[output].fillna(0).astype(result[output].dtype)
+    return out
+
+
+def partial_step(df: pd.DataFrame, step: dict) -> pd.DataFrame:
+    """Agregado parcial de un chunk para un step aggregate o resample."""
+    op_name, params = next(iter(step.items()))
+    if op_name == "resample":
+        buckets = _time_buckets(df[params["time_column"]], params["rule"])
+        return partial_aggregate(df.assign(**{params["time_column"]: buckets}),
+                                 _resample_params(params))
+    return partial_aggregate(df, params)
+
+
+def finalize_step(partial: pd.DataFrame, step: dict) -> pd.DataFrame:
+    """Resultado final de un step aggregate o resample a partir del parcial."""
+    op_name, params = next(iter(step.items()))
+    if op_name == "resample":
+        return _finalize_resample(partial, params)
+    return finalize_aggregate(partial, params)
+
+
+def split_at_aggregate(steps: list):
+    """
+    Separa los steps en (prefijo por chunks, step aggregate/resample, resto).
+
+    El prefijo (operaciones fila a fila y de ventana) puede aplicarse chunk por
+    chunk con ChunkSteps; el resto se aplica sobre el resultado ya agregado,
+    que es chico.
+    """
+    for i, step in enumerate(steps):
+        if next(iter(step)) not in ROW_WISE_OPERATIONS | WINDOW_OPERATIONS:
+            return steps[:i], step, steps[i + 1:]
+    return steps, None, []
+
+
+def has_window_steps(steps: list) -> bool:
+    """True si algún step necesita arrastrar estado entre chunks."""
+    return any(next(iter(step)) in WINDOW_OPERATIONS for step in steps)
+
+
+# --- Ventanas ---
+
+
+def rolling_chunk(df: pd.DataFrame, params: dict, carry=None):
+    """
+    Calcula un rolling sobre un chunk, continuando el del chunk anterior.
+
+    `carry` son las últimas window-1 filas (por grupo) de la entrada previa:
+    se anteponen al chunk para que las primeras ventanas vean las filas que
+    les corresponden y luego se descartan del resultado.
+
+    Returns:
+        tuple: (chunk con la columna nueva, carry para el siguiente chunk)
+    """
+    window = params["window"]
+    column = params["column"]
+    keys = group_keys(params)
+    skip = 0 if carry is None else len(carry)
+    combined = pd.concat([carry, df], ignore_index=True) if skip else df.reset_index(drop=True)
+
+    source = combined.groupby(keys, sort=False)[column] if keys else combined[column]
+    rolled = source.rolling(window, min_periods=params.get("min_periods")).agg(
+        params.get("func", "mean"))
+    if keys:
+        rolled = rolled.reset_index(level=list(range(len(keys))), drop=True)
+
+    tail = combined.groupby(keys, sort=False).tail(window - 1) if keys else \
+        combined.tail(window - 1)
+    result = combined.assign(**{rolling_output(params): rolled}).iloc[skip:]
+    return result, tail
+
+
+class ChunkSteps:  # pylint: disable=too-few-public-methods
+    """
+    Aplica el prefijo de un pipeline chunk a chunk.
+
+    Las operaciones fila a fila se aplican sobre cada chunk por separado; las
+    de ventana (rolling) guardan en `carry` el estado necesario para que el
+    resultado sea el mismo que con todo el dataset en memoria.
+    """
+
+    def __init__(self, steps: list, carry=None):
+        self.steps = steps
+        self.carry = carry or {}
+
+    def apply(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """Aplica los steps a un chunk y actualiza el estado de las ventanas."""
+        for i, step in enumerate(self.steps):
+            op_name, params = next(iter(step.items()))
+            if op_name in WINDOW_OPERATIONS:
+                chunk, self.carry[i] = rolling_chunk(chunk, params, self.carry.get(i))
+            else:
+                chunk = apply_step(chunk, step)
+        return chunk
+
+
+# --- Lectura ---
+
+
+def open_parquet_scan(plan: LogicalPlan):
+    """Abre la fuente Parquet con proyección y filtros empujados (o None)."""
+    if plan.source["type"] != "parquet":
+        return None
+    return ParquetScan(plan.source["path"], columns=plan.columns, filters=plan.filters)
+
+
+def csv_read_options(plan: LogicalPlan) -> dict:
+    """Proyección y dtypes que el optimizador empujó al lector de CSV."""
+    options = {}
+    if plan.columns is not None:
+        # Un callable no falla si falta una columna: el error lo da el step
+        options["usecols"] = plan.columns.__contains__
+    if plan.dtypes:
+        options["dtype"] = plan.dtypes
+    return options
+
+
+def read_source(plan: LogicalPlan, scan=None) -> pd.DataFrame:
+    """Lee la fuente completa en memoria."""
+    source = plan.source
+    if source["type"] == "csv":
+        return pd.read_csv(source["path"], **csv_read_options(plan))
+    if source["type"] == "json":
+        return pd.read_json(source["path"], lines=source.get("lines", False))
+    return (scan or open_parquet_scan(plan)).read()
+
+
+def iter_source_chunks(plan: LogicalPlan, chunk_rows: int, scan=None):
+    """Itera la fuente en chunks de a lo sumo `chunk_rows` filas."""
+    source = plan.source
+    if source["type"] == "csv":
+        with pd.read_csv(source["path"], chunksize=chunk_rows,
+                         **csv_read_options(plan)) as reader:
+            yield from reader
+    elif source["type"] == "json":
+        if not source.get("lines", False):
+            raise DSLValidationError(
+                "El modo streaming con source json requiere NDJSON (lines: true)")
+        with pd.read_json(source["path"], lines=True, chunksize=chunk_rows) as reader:
+            yield from reader
+    else:
+        yield from (scan or open_parquet_scan(plan)).iter_chunks(chunk_rows)
+
+
+def estimate_chunk_rows(plan: LogicalPlan, memory_limit_mb: float) -> int:
+    """
+    Estima cuántas filas entran en un chunk respetando el límite de memoria.
+
+    Lee una muestra de la fuente, mide los bytes por fila en pandas y reserva
+    para el chunk solo CHUNK_MEMORY_FRACTION del límite.
+    """
+    sample = next(iter_source_chunks(plan, SAMPLE_ROWS), None)
+    if sample is None or sample.empty:
+        return DEFAULT_CHUNK_ROWS
+
+    bytes_per_row = sample.memory_usage(deep=True).sum() / len(sample)
+    budget = memory_limit_mb * 1024 * 1024 * CHUNK_MEMORY_FRACTION
+    return max(MIN_CHUNK_ROWS, int(budget / bytes_per_row))
+
+
+# --- Escritura ---
+
+
+class ChunkWriter:  # pylint: disable=too-many-instance-attributes
+    """
+    Escritor incremental de resultados.
+
+    CSV se escribe en modo append (header solo en el primer chunk), JSON como
+    un array de registros que se va completando chunk a chunk y Parquet con un
+    row group por chunk.
+
+    Si se pasa `started` (time.perf_counter() al iniciar la ejecución),
+    `first_row_s` registra cuánto tardó en escribirse la primera fila.
+    """
+
+    def __init__(self, output: dict, started=None):
+        self.output_type = output["type"]
+        self.path = output["path"]
+        self.rows_written = 0
+        self.started = started
+        self.first_row_s = None
+        self._file = None
+        self._first = True
+
+        dirname = os.path.dirname(self.path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+
+        self._parquet = ParquetSink(self.path) if self.output_type == "parquet" else None
+
+    def _ensure_open(self):
+        if self._file is None:
+            self._file = open(self.path, "w", encoding="utf-8", newline="")  # pylint: disable=consider-using-with
+            if self.output_type == "json":
+                self._file.write("[")
+
+    def write(self, df: pd.DataFrame):
+        """Agrega un chunk al archivo de salida."""
+        self.rows_written += len(df)
+        if self.started is not None and self.first_row_s is None and len(df):
+            self.first_row_s = round(time.perf_counter() - self.started, 6)
+        if self._parquet is not None:
+            self._parquet.write(df)
+            return
+
+        self._ensure_open()
+        if self.output_type == "csv":
+            df.to_csv(self._file, index=False, header=self._first)
+            self._first = False
+        elif not df.empty:
+            records = df.to_json(orient="records", force_ascii=False,
+                                 date_format="iso")[1:-1]
+            if not self._first:
+                self._file.write(",")
+            self._file.write(records)
+            self._first = False
+
+    def close(self):
+        """Cierra el archivo de salida."""
+        if self._parquet is not None:
+            self._parquet.close()
+            return
+
+        self._ensure_open()
+        if self.output_type == "json":
+            self._file.write("]")
+        self._file.close()
+
+
+# --- Ejecución ---
+
+
+def _run_batch(plan: LogicalPlan, started=None) -> dict:
+    scan = open_parquet_scan(plan)
+    df = read_source(plan, scan)
+    rows_in = len(df)
+    result = apply_steps(df, plan.steps)
+
+    writer = ChunkWriter(plan.output, started)
+    writer.write(result)
+    writer.close()
+
+    stats = {"mode": "batch", "rows_in": rows_in,
+             "rows_out": writer.rows_written, "chunks": 1,
+             "first_row_s": writer.first_row_s}
+    if scan is not None:
+        stats["scan"] = scan.stats()
+    return stats
+
+
+def _iter_paths_chunks(plan: LogicalPlan, chunk_rows: int, scan=None, paths=None):
+    """Chunks de la fuente del plan o, con `paths`, de cada archivo en orden."""
+    if paths is None:
+        yield from iter_source_chunks(plan, chunk_rows, scan)
+        return
+    for path in paths:
+        yield from iter_source_chunks(_partition_plan(plan, path), chunk_rows)
+
+
+def _run_streaming(plan: LogicalPlan, chunk_rows: int, started=None, paths=None) -> dict:
+    """
+    Ejecuta el plan chunk a chunk. Con `paths` lee esos archivos en orden como
+    un único stream (fuentes particionadas con operaciones de ventana).
+    """
+    prefix, aggregate_step, suffix = split_at_aggregate(plan.steps)
+    chunk_steps = ChunkSteps(prefix)
+
+    scan = open_parquet_scan(plan) if paths is None else None
+    writer = ChunkWriter(plan.output, started)
+    rows_in = 0
+    chunks = 0
+    partial = None
+
+    try:
+        for chunk in _iter_paths_chunks(plan, chunk_rows, scan, paths):
+            rows_in += len(chunk)
+            chunks += 1
+            chunk = chunk_steps.apply(chunk)
+
+            if aggregate_step is None:
+                writer.write(chunk)
+            else:
+                partial = merge_partials([partial, partial_step(chunk, aggregate_step)])
+
+        if partial is not None:
+            writer.write(apply_steps(finalize_step(partial, aggregate_step), suffix))
+    finally:
+        writer.close()
+
+    stats = {"mode": "streaming", "rows_in": rows_in,
+             "rows_out": writer.rows_written, "chunks": chunks,
+             "chunk_rows": chunk_rows, "first_row_s": writer.first_row_s}
+    if scan is not None:
+        stats["scan"] = scan.stats()
+    return stats
+
+
+# --- Fan-out multi-archivo ---
+
+
+def expand_source_paths(source: dict) -> list:
+    """
+    Expande source.path a la lista de archivos a procesar.
+
+    Acepta un archivo, un glob (ej: data/ventas/*.csv) o un directorio, del
+    que se toman los archivos con la extensión del source.type.
+    """
+    path = source["path"]
+    if os.path.isdir(path):
+        pattern = os.path.join(path, f"*.{source['type']}")
+    elif any(char in path for char in "*?["):
+        pattern = path
+    else:
+        return [path]
+
+    paths = sorted(glob.glob(pattern))
+    if not paths:
+        raise DSLValidationError(f"source.path no coincide con ningún archivo: {path}")
+    return paths
+
+
+def _partition_plan(plan: LogicalPlan, path: str) -> LogicalPlan:
+    part = copy.copy(plan)
+    part.source = {**plan.source, "path": path}
+    return part
+
+
+def _run_partition(plan: LogicalPlan, chunk_rows=None):
+    """
+    Procesa un archivo en un proceso worker.
+
+    Returns:
+        tuple: (filas leídas, agregado parcial) si el plan tiene aggregate, o
+            (filas leídas, filas resultantes del tramo fila a fila).
+    """
+    prefix, aggregate_step, _ = split_at_aggregate(plan.steps)
+    chunks = iter_source_chunks(plan, chunk_rows) if chunk_rows else [read_source(plan)]
+
+    rows_in = 0
+    results = []
+    partial = None
+    for chunk in chunks:
+        rows_in += len(chunk)
+        chunk = apply_steps(chunk, prefix)
+        if aggregate_step is None:
+            results.append(chunk)
+        else:
+            partial = merge_partials([partial, partial_step(chunk, aggregate_step)])
+
+    if aggregate_step is None:
+        return rows_in, pd.concat(results, ignore_index=True) if results else pd.DataFrame()
+    return rows_in, partial
+
+
+def _map_partitions(parts: list, chunk_rows, workers: int):
+    """Ejecuta `_run_partition` sobre cada parte, en orden, con `workers` procesos."""
+    if workers <= 1:
+        yield from map(_run_partition, parts, repeat(chunk_rows))
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(_run_partition, parts, repeat(chunk_rows))
+
+
+def _run_partitioned(plan: LogicalPlan, paths: list, workers: int,  # pylint: disable=too-many-arguments,too-many-positional-arguments
+                     chunk_rows=None, started=None) -> dict:
+    _, aggregate_step, suffix = split_at_aggregate(plan.steps)
+    parts = [_partition_plan(plan, path) for path in paths]
+
+    writer = ChunkWriter(plan.output, started)
+    rows_in = 0
+    partial = None
+
+    try:
+        for part_rows, result in _map_partitions(parts, chunk_rows, workers):
+            rows_in += part_rows
+            if aggregate_step is None:
+                writer.write(result)
+            else:
+                partial = merge_partials([partial, result])
+
+        if partial is not None:
+            writer.write(apply_steps(finalize_step(partial, aggregate_step), suffix))
+    finally:
+        writer.close()
+
+    return {"mode": "parallel", "rows_in": rows_in,
+            "rows_out": writer.rows_written, "partitions": len(paths),
+            "workers": workers, "chunk_rows": chunk_rows,
+            "first_row_s": writer.first_row_s}
+
+
+def plan_dsl(dsl: dict) -> LogicalPlan:
+    """Valida un DSL y lo compila a un plan lógico optimizado."""
+    validate_dsl(dsl)
+    return optimize(compile_plan(dsl))
+
+
+def execute_dsl(dsl: dict, streaming=None, memory_limit_mb=None, chunk_rows=None,  # pylint: disable=too-many-arguments
+                workers=None, *, plan=None, started=None) -> dict:
+    """
+    Valida, optimiza y ejecuta un pipeline DSL.
+
+    Args:
+        dsl (dict): Pipeline con secciones source, steps, output y opcionalmente
+            execution ({mode, memory_limit_mb, chunk_rows}).
+        streaming (bool): Fuerza el modo streaming (True) o batch (False).
+            Si es None se usa execution.mode.
+        memory_limit_mb (float): Límite de memoria para dimensionar los chunks.
+        chunk_rows (int): Tamaño de chunk explícito; tiene prioridad sobre
+            el límite de memoria.
+        workers (int): Procesos para fuentes multi-archivo (glob/directorio).
+            Por defecto, uno por archivo hasta la cantidad de CPUs.
+        plan (LogicalPlan): Plan ya validado y optimizado (ej: desde la cache
+            de pipelines compilados); si falta se compila a partir de `dsl`.
+        started (float): time.perf_counter() del inicio de la corrida, para
+            medir `first_row_s`; por defecto, el inicio de esta llamada.
+
+    Returns:
+        dict: Estadísticas de la ejecución (filas leídas/escritas, chunks y
+            segundos hasta la primera fila escrita).
+    """
+    started = started or time.perf_counter()
+    plan = plan or plan_dsl(dsl)
+    execution = dsl.get("execution") or {}
+    paths = expand_source_paths(plan.source)
+    partitioned = len(paths) > 1 or paths[0] != plan.source["path"]
+
+    if streaming is None:
+        streaming = execution.get("mode", "batch") == "streaming"
+
+    if streaming:
+        memory_limit_mb = memory_limit_mb or execution.get("memory_limit_mb")
+        chunk_rows = chunk_rows or execution.get("chunk_rows")
+        if not chunk_rows:
+            chunk_rows = (estimate_chunk_rows(_partition_plan(plan, paths[0]), memory_limit_mb)
+                          if memory_limit_mb else DEFAULT_CHUNK_ROWS)
+
+    if partitioned and not has_window_steps(split_at_aggregate(plan.steps)[0]):
+        workers = workers or execution.get("workers") or min(len(paths), os.cpu_count() or 1)
+        return _run_partitioned(plan, paths, workers, chunk_rows if streaming else None,
+                                started)
+    if partitioned:
+        # Las ventanas cruzan archivos: se leen en orden en un único proceso
+        return _run_streaming(plan, chunk_rows or DEFAULT_CHUNK_ROWS, started, paths)
+
+    if not streaming:
+        return _run_batch(plan, started)
+    return _run_streaming(plan, chunk_rows, started)
@@ -0,0 +1,267 @@
+# dsl_incremental.py
+"""
+Ejecución incremental de pipelines DSL sobre fuentes CSV append-only.
+
+Por cada archivo de la fuente se guarda hasta qué byte se procesó, su header y
+un hash de los últimos bytes procesados. En la siguiente ejecución, si el
+archivo solo creció, se parsea únicamente el rango agregado (con el header
+cacheado adelante) y el resultado se combina con la salida existente: las filas
+nuevas se agregan al final, los agregados parciales guardados se combinan con
+los del rango nuevo y las ventanas (rolling) continúan desde las últimas filas
+guardadas. Si un archivo se reescribió o desapareció, o si la salida
+cambió por fuera, se recalcula todo desde cero.
+
+Solo se procesan registros completos: una última línea sin salto de línea (o
+un campo entre comillas todavía abierto, que puede contener saltos de línea)
+queda pendiente hasta que el archivo vuelva a crecer.
+"""
+import hashlib
+import io
+import json
+import os
+import pandas as pd
+from csv_scan import record_end
+from dsl.dsl_parser import DSLValidationError
+from dsl.dsl_engine import (
+    DEFAULT_CHUNK_ROWS,
+    ChunkSteps,
+    ChunkWriter,
+    apply_steps,
+    csv_read_options,
+    expand_source_paths,
+    finalize_step,
+    merge_partials,
+    partial_step,
+    plan_dsl,
+    split_at_aggregate,
+)
+from utils import file_fingerprint
+
+DEFAULT_STATE_DIR = os.path.join(".orion_cache", "incremental")
+
+# Bytes finales del rango ya procesado que se comparan para detectar reescrituras
+TAIL_CHECK_BYTES = 4096
+
+
+class _ByteRange(io.RawIOBase):
+    """Archivo de solo lectura: `prefix` seguido de los bytes [start, end) de `path`."""
+
+    def __init__(self, path: str, prefix: bytes, start: int, end: int):
+        super().__init__()
+        self._file = open(path, "rb")  # pylint: disable=consider-using-with
+        self._file.seek(start)
+        self._prefix = prefix
+        self._remaining = end - start
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if self._prefix:
+            size = min(len(buffer), len(self._prefix))
+            buffer[:size] = self._prefix[:size]
+            self._prefix = self._prefix[size:]
+            return size
+        if self._remaining <= 0:
+            return 0
+        data = self._file.read(min(len(buffer), self._remaining))
+        buffer[:len(data)] = data
+        self._remaining -= len(data)
+        return len(data)
+
+    def close(self):
+        self._file.close()
+        super().close()
+
+
+def _read_header(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.readline()
+
+
+def _tail_hash(path: str, offset: int) -> str:
+    """Hash de los últimos TAIL_CHECK_BYTES antes de `offset`."""
+    start = max(0, offset - TAIL_CHECK_BYTES)
+    with open(path, "rb") as f:
+        f.seek(start)
+        return hashlib.sha256(f.read(offset - start)).hexdigest()
+
+
+def _rewritten(path: str, entry: dict) -> bool:
+    """True si el archivo ya no empieza con lo que se procesó la última vez."""
+    offset = entry["offset"]
+    if os.path.getsize(path) < offset:
+        return True
+    if offset and _read_header(path) != entry["header"].encode("latin-1"):
+        return True
+    return _tail_hash(path, offset) != entry["tail"]
+
+
+def _entry_dir(state_dir: str, dsl: dict) -> str:
+    spec = {key: dsl.get(key) for key in ("source", "steps", "output")}
+    canonical = json.dumps(spec, sort_keys=True, default=str)
+    return os.path.join(state_dir, hashlib.sha256(canonical.encode("utf-8")).hexdigest())
+
+
+def _load_state(entry_dir: str):
+    path = os.path.join(entry_dir, "state.json")
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _load_frames(entry_dir: str) -> dict:
+    """Agregado parcial y estado de las ventanas guardados por la última corrida."""
+    path = os.path.join(entry_dir, "frames.pkl")
+    if not os.path.exists(path):
+        return {"partial": None, "carry": {}}
+    return pd.read_pickle(path)
+
+
+def _save_state(entry_dir: str, state: dict, frames: dict):
+    os.makedirs(entry_dir, exist_ok=True)
+    pd.to_pickle(frames, os.path.join(entry_dir, "frames.pkl"))
+    tmp_path = os.path.join(entry_dir, "state.json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, os.path.join(entry_dir, "state.json"))
+
+
+def pending_ranges(state, paths: list, output_path: str):
+    """
+    Offset desde el que hay que procesar cada archivo.
+
+    Returns:
+        dict: {ruta: offset}, o None si hay que recalcular todo.
+    """
+    if not state or set(state["files"]) - set(paths):
+        return None
+    if not os.path.exists(output_path) or file_fingerprint(output_path) != state["output"]:
+        return None
+
+    ranges = {}
+    for path in paths:
+        entry = state["files"].get(path)
+        if entry is not None and _rewritten(path, entry):
+            return None
+        ranges[path] = entry["offset"] if entry else 0
+    return ranges
+
+
+def append_rows(output: dict, df: pd.DataFrame):
+    """Agrega filas al final de una salida existente (o la crea)."""
+    path = output["path"]
+    fresh = not os.path.exists(path) or os.path.getsize(path) == 0
+
+    if output["type"] == "csv":
+        df.to_csv(path, mode="a", index=False, header=fresh)
+    elif output["type"] == "json":
+        if df.empty and not fresh:
+            return
+        records = df.to_json(orient="records", force_ascii=False, date_format="iso")
+        if fresh:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(records)
+            return
+        # Reemplazar el "]" final del array por las filas nuevas
+        with open(path, "r+b") as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"]":
+                raise DSLValidationError(f"La salida JSON no es un array: {path}")
+            empty = f.seek(0, os.SEEK_END) <= 2
+            f.seek(-1, os.SEEK_END)
+            f.write(((" " if empty else ",") + records[1:]).encode("utf-8"))
+    else:
+        # Parquet no admite append: se reescribe con las filas nuevas al final
+        if not fresh:
+            df = pd.concat([pd.read_parquet(path), df], ignore_index=True)
+        df.to_parquet(path, index=False)
+
+
+def _iter_range(plan, path: str, start: int, end: int, chunk_rows: int):
+    """Parsea las líneas [start, end) del CSV, con el header adelante si start > 0."""
+    prefix = _read_header(path) if start else b""
+    with io.BufferedReader(_ByteRange(path, prefix, start, end)) as stream:
+        with pd.read_csv(stream, chunksize=chunk_rows, **csv_read_options(plan)) as reader:
+            yield from reader
+
+
+def _rewrite_aggregate(output: dict, partial, aggregate_step: dict, suffix: list) -> int:
+    """Reescribe la salida desde el parcial combinado (los agregados son chicos)."""
+    writer = ChunkWriter(output)
+    if partial is not None:
+        writer.write(apply_steps(finalize_step(partial, aggregate_step), suffix))
+    writer.close()
+    return writer.rows_written
+
+
+def run_incremental(dsl: dict, state_dir=DEFAULT_STATE_DIR,  # pylint: disable=too-many-locals
+                    chunk_rows=DEFAULT_CHUNK_ROWS, *, plan=None) -> dict:
+    """
+    Ejecuta un pipeline DSL procesando solo lo agregado desde la última vez.
+
+    Args:
+        dsl (dict): Pipeline DSL con source csv (archivo, glob o directorio).
+        state_dir (str): Directorio donde se guardan offsets y parciales.
+        chunk_rows (int): Filas por chunk al parsear los rangos.
+        plan (LogicalPlan): Plan ya compilado (si falta se compila `dsl`).
+
+    Returns:
+        dict: Estadísticas (`mode` es "full" o "incremental").
+    """
+    plan = plan or plan_dsl(dsl)
+    if plan.source["type"] != "csv":
+        raise DSLValidationError("La ejecución incremental requiere source.type csv")
+
+    prefix_steps, aggregate_step, suffix = split_at_aggregate(plan.steps)
+    paths = expand_source_paths(plan.source)
+    entry_dir = _entry_dir(state_dir, dsl)
+    state = _load_state(entry_dir)
+
+    ranges = pending_ranges(state, paths, plan.output["path"])
+    full = ranges is None
+    frames = {"partial": None, "carry": {}}
+    if full:
+        state = {"files": {}, "output": None}
+        ranges = dict.fromkeys(paths, 0)
+    else:
+        frames = _load_frames(entry_dir)
+    partial = frames["partial"]
+    chunk_steps = ChunkSteps(prefix_steps, frames["carry"])
+
+    writer = ChunkWriter(plan.output) if full and aggregate_step is None else None
+    stats = {"mode": "full" if full else "incremental", "rows_in": 0, "rows_out": 0,
+             "files": len(paths), "bytes_processed": 0}
+
+    for path, start in ranges.items():
+        # `start` es 0 o el fin de la corrida anterior: siempre un inicio de registro
+        end = record_end(path, start, os.path.getsize(path))
+        if end == start:
+            continue
+        for chunk in _iter_range(plan, path, start, end, chunk_rows):
+            stats["rows_in"] += len(chunk)
+            chunk = chunk_steps.apply(chunk)
+            if aggregate_step is not None:
+                partial = merge_partials([partial, partial_step(chunk, aggregate_step)])
+            elif writer is not None:
+                writer.write(chunk)
+            else:
+                append_rows(plan.output, chunk)
+                stats["rows_out"] += len(chunk)
+
+        stats["bytes_processed"] += end - start
+        state["files"][path] = {"offset": end, "header": _read_header(path).decode("latin-1"),
+                                "tail": _tail_hash(path, end)}
+
+    if writer is not None:
+        writer.close()
+        stats["rows_out"] = writer.rows_written
+    elif aggregate_step is not None and (full or stats["rows_in"]):
+        stats["rows_out"] = _rewrite_aggregate(plan.output, partial, aggregate_step, suffix)
+
+    if not os.path.exists(plan.output["path"]):
+        ChunkWriter(plan.output).close()
+    state["output"] = file_fingerprint(plan.output["path"])
+    _save_state(entry_dir, state, {"partial": partial, "carry": chunk_steps.carry})
+    return stats
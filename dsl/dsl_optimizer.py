@@ -0,0 +1,354 @@
+# dsl_optimizer.py
+"""
+Plan lógico y optimizador de pipelines DSL.
+
+Un pipeline validado se compila a un LogicalPlan (scan -> steps -> output) y
+se le aplican reglas de reescritura antes de ejecutarlo:
+
+- fusión de rename_column y select_columns adyacentes
+- filtros antes de conversiones (y de selects/renames que no los afectan)
+- eliminación de convert_type sobre columnas que nadie usa después
+- conversiones de tipo empujadas al lector como `dtype=`
+- proyección empujada al lector (`usecols` / columnas de Parquet)
+- filtros empujados a las estadísticas de row groups (Parquet)
+"""
+
+# Conversiones que pueden resolverse en el lector de CSV con el mismo resultado.
+# "str" no: astype(str) parte del valor ya inferido ("01" -> 1 -> "1", vacío ->
+# "nan") y dtype=str conserva el texto crudo ("01", vacío -> NaN).
+_READER_DTYPES = {"float": "float64"}
+
+
+def group_keys(params: dict) -> list:
+    """Devuelve las claves de agrupación de un aggregate como lista."""
+    keys = params.get("group_by") or []
+    return [keys] if isinstance(keys, str) else list(keys)
+
+
+def metric_specs(params: dict) -> list:
+    """
+    Métricas de un aggregate/resample como (columna, función, columna de salida).
+
+    `metrics` acepta una función por columna ({precio: mean}, la salida conserva
+    el nombre) o varias ({precio: [sum, mean]}, salidas precio_sum y precio_mean).
+    """
+    specs = []
+    for column, funcs in params["metrics"].items():
+        if isinstance(funcs, str):
+            specs.append((column, funcs, column))
+        else:
+            specs.extend((column, func, f"{column}_{func}") for func in funcs)
+    return specs
+
+
+def rolling_output(params: dict) -> str:
+    """Nombre de la columna que agrega un rolling (`as` o <columna>_<func>_<window>)."""
+    return params.get("as") or f"{params['column']}_{params.get('func', 'mean')}_{params['window']}"
+
+
+def _op(step):
+    op_name, params = next(iter(step.items()))
+    return op_name, params or {}
+
+
+def _rename_mapping(params: dict) -> dict:
+    """Un rename_column puede traer {from, to} o, ya fusionado, {mapping}."""
+    if "mapping" in params:
+        return dict(params["mapping"])
+    return {params["from"]: params["to"]}
+
+
+class LogicalPlan:  # pylint: disable=too-many-instance-attributes
+    """
+    Plan lógico de un pipeline DSL.
+
+    Attributes:
+        name: Nombre del pipeline
+        source: Sección source del DSL
+        steps: Steps a ejecutar en memoria (ya reescritos)
+        output: Sección output del DSL
+        columns: Columnas a leer de la fuente (None = todas)
+        dtypes: Tipos que el lector aplica directamente
+        filters: Filtros evaluables contra estadísticas de la fuente
+        rules: Reglas que modificaron el plan
+    """
+
+    def __init__(self, source: dict, steps: list, output: dict, name=None):
+        self.name = name
+        self.source = source
+        self.steps = list(steps)
+        self.output = output
+        self.columns = None
+        self.dtypes = {}
+        self.filters = []
+        self.rules = []
+
+
+def compile_plan(dsl: dict) -> LogicalPlan:
+    """Compila un DSL (ya validado) a un plan lógico sin optimizar."""
+    return LogicalPlan(dsl["source"], dsl["steps"], dsl["output"], dsl.get("name"))
+
+
+# --- Análisis de columnas ---
+
+
+def _needed_before(step: dict, needed):  # pylint: disable=too-many-return-statements
+    """Columnas necesarias antes de `step` dado lo que se necesita después."""
+    op_name, params = _op(step)
+    if op_name == "select_columns":
+        return set(params["columns"])
+    if op_name == "aggregate":
+        return set(group_keys(params)) | set(params["metrics"])
+    if op_name == "resample":
+        return set(group_keys(params)) | {params["time_column"]} | set(params["metrics"])
+    if needed is None:
+        return None
+    if op_name == "rolling":
+        return (needed - {rolling_output(params)}) | {params["column"]} | set(group_keys(params))
+    if op_name == "rename_column":
+        # El mapping se aplica de una vez (puede encadenar o intercambiar nombres)
+        mapping = _rename_mapping(params)
+        return ({column for column in needed if column not in mapping.values()}
+                | {old for old, new in mapping.items() if new in needed})
+    if op_name in ("filter", "convert_type"):
+        return needed | {params["column"]}
+    if op_name == "drop_na":
+        if params.get("columns") is None:
+            return None
+        return needed | set(params["columns"])
+    return needed
+
+
+def required_columns(steps: list):
+    """
+    Calcula qué columnas de la fuente necesitan los steps.
+
+    Recorre los steps de atrás hacia adelante. Devuelve None si hacen falta
+    todas las columnas (ej: no hay select_columns ni aggregate).
+    """
+    needed = None
+    for step in reversed(steps):
+        needed = _needed_before(step, needed)
+    return needed
+
+
+def source_filters(steps: list) -> list:
+    """
+    Devuelve los filtros del DSL que pueden evaluarse contra la fuente.
+
+    Solo se consideran los filtros del tramo inicial fila a fila cuya columna
+    no fue renombrada ni convertida antes; el resto depende de valores que
+    no existen tal cual en el archivo.
+    """
+    pushed = []
+    touched = set()
+    for step in steps:
+        op_name, params = _op(step)
+        if op_name == "filter":
+            if params["column"] not in touched:
+                pushed.append(params)
+        elif op_name == "rename_column":
+            for old, new in _rename_mapping(params).items():
+                touched.update((old, new))
+        elif op_name == "convert_type":
+            touched.add(params["column"])
+        elif op_name not in ("drop_na", "select_columns"):
+            break
+    return pushed
+
+
+# --- Reglas de reescritura ---
+
+
+def fuse_renames(steps: list) -> list:
+    """Fusiona rename_column consecutivos en un único rename con mapping."""
+    fused = []
+    for step in steps:
+        op_name, params = _op(step)
+        if op_name == "rename_column" and fused and _op(fused[-1])[0] == "rename_column":
+            first = _rename_mapping(_op(fused[-1])[1])
+            second = _rename_mapping(params)
+            mapping = {old: second.get(new, new) for old, new in first.items()}
+            for old, new in second.items():
+                # Si `old` fue renombrada por el primero ya no existe: no-op
+                if old not in first and old not in first.values():
+                    mapping[old] = new
+            mapping = {old: new for old, new in mapping.items() if old != new}
+            fused[-1] = {"rename_column": {"mapping": mapping}}
+        else:
+            fused.append(step)
+    return [s for s in fused if _op(s) != ("rename_column", {"mapping": {}})]
+
+
+def fuse_selects(steps: list) -> list:
+    """Fusiona select_columns consecutivos cuando el segundo es subconjunto."""
+    fused = []
+    for step in steps:
+        op_name, params = _op(step)
+        if (op_name == "select_columns" and fused
+                and _op(fused[-1])[0] == "select_columns"
+                and set(params["columns"]) <= set(_op(fused[-1])[1]["columns"])):
+            fused[-1] = step
+        else:
+            fused.append(step)
+    return fused
+
+
+def _filter_can_pass(filter_params: dict, step: dict) -> bool:
+    """¿Puede un filtro ejecutarse antes que `step` sin cambiar el resultado?"""
+    column = filter_params["column"]
+    op_name, params = _op(step)
+    if op_name == "convert_type":
+        return params["column"] != column
+    if op_name == "select_columns":
+        return column in params["columns"]
+    if op_name == "rename_column":
+        mapping = _rename_mapping(params)
+        return column not in mapping and column not in mapping.values()
+    return op_name == "drop_na"
+
+
+def filters_first(steps: list) -> list:
+    """Adelanta cada filtro lo más posible (sin cruzar otros filtros ni aggregate)."""
+    steps = list(steps)
+    for i, step in enumerate(steps):
+        op_name, params = _op(step)
+        if op_name != "filter":
+            continue
+        j = i
+        while j > 0 and _filter_can_pass(params, steps[j - 1]):
+            steps[j], steps[j - 1] = steps[j - 1], steps[j]
+            j -= 1
+    return steps
+
+
+def prune_dead_converts(steps: list) -> list:
+    """Elimina convert_type sobre columnas que ningún step posterior usa."""
+    kept = []
+    needed = None
+    for step in reversed(steps):
+        op_name, params = _op(step)
+        if op_name == "convert_type" and needed is not None:
+            if params["column"] not in needed:  # pylint: disable=unsupported-membership-test
+                continue
+        kept.append(step)
+        needed = _needed_before(step, needed)
+    return list(reversed(kept))
+
+
+def reader_dtypes(steps: list):
+    """
+    Separa las conversiones que el lector de CSV puede aplicar directamente.
+
+    Solo aplica a convert_type del tramo inicial que conserva todas las filas
+    (antes de cualquier filter o drop_na: el lector convertiría también las
+    filas que esos steps descartan) sobre columnas que ningún step anterior
+    renombra ni convierte.
+
+    Returns:
+        tuple: (steps restantes, dict columna -> dtype)
+    """
+    remaining = []
+    dtypes = {}
+    touched = set()
+    prefix = True
+    for step in steps:
+        op_name, params = _op(step)
+        if prefix and op_name == "convert_type":
+            column = params["column"]
+            pushable = column not in touched and params["to"] in _READER_DTYPES
+            touched.add(column)
+            if pushable:
+                dtypes[column] = _READER_DTYPES[params["to"]]
+                continue
+        elif op_name == "rename_column":
+            for old, new in _rename_mapping(params).items():
+                touched.update((old, new))
+        elif op_name != "select_columns":
+            prefix = False
+        remaining.append(step)
+    return remaining, dtypes
+
+
+def _rewrite(plan: LogicalPlan, rules: tuple):
+    """Aplica reglas de reescritura de steps y anota las que cambiaron algo."""
+    for rule in rules:
+        rewritten = rule(plan.steps)
+        if rewritten != plan.steps:
+            plan.rules.append(rule.__name__)
+            plan.steps = rewritten
+
+
+def optimize(plan: LogicalPlan) -> LogicalPlan:
+    """Aplica las reglas de reescritura y completa las opciones de lectura."""
+    _rewrite(plan, (fuse_renames, fuse_selects, prune_dead_converts))
+
+    # Antes de filters_first: en el orden original un convert_type previo a
+    # los filtros se aplica a todas las filas, igual que en el lector
+    if plan.source["type"] == "csv":
+        plan.steps, plan.dtypes = reader_dtypes(plan.steps)
+        if plan.dtypes:
+            plan.rules.append("reader_dtypes")
+
+    _rewrite(plan, (filters_first,))
+
+    if plan.source["type"] in ("csv", "parquet"):
+        plan.columns = required_columns(plan.steps)
+        if plan.columns is not None:
+            plan.rules.append("projection_pushdown")
+
+    if plan.source["type"] == "parquet":
+        plan.filters = source_filters(plan.steps)
+        if plan.filters:
+            plan.rules.append("filter_pushdown")
+
+    return plan
+
+
+# --- explain ---
+
+
+def _describe_step(step: dict) -> str:  # pylint: disable=too-many-return-statements
+    op_name, params = _op(step)
+    if op_name == "filter":
+        return f"Filter[{params['column']} {params.get('op', '==')} {params['value']!r}]"
+    if op_name == "convert_type":
+        return f"ConvertType[{params['column']} -> {params['to']}]"
+    if op_name == "rename_column":
+        mapping = ", ".join(f"{old} -> {new}" for old, new in _rename_mapping(params).items())
+        return f"Rename[{mapping}]"
+    if op_name == "select_columns":
+        return f"Project[{', '.join(params['columns'])}]"
+    if op_name == "drop_na":
+        columns = params.get("columns")
+        return f"DropNA[{', '.join(columns) if columns else '*'}]"
+    if op_name == "rolling":
+        return (f"Rolling[{params.get('func', 'mean')}({params['column']}) "
+                f"window={params['window']} by={group_keys(params)} -> {rolling_output(params)}]")
+    metrics = ", ".join(f"{func}({col})" for col, func, _ in metric_specs(params))
+    if op_name == "resample":
+        return (f"Resample[{params['time_column']} every {params['rule']} "
+                f"by={group_keys(params)} {metrics}]")
+    return f"Aggregate[by={group_keys(params)} {metrics}]"
+
+
+def explain(plan: LogicalPlan) -> str:
+    """Devuelve el plan como árbol de texto (la raíz es la salida)."""
+    scan = [f"Scan[{plan.source['type']} {plan.source['path']}"]
+    if plan.columns is not None:
+        scan.append(f" columns={sorted(plan.columns)}")
+    if plan.dtypes:
+        scan.append(f" dtypes={plan.dtypes}")
+    if plan.filters:
+        filters = [f"{f['column']} {f.get('op', '==')} {f['value']!r}" for f in plan.filters]
+        scan.append(f" filters={filters}")
+    scan.append("]")
+
+    nodes = [f"Output[{plan.output['type']} {plan.output['path']}]"]
+    nodes += [_describe_step(step) for step in reversed(plan.steps)]
+    nodes.append("".join(scan))
+
+    lines = [f"Plan: {plan.name or 'sin nombre'}"]
+    lines.append(f"Reglas aplicadas: {', '.join(plan.rules) or 'ninguna'}")
+    lines += [("  " * depth) + node for depth, node in enumerate(nodes)]
+    return "\n".join(lines)
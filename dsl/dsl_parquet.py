@@ -0,0 +1,196 @@
+# dsl_parquet.py
+"""
+Lectura y escritura de Parquet para el motor del DSL.
+
+La lectura empuja la proyección (solo las columnas necesarias) y los filtros
+simples al lector: los row groups cuyas estadísticas min/max no pueden
+satisfacer un filtro ni siquiera se leen del disco.
+
+La escritura agrega un row group por chunk. Si un chunk trae un tipo que no
+entra en el esquema (una columna vacía al principio y con texto después), el
+esquema se promueve y los row groups ya escritos se reescriben con él.
+"""
+import os
+import pandas as pd
+from dsl.dsl_parser import DSLValidationError
+
+# Para cada operador: ¿puede algún valor en [min, max] cumplir `valor <op> x`?
+_RANGE_MAY_MATCH = {
+    "==": lambda lo, hi, x: lo <= x <= hi,
+    "!=": lambda lo, hi, x: not lo == hi == x,
+    ">": lambda lo, hi, x: hi > x,
+    ">=": lambda lo, hi, x: hi >= x,
+    "<": lambda lo, hi, x: lo < x,
+    "<=": lambda lo, hi, x: lo <= x,
+}
+
+
+def _import_parquet():
+    """Importa pyarrow.parquet con un mensaje claro si no está instalado."""
+    try:
+        # pylint: disable=import-outside-toplevel
+        import pyarrow
+        import pyarrow.parquet
+        return pyarrow, pyarrow.parquet
+    except ImportError as e:
+        raise DSLValidationError(
+            "Parquet requiere pyarrow. Ejecutá: pip install pyarrow") from e
+
+
+class ParquetScan:
+    """
+    Lectura de un archivo Parquet con proyección y filtros empujados.
+
+    Args:
+        path (str): Archivo Parquet.
+        columns (set): Columnas necesarias, o None para leer todas.
+        filters (list): Filtros del DSL ({column, op, value}) que se evalúan
+            contra las estadísticas de cada row group.
+    """
+
+    def __init__(self, path, columns=None, filters=None):
+        _, pq = _import_parquet()
+        self.file = pq.ParquetFile(path)
+        schema_names = self.file.schema_arrow.names
+
+        if columns is None:
+            self.columns = schema_names
+        else:
+            # Respetar el orden del archivo
+            self.columns = [name for name in schema_names if name in columns]
+
+        self.filters = list(filters or [])
+        self.row_groups = [
+            i for i in range(self.file.num_row_groups)
+            if self._row_group_may_match(i)
+        ]
+
+    def _row_group_may_match(self, index) -> bool:
+        row_group = self.file.metadata.row_group(index)
+        names = self.file.schema_arrow.names
+
+        for flt in self.filters:
+            if flt["column"] not in names:
+                continue
+            column = row_group.column(names.index(flt["column"]))
+            stats = column.statistics
+            if stats is None or not stats.has_min_max:
+                continue
+            # `!=` conserva los nulos en pandas: solo se poda sin nulos
+            if flt.get("op", "==") == "!=" and stats.null_count:
+                continue
+            try:
+                if not _RANGE_MAY_MATCH[flt.get("op", "==")](
+                        stats.min, stats.max, flt["value"]):
+                    return False
+            except TypeError:
+                continue
+        return True
+
+    @property
+    def bytes_to_read(self) -> int:
+        """Bytes comprimidos de las columnas y row groups que se van a leer."""
+        names = self.file.schema_arrow.names
+        indexes = [names.index(name) for name in self.columns]
+        total = 0
+        for rg in self.row_groups:
+            row_group = self.file.metadata.row_group(rg)
+            total += sum(row_group.column(i).total_compressed_size for i in indexes)
+        return total
+
+    def stats(self) -> dict:
+        """Resumen de lo que se podó antes de leer."""
+        return {
+            "columns_read": len(self.columns),
+            "columns_total": len(self.file.schema_arrow.names),
+            "row_groups_read": len(self.row_groups),
+            "row_groups_total": self.file.num_row_groups,
+            "bytes_read": self.bytes_to_read,
+        }
+
+    def read(self) -> pd.DataFrame:
+        """Lee todos los row groups seleccionados en un DataFrame."""
+        if not self.row_groups:
+            return self.file.schema_arrow.empty_table().select(self.columns).to_pandas()
+        table = self.file.read_row_groups(self.row_groups, columns=self.columns)
+        return table.to_pandas()
+
+    def iter_chunks(self, chunk_rows):
+        """Itera los row groups seleccionados en chunks de `chunk_rows` filas."""
+        if not self.row_groups:
+            return
+        for batch in self.file.iter_batches(
+                batch_size=chunk_rows, row_groups=self.row_groups,
+                columns=self.columns):
+            yield batch.to_pandas()
+
+
+def _promote_type(current, new):
+    """Tipo Arrow que admite los valores de ambos: entero, float o, si no, texto."""
+    pa, _ = _import_parquet()
+    if current.equals(new) or pa.types.is_null(new):
+        return current
+    if pa.types.is_null(current):
+        return new
+    both = (current, new)
+    if all(pa.types.is_integer(t) for t in both):
+        return pa.int64()
+    if all(pa.types.is_integer(t) or pa.types.is_floating(t) for t in both):
+        return pa.float64()
+    return pa.large_string()
+
+
+class ParquetSink:
+    """
+    Escritor incremental de Parquet: cada chunk se agrega como row group.
+
+    El esquema sale del primer chunk; si uno posterior no entra, se promueve
+    (ver `_promote_type`) y el archivo se reescribe row group a row group.
+    `rewrites` cuenta cuántas veces pasó.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.rewrites = 0
+        self._writer = None
+        self._schema = None
+
+    def write(self, df: pd.DataFrame):
+        """Agrega un chunk al archivo."""
+        pa, pq = _import_parquet()
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if self._writer is None:
+            self._schema = table.schema
+            self._writer = pq.ParquetWriter(self.path, self._schema)
+        elif not table.schema.equals(self._schema):
+            if table.schema.names != self._schema.names:
+                raise DSLValidationError(
+                    f"Las columnas del chunk {table.schema.names} no coinciden con "
+                    f"las del Parquet {self._schema.names}")
+            schema = pa.schema([
+                field.with_type(_promote_type(field.type, other.type))
+                for field, other in zip(self._schema, table.schema)])
+            if not schema.equals(self._schema):
+                self._rewrite(schema.remove_metadata())
+            table = table.cast(self._schema)
+        self._writer.write_table(table)
+
+    def _rewrite(self, schema):
+        """Reescribe lo ya escrito con `schema`, un row group por vez."""
+        _, pq = _import_parquet()
+        self._writer.close()
+        previous = self.path + ".tmp"
+        os.replace(self.path, previous)
+        self._schema = schema
+        self._writer = pq.ParquetWriter(self.path, schema)
+        with pq.ParquetFile(previous) as source:
+            for index in range(source.num_row_groups):
+                self._writer.write_table(source.read_row_group(index).cast(schema))
+        os.remove(previous)
+        self.rewrites += 1
+
+    def close(self):
+        """Cierra el archivo (si no se escribió nada, deja un Parquet vacío)."""
+        if self._writer is None:
+            self.write(pd.DataFrame())
+        self._writer.close()
@@ -3,14 +3,24 @@
 Módulo para parsear y validar archivos DSL de ORION.
 """
 import yaml
+from pandas.tseries.frequencies import to_offset
+from pandas.tseries.offsets import BusinessHour, CustomBusinessHour
 from dsl.dsl_spec import (
     ALLOWED_SOURCES,
     ALLOWED_OUTPUTS,
     ALLOWED_OPERATIONS,
     TYPE_CASTS,
+    FILTER_OPERATORS,
+    AGGREGATE_FUNCTIONS,
+    ROLLING_FUNCTIONS,
+    EXECUTION_MODES,
 )
 
 
+# Alias de frecuencia que pandas ya no acepta, con su reemplazo
+_LEGACY_RULES = {"M": "ME", "Q": "QE", "Y": "YE", "A": "YE"}
+
+
 class DSLValidationError(Exception):
     """Excepción personalizada para errores de validación del DSL."""
 
@@ -53,10 +63,84 @@ def validate_steps(steps: list):
                 raise DSLValidationError(
                     f"Tipo invalido para convert_type: {to_type}")
 
+        if op_name == "filter":
+            operator = step[op_name].get("op", "==")
+            if operator not in FILTER_OPERATORS:
+                raise DSLValidationError(
+                    f"Operador inválido para filter: {operator}")
+
+        if op_name in ("aggregate", "resample"):
+            validate_metrics(step[op_name]["metrics"])
+
+        if op_name == "rolling":
+            validate_rolling(step[op_name])
+
+        if op_name == "resample":
+            validate_resample(step[op_name])
+
+
+def validate_metrics(metrics: dict):
+    """Valida las métricas de aggregate/resample (una función o una lista por columna)."""
+    for column, funcs in metrics.items():
+        for func in [funcs] if isinstance(funcs, str) else funcs:
+            if func not in AGGREGATE_FUNCTIONS:
+                raise DSLValidationError(
+                    f"Función de agregación inválida para {column}: {func}")
+
+
+def validate_resample(params: dict):
+    """
+    Valida la frecuencia de un step resample: fija ("90min", "6h") o de
+    calendario de un día o más ("D", "2W", "ME", "MS", "QS", "YE").
+    """
+    rule = params["rule"]
+    try:
+        offset = to_offset(rule)
+    except ValueError as e:
+        hint = f" (usar {_LEGACY_RULES[rule]})" if rule in _LEGACY_RULES else ""
+        raise DSLValidationError(f"Frecuencia inválida para resample: {rule}{hint}") from e
+    if offset.n <= 0:
+        raise DSLValidationError(f"La frecuencia de resample debe ser positiva: {rule}")
+    if isinstance(offset, (BusinessHour, CustomBusinessHour)):
+        raise DSLValidationError(
+            f"Frecuencia no soportada para resample: {rule} (usar una fija como '2h' "
+            "o una de calendario de un día o más)")
+
+
+def validate_rolling(params: dict):
+    """Valida los parámetros de un step rolling."""
+    window = params["window"]
+    if not isinstance(window, int) or window < 1:
+        raise DSLValidationError("rolling.window debe ser un entero positivo")
+
+    func = params.get("func", "mean")
+    if func not in ROLLING_FUNCTIONS:
+        raise DSLValidationError(f"Función inválida para rolling: {func}")
+
+    min_periods = params.get("min_periods")
+    if min_periods is not None and not 0 < min_periods <= window:
+        raise DSLValidationError("rolling.min_periods debe estar entre 1 y window")
+
+
+def validate_execution(execution: dict):
+    """Valida la sección opcional 'execution' del DSL."""
+    mode = execution.get("mode", "batch")
+    if mode not in EXECUTION_MODES:
+        raise DSLValidationError(f"execution.mode inválido: {mode}")
+
+    memory_limit = execution.get("memory_limit_mb")
+    if memory_limit is not None and memory_limit <= 0:
+        raise DSLValidationError("execution.memory_limit_mb debe ser positivo")
+
+    workers = execution.get("workers")
+    if workers is not None and (not isinstance(workers, int) or workers < 1):
+        raise DSLValidationError("execution.workers debe ser un entero positivo")
+
 
 def validate_dsl(dsl: dict):
     """Valida la estructura completa del DSL."""
     validate_source(dsl["source"])
     validate_steps(dsl["steps"])
     validate_output(dsl["output"])
+    validate_execution(dsl.get("execution") or {})
     return True
@@ -13,6 +13,29 @@ ALLOWED_OPERATIONS = {
     "rename_column",
     "select_columns",
     "aggregate",
+    "rolling",
+    "resample",
 }
 
+# Operaciones que trabajan fila a fila y pueden aplicarse chunk por chunk
+ROW_WISE_OPERATIONS = {
+    "drop_na",
+    "convert_type",
+    "filter",
+    "rename_column",
+    "select_columns",
+}
+
+# Operaciones fila a fila con ventana: en streaming arrastran las últimas filas
+# de cada chunk al siguiente para dar el mismo resultado que en memoria
+WINDOW_OPERATIONS = {"rolling"}
+
 TYPE_CASTS = {"int", "float", "str", "bool"}
+
+FILTER_OPERATORS = {"==", "!=", ">", ">=", "<", "<="}
+
+AGGREGATE_FUNCTIONS = {"sum", "count", "mean", "min", "max"}
+
+ROLLING_FUNCTIONS = {"sum", "count", "mean", "min", "max", "std"}
+
+EXECUTION_MODES = {"batch", "streaming"}
@@ -0,0 +1,258 @@
+"""
+Sort externo de CSVs más grandes que la memoria.
+
+Dos fases, con la memoria acotada por `run_rows` y no por el archivo:
+
+1. Runs: el CSV se lee de a `run_rows` filas; cada parte se ordena con pandas
+   y se escribe a un archivo de spill (spill.py). Con `workers > 1` cada run
+   lo genera un proceso distinto leyendo su rango de bytes del CSV (los
+   offsets de filas salen de csv_scan.row_offsets).
+2. Merge k-way: se mantiene en memoria un batch de cabeza de cada run y un
+   heap con la última fila de cada batch (una cota: lo que sigue del run en
+   disco no puede ir antes). En cada ronda la menor cota del heap define el
+   corte: de cada run se toman, con una búsqueda binaria, las filas que van
+   antes que ella; sólo esas se ordenan juntas y se emiten, y los runs que se
+   vaciaron se rellenan con su siguiente batch. Es un merge de heap, pero por
+   batches: un heap fila a fila en Python costaría microsegundos por fila.
+
+El orden es estable (a igual clave se respeta el orden del archivo) y los
+nulos van al final, como en `DataFrame.sort_values`.
+"""
+import functools
+import heapq
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_numeric_dtype
+import datasets
+from csv_scan import row_offsets
+from spill import SpillFile, spill_dir
+
+DEFAULT_RUN_ROWS = 1_000_000
+
+# Filas por batch de cada run durante el merge (y por chunk de salida)
+DEFAULT_MERGE_ROWS = 50_000
+
+# Columna auxiliar del merge: run de origen de cada fila
+_RUN = "__orion_run__"
+
+
+def _sort(df: pd.DataFrame, by: list, ascending: bool) -> pd.DataFrame:
+    return df.sort_values(by, ascending=ascending, kind="stable", na_position="last")
+
+
+def _spill_run(df: pd.DataFrame, by: list, ascending: bool, path: str, batch_rows: int) -> tuple:
+    """
+    Ordena `df` y lo escribe como run en batches de `batch_rows` filas.
+
+    Returns:
+        tuple: (ruta del run, columnas de orden con tipo numérico en este run)
+    """
+    df = _sort(df, by, ascending)
+    run = SpillFile(path)
+    for start in range(0, len(df), batch_rows):
+        run.write(df.iloc[start:start + batch_rows])
+    run.close()
+    return path, frozenset(column for column in by if is_numeric_dtype(df[column]))
+
+
+def _run_path(tmp: str, index: int) -> str:
+    return os.path.join(tmp, f"run_{index:05d}.pkl")
+
+
+def _sort_range(job: tuple) -> tuple:
+    """Genera un run a partir de un rango de bytes del CSV (en un proceso aparte)."""
+    path, start, end, columns, by, ascending, run_path, batch_rows, dtype = job
+    with open(path, "rb") as f:
+        f.seek(start)
+        df = pd.read_csv(io.BytesIO(f.read(end - start)), header=None, names=columns,
+                         dtype=dtype)
+    return _spill_run(df, by, ascending, run_path, batch_rows)
+
+
+def _write_runs(path: str, by: list, ascending: bool, tmp: str, options: dict) -> list:
+    """Escribe los runs; devuelve (ruta, columnas numéricas) de cada uno."""
+    run_rows, batch_rows, dtype = options["run_rows"], options["batch_rows"], options["dtype"]
+    if options["workers"] > 1 and path.endswith(".csv") and datasets.loaded(path) is None:
+        offsets, _ = row_offsets(path, run_rows)
+        columns = list(datasets.read_head(path, 0).columns)
+        jobs = [(path, int(offsets[i]), int(offsets[i + 1]), columns, by, ascending,
+                 _run_path(tmp, i), batch_rows, dtype) for i in range(len(offsets) - 1)]
+        with ProcessPoolExecutor(max_workers=options["workers"]) as executor:
+            return list(executor.map(_sort_range, jobs))
+
+    runs = []
+    for chunk in datasets.iter_dataset(path, run_rows, dtype=dtype):
+        # Un dataset en memoria llega como un único chunk: partirlo igual en runs
+        for start in range(0, len(chunk), run_rows):
+            runs.append(_spill_run(chunk.iloc[start:start + run_rows], by, ascending,
+                                   _run_path(tmp, len(runs)), batch_rows))
+    return runs
+
+
+def make_runs(path: str, by: list, ascending: bool, tmp: str, *, run_rows=DEFAULT_RUN_ROWS,  # pylint: disable=too-many-arguments
+              workers=1, batch_rows=DEFAULT_MERGE_ROWS) -> list:
+    """
+    Fase 1: escribe los runs ordenados en `tmp`.
+
+    Un CSV leído por partes infiere los tipos de cada parte: una columna de
+    orden puede salir numérica en unos runs y texto en otros, y esos valores
+    no se pueden comparar en el merge. En ese caso los runs se vuelven a
+    generar leyendo esas columnas como texto, el tipo que les da pandas al
+    leer el archivo entero.
+
+    Returns:
+        list: Rutas de los runs, en el orden del archivo.
+    """
+    options = {"run_rows": run_rows, "workers": workers, "batch_rows": batch_rows,
+               "dtype": None}
+    runs = _write_runs(path, by, ascending, tmp, options)
+    mixed = [column for column in by
+             if 0 < sum(column in numeric for _, numeric in runs) < len(runs)]
+    if mixed:
+        for run_path, _ in runs:
+            os.remove(run_path)
+        options["dtype"] = dict.fromkeys(mixed, str)
+        runs = _write_runs(path, by, ascending, tmp, options)
+    return [run_path for run_path, _ in runs]
+
+
+def _compare(a: tuple, b: tuple, ascending: bool) -> int:
+    """Orden de dos claves de fila ((es_nulo, valor) por columna): -1, 0 o 1."""
+    for (a_null, a_value), (b_null, b_value) in zip(a, b):
+        if a_null or b_null:
+            if a_null != b_null:
+                # Nulos al final, en cualquier sentido
+                return 1 if a_null else -1
+        elif a_value != b_value:
+            return -1 if (a_value < b_value) == ascending else 1
+    return 0
+
+
+class _RunHead:
+    """Batch en memoria de un run y la posición de su primera fila sin emitir."""
+
+    def __init__(self, index: int, reader, by: list):
+        self.index = index
+        self.reader = reader
+        self.by = by
+        self.generation = 0
+        self.batch = None
+        self.start = 0
+        self._columns = []
+
+    def advance(self) -> bool:
+        """Pasa al siguiente batch del run; False si no quedan."""
+        self.batch = next(self.reader, None)
+        self.generation += 1
+        self.start = 0
+        if self.batch is None:
+            return False
+        self._columns = [(self.batch[column].isna().to_numpy(), self.batch[column].to_numpy())
+                         for column in self.by]
+        return True
+
+    @property
+    def exhausted(self) -> bool:
+        """El batch en memoria ya se emitió entero."""
+        return self.start >= len(self.batch)
+
+    def key(self, row: int) -> tuple:
+        """Clave de orden de una fila del batch."""
+        return tuple((bool(nulls[row]), values[row]) for nulls, values in self._columns)
+
+    def take_until(self, bound: tuple, bound_run: int, ascending: bool) -> pd.DataFrame:
+        """
+        Saca del batch las filas que van antes de la cota `bound` del run
+        `bound_run`: claves menores o, a igual clave, de un run anterior (o el
+        mismo), para que el orden sea estable. Las filas del batch están
+        ordenadas, así que son un prefijo: se busca su fin por bisección.
+        """
+        low, high = self.start, len(self.batch)
+        while low < high:
+            middle = (low + high) // 2
+            order = _compare(self.key(middle), bound, ascending)
+            if order < 0 or (order == 0 and self.index <= bound_run):
+                low = middle + 1
+            else:
+                high = middle
+        taken = self.batch.iloc[self.start:low]
+        self.start = low
+        return taken
+
+
+def _merge_parts(parts: dict, by: list, ascending: bool) -> pd.DataFrame:
+    """Ordena juntas las filas tomadas de cada run en una ronda ({run: filas})."""
+    if len(parts) == 1:
+        (part,) = parts.values()
+        return part.reset_index(drop=True)
+    merged = pd.concat(parts.values(), ignore_index=True)
+    merged[_RUN] = np.repeat(list(parts), [len(part) for part in parts.values()])
+    # A igual clave, el run anterior primero: el orden final es estable
+    return merged.sort_values(
+        by + [_RUN], ascending=[ascending] * len(by) + [True], kind="stable",
+        na_position="last").drop(columns=[_RUN]).reset_index(drop=True)
+
+
+def merge_runs(runs: list, by: list, ascending: bool):
+    """
+    Fase 2: merge k-way de los runs; itera el resultado ordenado en chunks.
+
+    Todo run tiene sus filas ordenadas, así que la última fila del batch en
+    memoria de cada run es una cota de lo que le queda en disco. Todo lo que
+    va antes de la menor de esas cotas (inclusive) ya puede emitirse.
+    """
+    sort_key = functools.cmp_to_key(lambda a, b: _compare(a, b, ascending))
+    heads, heap = {}, []
+
+    def push(head):
+        # Las entradas de batches ya reemplazados quedan viejas (otra generación)
+        heapq.heappush(heap, (sort_key(head.key(len(head.batch) - 1)), head.index,
+                              head.generation))
+
+    for index, path in enumerate(runs):
+        head = _RunHead(index, SpillFile(path).read(), by)
+        if head.advance():
+            heads[index] = head
+            push(head)
+
+    while heap:
+        bound, bound_run, generation = heap[0]
+        if bound_run not in heads or heads[bound_run].generation != generation:
+            heapq.heappop(heap)
+            continue
+
+        parts = {index: head.take_until(bound.obj, bound_run, ascending)
+                 for index, head in heads.items()}
+        yield _merge_parts({index: part for index, part in parts.items() if len(part)},
+                           by, ascending)
+
+        # El run de la cota siempre se vacía: cada ronda avanza al menos un batch
+        for index in [index for index, head in heads.items() if head.exhausted]:
+            if heads[index].advance():
+                push(heads[index])
+            else:
+                del heads[index]
+
+
+def external_sort(path: str, by, ascending: bool = True, *, run_rows=DEFAULT_RUN_ROWS,  # pylint: disable=too-many-arguments
+                  workers=1, merge_rows=DEFAULT_MERGE_ROWS, spill_base=None):
+    """
+    Ordena un dataset por `by` con memoria acotada; itera el resultado en chunks.
+
+    Args:
+        path: Dataset de entrada (CSV o cualquier formato de datasets).
+        by: Columna o lista de columnas de orden.
+        ascending: Orden ascendente (para todas las columnas).
+        run_rows: Filas por run (memoria de la fase 1, por proceso).
+        workers: Procesos para generar los runs de un CSV.
+        merge_rows: Filas por batch de cada run durante el merge.
+        spill_base: Directorio base para los runs (por defecto .orion_cache/spill).
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    with spill_dir(spill_base) as tmp:
+        runs = make_runs(path, by, ascending, tmp, run_rows=run_rows, workers=workers,
+                         batch_rows=merge_rows)
+        yield from merge_runs(runs, by, ascending)
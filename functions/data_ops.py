@@ -3,35 +3,333 @@ Operaciones de datos para ORION (CSV, JSON, Análisis).
 """
 import json
 import os
-import pandas as pd
+import datasets
+import dedupe
+import external_sort
+import hash_join
+import sampling
+import sql_tables
+from dsl.dsl_engine import apply_steps
+from dsl.dsl_parser import validate_steps
 from registry import register_function
+from streaming_stats import analyze_chunks
+
+
+# Filas por chunk al convertir: acota la memoria a un chunk, no al archivo
+DEFAULT_CHUNK_ROWS = 50_000
+
+JSON_FORMATS = ("json", "ndjson")
+
+# CSVs más grandes que esto se analizan por chunks en lugar de cargarse enteros
+STREAMING_THRESHOLD_MB = 256
+
+DEFAULT_PREVIEW_ROWS = 10
+
+
+def _json_chunks_writer(output_format: str, compact: bool):
+    """
+    Writer para `datasets.save_chunks` que emite registros JSON por chunk.
+
+    En formato "json" escribe un único array abriendo `[` antes del primer
+    chunk y cerrándolo al final; en "ndjson", un registro por línea.
+    """
+    lines = output_format == "ndjson"
+    indent = None if compact or lines else 4
+
+    def write(chunks, f):
+        rows = 0
+        if not lines:
+            f.write("[")
+        for chunk in chunks:
+            if chunk.empty:
+                continue
+            text = chunk.to_json(orient="records", lines=lines, indent=indent,
+                                 date_format="iso", double_precision=15)
+            if lines:
+                f.write(text if text.endswith("\n") else text + "\n")
+            else:
+                # Sin los corchetes del array de este chunk
+                f.write(("," if rows else "") + text[1:-1].rstrip())
+            rows += len(chunk)
+        if not lines:
+            f.write("\n]\n" if indent and rows else "]\n")
+        return rows
+
+    return write
+
+
+def _write_csv(df, path):
+    df.to_csv(path, index=False)
+
+
+def _write_csv_chunks(chunks, f):
+    """Writer para `datasets.save_chunks`: un CSV con el encabezado del primer chunk."""
+    rows, first = 0, True
+    for chunk in chunks:
+        chunk.to_csv(f, header=first, index=False)
+        rows += len(chunk)
+        first = False
+    return rows
 
 
 @register_function(
     name="convert_csv_to_json",
-    description="Convierte un archivo CSV a formato JSON",
+    description="Convierte un archivo CSV a formato JSON (o NDJSON si la salida es .ndjson)",
     argument_types={
         "input_path": "str",
         "output_path": "str"
-    }
+    },
+    dataset_inputs=True,
+    dataset_output=True
 )
-def convert_csv_to_json(input_path, output_path):
-    """Convierte un archivo CSV a JSON."""
-    df = pd.read_csv(input_path)
-    data = df.to_dict(orient="records")
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4)
-    return f"{input_path} convertido a JSON en {output_path}"
+def convert_csv_to_json(input_path, output_path, output_format=None, compact=False,
+                        chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Convierte un archivo CSV a JSON leyendo y escribiendo por chunks.
+
+    Args:
+        input_path: CSV de entrada.
+        output_path: Archivo de salida.
+        output_format: "json" (array de registros) o "ndjson" (un registro por
+            línea). Por defecto se deduce de la extensión (.ndjson/.jsonl).
+        compact: Sin indentación ni saltos de línea dentro del array.
+        chunk_rows: Filas por chunk; la memoria queda acotada a un chunk.
+    """
+    if output_format is None:
+        output_format = "ndjson" if output_path.endswith(datasets.NDJSON_EXTENSIONS) else "json"
+    if output_format not in JSON_FORMATS:
+        raise ValueError(f"Formato inválido: {output_format} (usar {' o '.join(JSON_FORMATS)})")
+
+    chunks = datasets.iter_dataset(input_path, chunk_rows)
+    datasets.save_chunks(chunks, output_path, _json_chunks_writer(output_format, compact))
+    formato = "NDJSON" if output_format == "ndjson" else "JSON"
+    return f"{input_path} convertido a {formato} en {output_path}"
+
+
+@register_function(
+    name="transform_data",
+    description="Aplica pasos del DSL (filter, select_columns, ...) a un CSV",
+    argument_types={
+        "input_path": "str",
+        "steps": "list",
+        "output_path": "str"
+    },
+    dataset_inputs=True,
+    dataset_output=True
+)
+def transform_data(input_path, steps, output_path):
+    """Transforma un dataset con una lista de steps del DSL y lo guarda como CSV."""
+    validate_steps(steps)
+    df = apply_steps(datasets.load_dataset(input_path), steps)
+    written = datasets.save_dataset(df, output_path, _write_csv)
+    destino = output_path if written else f"{output_path} (en memoria)"
+    return f"{input_path} transformado ({len(df)} filas) en {destino}"
+
+
+@register_function(
+    name="query_data",
+    description=("Ejecuta una consulta SQL (SELECT) sobre uno o más CSV; cada archivo es "
+                 "una tabla con su nombre sin extensión (data/ventas.csv -> ventas)"),
+    argument_types={"input_path": "str", "query": "str"},
+    dataset_output=True
+)
+def query_data(input_path, query, output_path=None, cache=True):
+    """
+    Consulta CSVs con SQL a través de SQLite (ver sql_tables.py).
+
+    Args:
+        input_path: Ruta de un CSV, varias separadas por coma o una lista.
+        query: Consulta SELECT; cada archivo es una tabla con su nombre.
+        output_path: CSV donde guardar el resultado (opcional).
+        cache: Reutilizar las tablas de `.orion_cache/query.db` mientras los
+            archivos no cambien; con False se cargan en una base en memoria.
+    """
+    paths = input_path.split(",") if isinstance(input_path, str) else input_path
+    paths = [path.strip() for path in paths if path.strip()]
+    tables = sql_tables.query_tables if cache else sql_tables.SQLTables(sql_tables.MEMORY_DB)
+    df = tables.query(query, paths)
+
+    result = f"Consulta sobre {', '.join(sql_tables.table_names(paths))}: "
+    result += f"{len(df)} filas"
+    if output_path:
+        written = datasets.save_dataset(df, output_path, _write_csv)
+        result += f" en {output_path if written else f'{output_path} (en memoria)'}"
+    return f"{result}\n{df.head(DEFAULT_PREVIEW_ROWS).to_string(index=False)}"
+
+
+@register_function(
+    name="sort_csv",
+    description="Ordena un CSV por una o más columnas sin cargarlo entero en memoria",
+    argument_types={"input_path": "str", "column": "str", "output_path": "str"},
+    dataset_inputs=True,
+    dataset_output=True
+)
+def sort_csv(input_path, column, output_path, *, ascending=True,  # pylint: disable=too-many-arguments
+             run_rows=external_sort.DEFAULT_RUN_ROWS, workers=1):
+    """
+    Ordena un dataset con un sort externo (ver external_sort.py).
+
+    Args:
+        input_path: Dataset de entrada.
+        column: Columna de orden, o lista de columnas.
+        output_path: CSV de salida, escrito por chunks.
+        ascending: Orden ascendente.
+        run_rows: Filas por run ordenado en memoria (acota la memoria).
+        workers: Procesos para generar los runs en paralelo.
+    """
+    columns = [column] if isinstance(column, str) else list(column)
+    missing = [name for name in columns if name not in datasets.read_head(input_path, 0).columns]
+    if missing:
+        raise KeyError(f"Columnas inexistentes en {input_path}: {missing}")
+
+    chunks = external_sort.external_sort(input_path, columns, bool(ascending),
+                                         run_rows=int(run_rows), workers=int(workers))
+    written = datasets.save_chunks(chunks, output_path, _write_csv_chunks)
+    destino = output_path if written else f"{output_path} (en memoria)"
+    return f"{input_path} ordenado por {', '.join(columns)} en {destino}"
+
+
+@register_function(
+    name="join_csv",
+    description=("Une dos CSV por una columna clave (inner, left, right u outer) sin cargar "
+                 "el más grande en memoria"),
+    argument_types={"left_path": "str", "right_path": "str", "on": "str", "output_path": "str"},
+    dataset_inputs=True,
+    dataset_output=True
+)
+def join_csv(left_path, right_path, on, output_path, *, how="inner",  # pylint: disable=too-many-arguments
+             memory_mb=hash_join.DEFAULT_MEMORY_MB, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Join por hash de dos datasets (ver hash_join.py).
+
+    Args:
+        left_path: Dataset izquierdo.
+        right_path: Dataset derecho.
+        on: Columna clave, o lista de columnas, presente en los dos.
+        output_path: CSV de salida, escrito por chunks.
+        how: "inner", "left", "right" u "outer".
+        memory_mb: Memoria para el lado más chico; si no entra, se particiona a disco.
+        chunk_rows: Filas por chunk del lado más grande.
+    """
+    chunks = hash_join.hash_join(left_path, right_path, on, how, memory_mb=float(memory_mb),
+                                 chunk_rows=int(chunk_rows))
+    written = datasets.save_chunks(chunks, output_path, _write_csv_chunks)
+    destino = output_path if written else f"{output_path} (en memoria)"
+    keys = on if isinstance(on, str) else ", ".join(on)
+    return f"{left_path} y {right_path} unidos ({how} por {keys}) en {destino}"
+
+
+@register_function(
+    name="dedupe_csv",
+    description=("Quita las filas duplicadas de un CSV (o las repetidas en ciertas columnas) "
+                 "sin cargarlo entero; con approximate sólo estima la tasa de duplicados"),
+    argument_types={"input_path": "str"},
+    dataset_inputs=True,
+    dataset_output=True
+)
+def dedupe_csv(input_path, output_path=None, *, columns=None, approximate=False,  # pylint: disable=too-many-arguments
+               memory_mb=dedupe.DEFAULT_MEMORY_MB, error_rate=dedupe.DEFAULT_ERROR_RATE):
+    """
+    Deduplica un dataset en una pasada por chunks (ver dedupe.py).
+
+    Args:
+        input_path: Dataset de entrada.
+        output_path: CSV de salida con la primera aparición de cada fila.
+        columns: Columna o lista de columnas que definen un duplicado (por
+            defecto, la fila entera).
+        approximate: Sólo estimar la tasa de duplicados con un filtro de
+            Bloom, sin escribir salida.
+        memory_mb: Presupuesto para los hashes; si no entran, se particiona a disco.
+        error_rate: Falsos positivos del filtro de Bloom.
+    """
+    deduplicator = dedupe.Deduplicator(columns, memory_mb=float(memory_mb))
+    if approximate:
+        estimate = deduplicator.estimate(input_path, float(error_rate))
+        return (f"{input_path}: ~{estimate['duplicados']} filas duplicadas de "
+                f"{estimate['filas']} (~{estimate['tasa']:.1%}, estimado con un filtro de "
+                f"Bloom de {estimate['mb_filtro']:.1f} MB)")
+    if not output_path:
+        raise ValueError("dedupe_csv necesita output_path (o approximate=True para estimar)")
+
+    written = datasets.save_chunks(deduplicator.run(input_path), output_path, _write_csv_chunks)
+    destino = output_path if written else f"{output_path} (en memoria)"
+    rate = deduplicator.duplicates / deduplicator.rows if deduplicator.rows else 0.0
+    return (f"{input_path}: {deduplicator.duplicates} filas duplicadas de {deduplicator.rows} "
+            f"({rate:.1%}); {deduplicator.rows - deduplicator.duplicates} filas en {destino}"
+            + (" (particionado a disco)" if deduplicator.partitioned else ""))
+
+
+@register_function(
+    name="count_rows",
+    description="Cuenta las filas de un CSV sin cargarlo",
+    argument_types={"input_path": "str"},
+    dataset_inputs=True,
+    pure=True
+)
+def count_rows(input_path):
+    """Cuenta las filas de un dataset recorriendo sus saltos de línea."""
+    return f"{input_path} tiene {datasets.count_rows(input_path)} filas"
+
+
+@register_function(
+    name="preview_data",
+    description="Muestra las primeras filas de un CSV",
+    argument_types={"input_path": "str"},
+    dataset_inputs=True,
+    pure=True
+)
+def preview_data(input_path, rows=DEFAULT_PREVIEW_ROWS):
+    """Muestra las primeras `rows` filas de un dataset leyendo sólo esas filas."""
+    df = datasets.read_head(input_path, int(rows))
+    return f"Primeras {len(df)} filas de {input_path}:\n{df.to_string(index=False)}"
+
+
+def _frame_analysis(df) -> dict:
+    """Análisis automático de un DataFrame completo."""
+    return {
+        "total_filas": len(df),
+        "total_columnas": len(df.columns),
+        "columnas": list(df.columns),
+        "tipos_datos": df.dtypes.to_dict(),
+        "estadisticas": df.describe().to_dict(),
+        "valores_faltantes": df.isnull().sum().to_dict()
+    }
+
+
+def _sample_analysis(drawn) -> dict:
+    """Análisis sobre una muestra: totales estimados y cotas de error de las medias."""
+    df = drawn.df
+    analysis = _frame_analysis(df)
+    analysis["total_filas"] = drawn.total_rows
+    scale = drawn.total_rows / len(df) if len(df) else 0
+    analysis["valores_faltantes"] = {
+        column: round(missing * scale) for column, missing in df.isnull().sum().items()}
+    analysis["muestra"] = dict(drawn.report(), error_media={
+        column: drawn.mean_error(df[column])
+        for column in df.select_dtypes(include="number").columns})
+    return analysis
 
 
 @register_function(
     name="analyze_data",
     description="Analiza un CSV y genera estadísticas básicas",
-    argument_types={"input_path": "str", "output_path": "str"}
+    argument_types={"input_path": "str", "output_path": "str"},
+    dataset_inputs=True,
+    pure=True
 )
-def analyze_data(input_path, output_path):
-    """Analiza un dataset CSV y guarda estadísticas."""
+def analyze_data(input_path, output_path, streaming=None, chunk_rows=DEFAULT_CHUNK_ROWS, *,  # pylint: disable=too-many-arguments
+                 counts_only=False, sample=None, sample_method="auto"):
+    """
+    Analiza un dataset CSV y guarda estadísticas.
+
+    Con `streaming` (por defecto, automático para CSVs de más de
+    STREAMING_THRESHOLD_MB) el análisis se hace en una pasada por chunks con
+    memoria acotada; los percentiles pasan a ser aproximados. Con
+    `counts_only` sólo se guardan filas y columnas, sin parsear el archivo.
+    Con `sample` (filas, o `true` para el tamaño por defecto) las estadísticas
+    salen de una muestra (ver sampling.py) y el reporte incluye su tamaño y el
+    error al 95% de cada media.
+    """
     # Corregir rutas mal formadas
     if input_path.startswith('./'):
         input_path = input_path[2:]
@@ -46,23 +344,36 @@ def analyze_data(input_path, output_path):
     # Asegurar que el directorio output existe
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
-    df = pd.read_csv(input_path)
+    if streaming is None and not (counts_only or sample):
+        streaming = (input_path.endswith(".csv") and not datasets.in_memory(input_path)
+                     and os.path.getsize(input_path) > STREAMING_THRESHOLD_MB * 1024 * 1024)
 
-    # Análisis automático
-    analysis = {
-        "total_filas": len(df),
-        "total_columnas": len(df.columns),
-        "columnas": list(df.columns),
-        "tipos_datos": df.dtypes.to_dict(),
-        "estadisticas": df.describe().to_dict(),
-        "valores_faltantes": df.isnull().sum().to_dict()
-    }
+    drawn = None
+    if counts_only:
+        columns = list(datasets.read_head(input_path, 0).columns)
+        analysis = {
+            "total_filas": datasets.count_rows(input_path),
+            "total_columnas": len(columns),
+            "columnas": columns
+        }
+    elif sample:
+        drawn = sampling.sample_dataset(input_path, sample, sample_method)
+        analysis = _sample_analysis(drawn)
+    elif streaming:
+        analysis = analyze_chunks(datasets.iter_dataset(input_path, chunk_rows))
+    else:
+        analysis = _frame_analysis(datasets.load_dataset(input_path))
 
     # Guardar análisis
     with open(output_path, 'w', encoding='utf-8') as f:
         json.dump(analysis, f, indent=2, default=str)
 
+    memory = None if streaming or counts_only or sample else datasets.memory_saved(input_path)
     return (
         f"Análisis guardado en {output_path}. "
-        f"Dataset: {len(df)} filas x {len(df.columns)} columnas"
+        f"Dataset: {analysis['total_filas']} filas x {analysis['total_columnas']} columnas"
+        + (" (streaming)" if streaming else "")
+        + (f" ({drawn.describe()})" if drawn else "")
+        + (f". Memoria: {memory['bytes'] / 1e6:.1f} MB con tipos compactos "
+           f"(~{memory['bytes_default'] / 1e6:.1f} MB sin optimizar)" if memory else "")
     )
@@ -0,0 +1,240 @@
+"""
+Join por hash entre dos datasets sin cargar el más grande.
+
+El lado más chico (build) se carga en memoria y sus claves se indexan una sola
+vez (`pandas.Index`, cuyo motor es una tabla hash); el más grande (probe) se
+lee por chunks y cada chunk se resuelve contra ese índice, emitiendo su parte
+del resultado enseguida. Las filas del build que nunca encontraron pareja se
+emiten al final si el tipo de join las conserva.
+
+Si el build no entra en el presupuesto de memoria se usa grace hashing: las
+dos entradas se reparten por hash de la clave en particiones de spill
+(spill.py) y cada par de particiones se une igual que arriba. En ese caso el
+orden de salida sigue las particiones, no el archivo.
+
+Las columnas de salida son las de `pd.merge(left, right, on=on, how=how)`:
+las de la izquierda, después las de la derecha sin las claves, con sufijos
+`_x`/`_y` para los nombres repetidos.
+"""
+import math
+import os
+import numpy as np
+import pandas as pd
+import datasets
+from spill import SpillFile, spill_dir
+
+DEFAULT_MEMORY_MB = 512
+DEFAULT_CHUNK_ROWS = 100_000
+
+JOIN_TYPES = ("inner", "left", "right", "outer")
+
+# Particiones por cada "presupuesto" de build: margen para claves desparejas
+PARTITION_SLACK = 2
+
+NULL_HASH = np.uint64(2**64 - 1)
+
+
+def _key_index(df: pd.DataFrame, on: list) -> pd.Index:
+    if len(on) == 1:
+        return pd.Index(df[on[0]])
+    return pd.MultiIndex.from_frame(df[on])
+
+
+def combine(left: pd.DataFrame, right: pd.DataFrame, on: list) -> pd.DataFrame:
+    """Une lado a lado filas ya emparejadas, con las columnas de `pd.merge`."""
+    right = right.drop(columns=on)
+    overlap = set(left.columns).intersection(right.columns)
+    left = left.rename(columns={column: f"{column}_x" for column in overlap})
+    right = right.rename(columns={column: f"{column}_y" for column in overlap})
+    return pd.concat([left.reset_index(drop=True), right.reset_index(drop=True)], axis=1)
+
+
+class HashTable:
+    """
+    Lado build de un join: sus filas y un índice hash de sus claves.
+
+    Args:
+        df: Filas del lado build.
+        on: Columnas clave.
+    """
+
+    def __init__(self, df: pd.DataFrame, on: list):
+        self.df = df.reset_index(drop=True)
+        self.on = on
+        self.index = _key_index(self.df, on)
+        # Un índice vacío cuenta como único (el motor no-único falla sin filas)
+        self.unique = self.index.is_unique
+        # Cuántas filas del build tiene cada clave, para alinear los matches
+        self.counts = None if self.unique else self.index.value_counts()
+        self.matched = np.zeros(len(self.df), dtype=bool)
+
+    def probe(self, chunk: pd.DataFrame, keep_unmatched: bool):
+        """
+        Empareja un chunk del lado probe contra el build.
+
+        Returns:
+            tuple: (filas del chunk, filas del build alineadas; las del build
+                son NaN donde el chunk no tuvo pareja)
+        """
+        keys = _key_index(chunk, self.on)
+        if self.unique:
+            # Caso común (tabla de dimensión): a lo sumo una fila por clave
+            build_positions = self.index.get_indexer(keys)
+            probe_positions = np.arange(len(chunk))
+        else:
+            build_positions, _ = self.index.get_indexer_non_unique(keys)
+            # get_indexer_non_unique da max(1, matches) posiciones por fila del chunk, en orden
+            matches = self.counts.reindex(keys).fillna(0).to_numpy(dtype=np.int64)
+            probe_positions = np.repeat(np.arange(len(chunk)), np.maximum(matches, 1))
+        if not keep_unmatched:
+            found = build_positions >= 0
+            probe_positions, build_positions = probe_positions[found], build_positions[found]
+        self.matched[build_positions[build_positions >= 0]] = True
+        # reindex (no take): la posición -1 no existe y queda como fila de NaN
+        return chunk.iloc[probe_positions], self.df.reindex(build_positions)
+
+    def unmatched(self) -> pd.DataFrame:
+        """Filas del build que no encontraron pareja en ningún chunk."""
+        return self.df[~self.matched]
+
+
+def _column_hashes(values: pd.Series) -> np.ndarray:
+    if pd.api.types.is_float_dtype(values):
+        floats = values.to_numpy(dtype="float64", na_value=np.nan)
+        # Un float entero se hashea como int: 5.0 == 5 aunque un chunk tenga nulos y otro no
+        integral = np.isfinite(floats) & (floats == np.trunc(floats)) & (np.abs(floats) < 2**63)
+        as_int = pd.util.hash_array(np.where(integral, floats, 0).astype("int64"))
+        hashes = np.where(integral, as_int, pd.util.hash_array(floats))
+    else:
+        hashes = pd.util.hash_pandas_object(values, index=False).to_numpy()
+    # Los nulos igual en cualquier tipo (una columna toda vacía se lee como float)
+    return np.where(values.isna().to_numpy(), NULL_HASH, hashes)
+
+
+def key_hashes(df: pd.DataFrame, columns: list) -> np.ndarray:
+    """
+    Hash uint64 por fila de `columns`, estable entre chunks de un mismo archivo
+    y entre archivos: no depende de si una columna se leyó como int o float, ni
+    de si un texto llegó como str, object o category.
+    """
+    hashes = [_column_hashes(df[column]) for column in columns]
+    if len(hashes) == 1:
+        return hashes[0]
+    return pd.util.hash_pandas_object(pd.DataFrame(dict(enumerate(hashes))), index=False).to_numpy()
+
+
+def _partition(chunks, on: list, parts: int, prefix: str) -> list:
+    """Reparte los chunks por hash de la clave en `parts` archivos de spill."""
+    files = [SpillFile(f"{prefix}_{index:04d}.pkl") for index in range(parts)]
+    for chunk in chunks:
+        buckets = key_hashes(chunk, on) % parts
+        for bucket, part in chunk.groupby(buckets, sort=False):
+            files[bucket].write(part)
+    for spill in files:
+        spill.close()
+    return files
+
+
+def footprint(path: str) -> int:
+    """Bytes estimados de un dataset en memoria (su tamaño en disco si no está cargado)."""
+    df = datasets.loaded(path)
+    if df is not None:
+        return int(df.memory_usage(index=False, deep=True).sum())
+    return os.path.getsize(path)
+
+
+class _Join:  # pylint: disable=too-few-public-methods
+    """Un join build/probe ya decidido: qué lado es cuál y qué filas sin pareja se conservan."""
+
+    def __init__(self, on: list, how: str, probe_is_left: bool, columns: dict):
+        self.on = on
+        self.probe_is_left = probe_is_left
+        self.columns = columns  # {"probe": [...], "build": [...]}
+        self.keep_probe = how in ("outer", "left" if probe_is_left else "right")
+        self.keep_build = how in ("outer", "right" if probe_is_left else "left")
+        self.rows = 0
+
+    def _output(self, probe_rows, build_rows, keys_from_probe: bool):
+        # Las claves salen del lado que seguro tiene la fila
+        source = probe_rows if keys_from_probe else build_rows
+        probe_rows = probe_rows.reset_index(drop=True).assign(
+            **{column: source[column].to_numpy() for column in self.on})
+        build_rows = build_rows.reset_index(drop=True).assign(
+            **{column: source[column].to_numpy() for column in self.on})
+        self.rows += len(probe_rows)
+        if self.probe_is_left:
+            return combine(probe_rows, build_rows, self.on)
+        return combine(build_rows, probe_rows, self.on)
+
+    def empty(self) -> pd.DataFrame:
+        """Resultado sin filas, para que la salida tenga igual sus columnas."""
+        return self._output(pd.DataFrame(columns=self.columns["probe"]),
+                            pd.DataFrame(columns=self.columns["build"]), keys_from_probe=True)
+
+    def run(self, table: HashTable, probe_chunks):
+        """Itera el resultado: un chunk por chunk del probe y al final los del build sin pareja."""
+        for chunk in probe_chunks:
+            probe_rows, build_rows = table.probe(chunk, self.keep_probe)
+            if len(probe_rows):
+                yield self._output(probe_rows, build_rows, keys_from_probe=True)
+        if self.keep_build:
+            build_rows = table.unmatched()
+            if len(build_rows):
+                empty = pd.DataFrame(np.nan, index=range(len(build_rows)),
+                                     columns=self.columns["probe"])
+                yield self._output(empty, build_rows, keys_from_probe=False)
+
+
+def _join_chunks(join: _Join, probe_path: str, build_path: str, *, budget: int,  # pylint: disable=too-many-arguments
+                 chunk_rows: int, spill_base):
+    if footprint(build_path) <= budget:
+        table = HashTable(datasets.load_dataset(build_path), join.on)
+        yield from join.run(table, datasets.iter_dataset(probe_path, chunk_rows))
+    else:
+        parts = PARTITION_SLACK * math.ceil(footprint(build_path) / budget)
+        with spill_dir(spill_base) as tmp:
+            build_parts = _partition(datasets.iter_dataset(build_path, chunk_rows), join.on,
+                                     parts, os.path.join(tmp, "build"))
+            probe_parts = _partition(datasets.iter_dataset(probe_path, chunk_rows), join.on,
+                                     parts, os.path.join(tmp, "probe"))
+            for build_part, probe_part in zip(build_parts, probe_parts):
+                batches = list(build_part.read())
+                build = (pd.concat(batches, ignore_index=True) if batches
+                         else pd.DataFrame(columns=join.columns["build"]))
+                yield from join.run(HashTable(build, join.on), probe_part.read())
+    if not join.rows:
+        yield join.empty()
+
+
+def hash_join(left_path: str, right_path: str, on, how: str = "inner", *,  # pylint: disable=too-many-arguments
+              memory_mb=DEFAULT_MEMORY_MB, chunk_rows=DEFAULT_CHUNK_ROWS, spill_base=None):
+    """
+    Join de dos datasets; devuelve un iterador del resultado en chunks.
+
+    Los argumentos se validan al llamar, antes de leer ningún dato.
+
+    Args:
+        left_path, right_path: Datasets a unir.
+        on: Columna clave o lista de columnas (con el mismo nombre en los dos).
+        how: "inner", "left", "right" u "outer".
+        memory_mb: Presupuesto para el lado build; si lo supera, grace hashing.
+        chunk_rows: Filas por chunk del lado probe.
+        spill_base: Directorio base de las particiones (por defecto .orion_cache/spill).
+    """
+    if how not in JOIN_TYPES:
+        raise ValueError(f"Tipo de join inválido: {how} (usar {', '.join(JOIN_TYPES)})")
+    on = [on] if isinstance(on, str) else list(on)
+
+    probe_is_left = footprint(left_path) >= footprint(right_path)
+    probe_path, build_path = (left_path, right_path) if probe_is_left else (right_path, left_path)
+    columns = {side: list(datasets.read_head(path, 0).columns)
+               for side, path in (("probe", probe_path), ("build", build_path))}
+    for path in (left_path, right_path):
+        names = columns["probe" if path == probe_path else "build"]
+        missing = [column for column in on if column not in names]
+        if missing:
+            raise KeyError(f"Columnas clave inexistentes en {path}: {missing}")
+
+    join = _Join(on, how, probe_is_left, columns)
+    return _join_chunks(join, probe_path, build_path, budget=int(memory_mb * 1024 * 1024),
+                        chunk_rows=chunk_rows, spill_base=spill_base)
@@ -0,0 +1,133 @@
+"""
+Valores atípicos de todas las columnas numéricas a la vez.
+
+Los límites se calculan para todas las columnas juntas sobre una matriz
+NumPy (`nanquantile`/`nanmean`/`nanstd` con `axis=0`), con dos métodos:
+
+- "iqr": [Q1 - f·IQR, Q3 + f·IQR], f = 1.5 por defecto (el de detect_outliers).
+- "zscore": [media - t·desvío, media + t·desvío], t = 3 por defecto.
+
+Para archivos que no entran en memoria, `streaming_bounds` saca los mismos
+límites en una pasada por chunks con `RunningStats` y `QuantileSketch` de
+streaming_stats (cuartiles aproximados, media y desvío exactos), y
+`find_outliers` cuenta los atípicos en una segunda pasada. El resultado es un
+resumen por columna con los límites, la cantidad de atípicos y los primeros
+ejemplos (posición de fila y valor).
+"""
+import warnings
+import numpy as np
+import pandas as pd
+from streaming_stats import DEFAULT_SKETCH_K, QuantileSketch, RunningStats
+
+METHODS = ("iqr", "zscore")
+DEFAULT_THRESHOLDS = {"iqr": 1.5, "zscore": 3.0}
+MAX_EXAMPLES = 10
+
+
+def numeric_columns(df: pd.DataFrame) -> list:
+    """Columnas numéricas (sin booleanos), como las que resume describe()."""
+    return [column for column in df.columns
+            if pd.api.types.is_numeric_dtype(df[column])
+            and not pd.api.types.is_bool_dtype(df[column])]
+
+
+def _bounds(stats: dict, method: str, threshold) -> pd.DataFrame:
+    """Tabla de límites por columna a partir de sus estadísticas (arrays alineados)."""
+    if method not in METHODS:
+        raise ValueError(f"Método inválido: {method} (usar {' o '.join(METHODS)})")
+    threshold = DEFAULT_THRESHOLDS[method] if threshold is None else float(threshold)
+    bounds = pd.DataFrame(stats)
+    if method == "iqr":
+        spread = threshold * (bounds["q3"] - bounds["q1"])
+        bounds["limite_inferior"] = bounds["q1"] - spread
+        bounds["limite_superior"] = bounds["q3"] + spread
+    else:
+        bounds["limite_inferior"] = bounds["media"] - threshold * bounds["desvio"]
+        bounds["limite_superior"] = bounds["media"] + threshold * bounds["desvio"]
+    return bounds
+
+
+def frame_bounds(df: pd.DataFrame, method: str = "iqr", threshold=None) -> pd.DataFrame:
+    """Límites exactos de todas las columnas numéricas de un DataFrame en memoria."""
+    columns = numeric_columns(df)
+    values = df[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+    with warnings.catch_warnings():
+        # Una columna toda vacía da NaN (y un aviso de NumPy) en vez de fallar
+        warnings.simplefilter("ignore", RuntimeWarning)
+        q1, q3 = np.nanquantile(values, [0.25, 0.75], axis=0)
+        mean = np.nanmean(values, axis=0)
+        std = np.nanstd(values, axis=0, ddof=1)
+    return _bounds({"valores": (~np.isnan(values)).sum(axis=0), "q1": q1, "q3": q3,
+                    "media": mean, "desvio": std}, method, threshold).set_axis(columns)
+
+
+def streaming_bounds(chunks, method: str = "iqr", threshold=None,
+                     sketch_k: int = DEFAULT_SKETCH_K) -> pd.DataFrame:
+    """Límites en una pasada por chunks; los cuartiles son aproximados (sketch KLL)."""
+    summaries, mixed = {}, set()
+    for chunk in chunks:
+        numeric = numeric_columns(chunk)
+        # Una columna con texto en algún chunk no es numérica en el archivo
+        mixed.update(column for column in chunk.columns if column not in numeric)
+        for column in numeric:
+            if column not in summaries:
+                summaries[column] = (RunningStats(), QuantileSketch(sketch_k))
+            values = chunk[column].to_numpy(dtype=np.float64, na_value=np.nan)
+            for summary in summaries[column]:
+                summary.update(values)
+
+    summaries = {column: pair for column, pair in summaries.items() if column not in mixed}
+    columns = list(summaries)
+    quartiles = np.array([sketch.quantiles((0.25, 0.75)) for _, sketch in summaries.values()])
+    running = [stats for stats, _ in summaries.values()]
+    return _bounds({
+        "valores": [stats.count for stats in running],
+        "q1": quartiles[:, 0] if columns else [],
+        "q3": quartiles[:, 1] if columns else [],
+        "media": [stats.mean if stats.count else np.nan for stats in running],
+        "desvio": [stats.std for stats in running],
+    }, method, threshold).set_axis(columns)
+
+
+def _summary(bounds: pd.DataFrame, counts: np.ndarray, examples: dict) -> dict:
+    summary = {}
+    for position, (column, row) in enumerate(bounds.to_dict("index").items()):
+        valid = int(row["valores"])
+        summary[column] = {
+            **{key: float(value) for key, value in row.items() if key != "valores"},
+            "valores": valid,
+            "atipicos": int(counts[position]),
+            "porcentaje": float(counts[position] / valid) if valid else 0.0,
+            "ejemplos": examples[column],
+        }
+    return summary
+
+
+def find_outliers(chunks, bounds: pd.DataFrame, max_examples: int = MAX_EXAMPLES) -> dict:
+    """
+    Cuenta los atípicos de cada columna de `bounds` recorriendo los chunks.
+
+    Returns:
+        dict: {columna: {límites y estadísticas, "atipicos", "porcentaje",
+            "ejemplos": [{"fila", "valor"}]}}; "fila" es la posición en el
+            archivo (base 0).
+    """
+    columns = list(bounds.index)
+    low = bounds["limite_inferior"].to_numpy()
+    high = bounds["limite_superior"].to_numpy()
+    counts = np.zeros(len(columns), dtype=np.int64)
+    examples = {column: [] for column in columns}
+    offset = 0
+    for chunk in chunks:
+        values = chunk[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        # Una comparación por matriz: NaN nunca es atípico
+        mask = (values < low) | (values > high)
+        counts += mask.sum(axis=0)
+        for position in np.flatnonzero(mask.any(axis=0)):
+            found = examples[columns[position]]
+            rows = np.flatnonzero(mask[:, position])[:max_examples - len(found)]
+            found.extend({"fila": int(offset + row), "valor": float(values[row, position])}
+                         for row in rows)
+        offset += len(chunk)
+
+    return _summary(bounds, counts, examples)
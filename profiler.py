@@ -0,0 +1,160 @@
+"""
+Perfilado por paso de pipelines de ORION.
+
+Con el perfilado activo, cada paso registra tiempo de pared, tiempo de CPU,
+memoria pico (tracemalloc y RSS máximo del proceso), filas de entrada/salida y
+bytes leídos de disco/escritos. Al terminar se escribe un reporte JSON y un archivo en
+formato Chrome Trace que se puede abrir en chrome://tracing o Perfetto.
+"""
+import json
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+import datasets
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEFAULT_REPORT_PATH = os.path.join("output", "profile.json")
+
+
+def _cpu_seconds() -> float:
+    """CPU de usuario + sistema del proceso y de los hijos ya esperados (workers)."""
+    times = os.times()
+    return time.process_time() + times.children_user + times.children_system
+
+
+def _max_rss_mb():
+    """RSS máximo alcanzado por el proceso, o None si la plataforma no lo expone."""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reporta KB; macOS, bytes
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(rss / divisor, 2)
+
+
+def _files_size(paths) -> int:
+    return sum(os.path.getsize(path) for path in paths if os.path.isfile(path))
+
+
+def trace_path_for(report_path: str) -> str:
+    """Ruta del Chrome Trace que acompaña a un reporte (`x.json` -> `x.trace.json`)."""
+    root, _ = os.path.splitext(report_path)
+    return f"{root}.trace.json"
+
+
+class StepProfiler:
+    """
+    Acumula las métricas de cada paso de un pipeline.
+
+    Con `enabled=False` los pasos se ejecutan sin medir nada, así el runner
+    usa el mismo código con y sin perfilado.
+
+    Args:
+        name (str): Nombre del pipeline (aparece en el reporte).
+        enabled (bool): Si se miden los pasos.
+    """
+
+    def __init__(self, name: str, enabled=True):
+        self.name = name
+        self.enabled = enabled
+        self.records = []
+        self._origin = time.perf_counter()
+
+    @contextmanager
+    def step(self, name: str, outputs=()):
+        """
+        Mide el bloque como un paso.
+
+        `bytes_read` son los bytes que `datasets` leyó de disco: una lectura
+        desde la cache en memoria, la copia columnar o un intermedio en memoria
+        no cuenta. Entrega el dict del registro: quien ejecuta el paso puede
+        completar `rows_in`, `rows_out`, `bytes_read` o `bytes_written` si los
+        conoce mejor que los contadores de `datasets` y los tamaños de archivo.
+        """
+        record = {"step": name}
+        if not self.enabled:
+            yield record
+            return
+
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        io_before = dict(datasets.io_stats)
+        wall_start, cpu_start = time.perf_counter(), _cpu_seconds()
+
+        try:
+            yield record
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = _cpu_seconds() - cpu_start
+            _, peak = tracemalloc.get_traced_memory()
+            if started_tracing:
+                tracemalloc.stop()
+
+            record.setdefault("rows_in", datasets.io_stats["rows_read"] - io_before["rows_read"])
+            record.setdefault(
+                "rows_out", datasets.io_stats["rows_written"] - io_before["rows_written"])
+            record.setdefault(
+                "bytes_read", datasets.io_stats["bytes_read"] - io_before["bytes_read"])
+            record.setdefault("bytes_written", _files_size(outputs))
+            record.update({
+                "start_s": round(wall_start - self._origin, 6),
+                "wall_s": round(wall, 6),
+                "cpu_s": round(cpu, 6),
+                "peak_mb": round(peak / (1024 * 1024), 3),
+                "max_rss_mb": _max_rss_mb(),
+            })
+            self.records.append(record)
+
+    def report(self) -> dict:
+        """Reporte JSON: totales del pipeline y el detalle de cada paso."""
+        return {
+            "pipeline": self.name,
+            "total_wall_s": round(sum(r["wall_s"] for r in self.records), 6),
+            "total_cpu_s": round(sum(r["cpu_s"] for r in self.records), 6),
+            "steps": self.records,
+        }
+
+    def chrome_trace(self) -> dict:
+        """Eventos en formato Chrome Trace (un evento completo por paso)."""
+        pid = os.getpid()
+        events = []
+        for record in self.records:
+            start_us = record["start_s"] * 1e6
+            events.append({
+                "name": record["step"], "cat": "step", "ph": "X",
+                "ts": start_us, "dur": record["wall_s"] * 1e6,
+                "pid": pid, "tid": 0,
+                "args": {k: v for k, v in record.items()
+                         if k not in ("step", "start_s", "wall_s")},
+            })
+            events.append({
+                "name": "memoria", "ph": "C", "ts": start_us, "pid": pid,
+                "args": {"peak_mb": record["peak_mb"]},
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms",
+                "otherData": {"pipeline": self.name}}
+
+    def write(self, report_path=DEFAULT_REPORT_PATH):
+        """
+        Escribe el reporte JSON y el Chrome Trace.
+
+        Returns:
+            tuple: (ruta del reporte, ruta del trace)
+        """
+        trace_path = trace_path_for(report_path)
+        dirname = os.path.dirname(report_path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+        with open(report_path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2)
+        with open(trace_path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f)
+        return report_path, trace_path
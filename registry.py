@@ -6,13 +6,31 @@ Registro automático de funciones para ORION
 _function_registry = {}
 
 
-def register_function(name, description, argument_types):
-    """Decorador para registrar funciones"""
+def register_function(name, description, argument_types,  # pylint: disable=too-many-arguments,too-many-positional-arguments
+                      dataset_inputs=False, dataset_output=False, pure=False, outputs=None):
+    """
+    Decorador para registrar funciones.
+
+    `dataset_inputs`/`dataset_output` indican que la función lee sus entradas /
+    escribe su salida a través del módulo `datasets`, lo que permite al runner
+    pasarle los datos en memoria entre pasos de un pipeline.
+
+    `pure` declara que el resultado depende solo de los argumentos y del
+    contenido de los archivos de entrada: el dispatcher lo cachea (ver
+    `result_cache`) y lo reutiliza mientras esos archivos no cambien.
+    Guarda junto al resultado los archivos que escribe la llamada: por defecto
+    `output`/`output_path`; `outputs` (argumentos -> lista de rutas) los
+    declara si la función escribe otros.
+    """
     def decorator(func):
         _function_registry[name] = {
             'function': func,
             'description': description,
-            'argument_types': argument_types
+            'argument_types': argument_types,
+            'dataset_inputs': dataset_inputs,
+            'dataset_output': dataset_output,
+            'pure': pure,
+            'outputs': outputs
         }
         return func
     return decorator
@@ -83,6 +101,12 @@ Usuario: "listá archivos en esa carpeta"
 (Si [LAST_FOLDER = 'data/logs'])
 Tú: {"CALL": "list_files", "ARGS": {"path": "data/logs"}}
 
+Usuario: "¿cuántas filas tiene data/ventas.csv?"
+Tú: {"CALL": "count_rows", "ARGS": {"input_path": "data/ventas.csv"}}
+
+Usuario: "¿cuánto vendió cada región en data/ventas.csv?"
+Tú: {"CALL": "query_data", "ARGS": {"input_path": "data/ventas.csv", "query": "SELECT region, SUM(cantidad * precio) AS total FROM ventas GROUP BY region"}}
+
 Usuario: "mi color favorito es rojo"
 Tú: {"CALL": "set_preference", "ARGS": {"key": "favorite_color", "value": "rojo"}}
 
@@ -0,0 +1,169 @@
+"""
+Cache de resultados de funciones puras para ORION.
+
+Una función registrada con `pure=True` declara que su resultado depende solo de sus
+argumentos y del contenido de sus archivos de entrada. El dispatcher guarda entonces el
+resultado en SQLite bajo la clave (función, argumentos, huellas de las entradas), junto con
+sus archivos de salida: `output_path`, o los que la función declare con `outputs`.
+
+Una segunda llamada con las entradas sin cambios responde desde la cache en milisegundos.
+El tamaño total se acota desalojando las entradas menos usadas.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing
+from step_cache import step_io
+from utils import file_fingerprint
+
+DEFAULT_DB_PATH = os.path.join(".orion_cache", "results.db")
+DEFAULT_MAX_MB = 256
+
+
+class ResultCache:
+    """
+    Resultados de funciones puras persistidos en SQLite.
+
+    Args:
+        db_path (str): Archivo SQLite de la cache (se crea al primer uso).
+        max_mb (float): Tamaño máximo (resultados + salidas) antes de desalojar.
+    """
+
+    def __init__(self, db_path=DEFAULT_DB_PATH, max_mb=DEFAULT_MAX_MB):
+        self.db_path = db_path
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+
+    def _connect(self):
+        # Ruta relativa al cwd, como el resto de .orion_cache: crear en cada conexión
+        dirname = os.path.dirname(self.db_path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS results (
+                key TEXT PRIMARY KEY,
+                function TEXT,
+                result TEXT,
+                size INTEGER,
+                created REAL,
+                last_used REAL
+            )
+        ''')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS outputs (
+                key TEXT,
+                path TEXT,
+                fingerprint TEXT,
+                content BLOB,
+                PRIMARY KEY (key, path)
+            )
+        ''')
+        return conn
+
+    @staticmethod
+    def key(function_name: str, args: dict, inputs: list) -> str:
+        """Clave: hash de la función, los argumentos y las huellas de las entradas."""
+        payload = {
+            "function": function_name,
+            "args": args,
+            "inputs": [file_fingerprint(path) for path in inputs],
+        }
+        canonical = json.dumps(payload, sort_keys=True, default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def lookup(self, function_name: str, args: dict):
+        """
+        Resultado cacheado de la llamada, restaurando sus salidas si hace falta.
+
+        Returns:
+            El resultado guardado, o None si no hay hit.
+        """
+        inputs, _ = step_io(args)
+        key = self.key(function_name, args, inputs)
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT result FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            outputs = conn.execute(
+                "SELECT path, fingerprint, content FROM outputs WHERE key = ?", (key,))
+            for path, fingerprint, content in outputs.fetchall():
+                # Salida intacta desde la última vez: no hay nada que restaurar
+                if os.path.exists(path) and json.dumps(file_fingerprint(path)) == fingerprint:
+                    continue
+                dirname = os.path.dirname(path)
+                if dirname:
+                    os.makedirs(dirname, exist_ok=True)
+                with open(path, "wb") as f:
+                    f.write(content)
+                conn.execute("UPDATE outputs SET fingerprint = ? WHERE key = ? AND path = ?",
+                             (json.dumps(file_fingerprint(path)), key, path))
+
+            conn.execute("UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key))
+            conn.commit()
+        self.hits += 1
+        return json.loads(row[0])
+
+    def store(self, function_name: str, args: dict, result, outputs=None) -> bool:
+        """
+        Guarda el resultado de una llamada recién ejecutada y sus salidas
+        (`outputs`, o por defecto `output`/`output_path`). Si falta alguna
+        salida no se guarda nada: un hit no podría restaurarla.
+        """
+        inputs, default_outputs = step_io(args)
+        outputs = default_outputs if outputs is None else [os.path.normpath(path)
+                                                           for path in outputs]
+        if not all(os.path.isfile(path) for path in outputs):
+            return False
+
+        contents = {}
+        for path in outputs:
+            with open(path, "rb") as f:
+                contents[path] = f.read()
+        encoded = json.dumps(result, default=str)
+        size = len(encoded) + sum(len(content) for content in contents.values())
+        if size > self.max_bytes:
+            return False
+
+        key = self.key(function_name, args, inputs)
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute("DELETE FROM outputs WHERE key = ?", (key,))
+            conn.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                         (key, function_name, encoded, size, now, now))
+            conn.executemany(
+                "INSERT INTO outputs VALUES (?, ?, ?, ?)",
+                [(key, path, json.dumps(file_fingerprint(path)), content)
+                 for path, content in contents.items()])
+            conn.commit()
+            self._evict(conn)
+        return True
+
+    def _evict(self, conn) -> int:
+        """Desaloja entradas (LRU) hasta quedar bajo `max_bytes`."""
+        rows = conn.execute("SELECT key, size FROM results ORDER BY last_used").fetchall()
+        total = sum(size for _, size in rows)
+        evicted = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        if evicted:
+            conn.executemany("DELETE FROM results WHERE key = ?", evicted)
+            conn.executemany("DELETE FROM outputs WHERE key = ?", evicted)
+            conn.commit()
+        return len(evicted)
+
+    def clear(self):
+        """Borra todas las entradas."""
+        with closing(self._connect()) as conn:
+            conn.execute("DELETE FROM results")
+            conn.execute("DELETE FROM outputs")
+            conn.commit()
+        self.hits = self.misses = 0
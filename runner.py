@@ -1,33 +1,280 @@
 """
 Runner principal para ejecutar pipelines definidos en DSL.
 """
-import sys
-from dsl.dsl_parser import load_dsl
+import argparse
+import os
+import time
+import datasets
+from dsl.dsl_parser import DSLValidationError
+from dsl.dsl_compiled import load_compiled
+from dsl.dsl_engine import execute_dsl, expand_source_paths
+from dsl.dsl_incremental import run_incremental
+from dsl.dsl_optimizer import explain
 from dispatcher import dispatch
+from profiler import DEFAULT_REPORT_PATH, StepProfiler
+from registry import get_function
+from step_cache import OUTPUT_KEYS, StepCache, step_io
+from utils import file_fingerprint, normalize_path
 # Importar funciones para registro
 # pylint: disable=unused-import
 from functions import data_ops, file_ops
 
 
-def run_pipeline(path):
-    """Carga y ejecuta un pipeline desde un archivo YAML."""
+def build_step_cache(config=None):
+    """Crea la cache de pasos a partir de la sección `cache` del pipeline."""
+    config = config or {}
+    options = {"content_hash": config.get("hash", False)}
+    if "dir" in config:
+        options["cache_dir"] = config["dir"]
+    if "max_mb" in config:
+        options["max_mb"] = config["max_mb"]
+    return StepCache(**options)
+
+
+# Claves de un paso que interpreta el runner y no se pasan a la función
+RUNNER_KEYS = {"action", "materialize"}
+
+
+def _step_output(step):
+    for key in OUTPUT_KEYS:
+        if step.get(key):
+            return normalize_path(step[key])
+    return None
+
+
+def _step_references(step):
+    return {
+        normalize_path(value) for key, value in step.items()
+        if key not in RUNNER_KEYS and isinstance(value, str)
+    }
+
+
+def find_handoff_paths(steps, materialize_all=False):
+    """
+    Detecta salidas intermedias que pueden pasarse en memoria.
+
+    Una salida se mantiene en memoria si su productor la escribe a través de
+    `datasets`, la lee al menos un paso posterior, todos los pasos que la
+    referencian la leen a través de `datasets`, ningún otro paso la vuelve a
+    escribir y el paso no pidió `materialize: true`.
+    """
+    if materialize_all:
+        return set()
+
+    paths = set()
+    for i, step in enumerate(steps):
+        info = get_function(step["action"]) or {}
+        output = _step_output(step)
+        if not output or step.get("materialize") or not info.get("dataset_output"):
+            continue
+
+        later = steps[i + 1:]
+        consumers = [s for s in later if output in _step_references(s)]
+        if not consumers or any(_step_output(s) == output for s in later):
+            continue
+        if all((get_function(s["action"]) or {}).get("dataset_inputs") for s in consumers):
+            paths.add(output)
+    return paths
+
+
+def run_pipeline(path, streaming=None, memory_limit_mb=None, *,  # pylint: disable=too-many-arguments
+                 force=False, materialize=False, workers=None, profile=None):
+    """
+    Carga y ejecuta un pipeline desde un archivo YAML.
+
+    Soporta dos formatos: pipelines de acciones (`pipeline.steps` con `action`)
+    y pipelines DSL (`source`, `steps`, `output`), que se ejecutan con el motor
+    del DSL en modo batch o streaming.
+
+    Los pasos cuyas entradas y definición no cambiaron se restauran desde la
+    cache de pasos en lugar de ejecutarse; `force=True` la ignora.
+
+    Las salidas intermedias que solo consumen pasos posteriores se pasan en
+    memoria sin escribirse a disco, salvo `materialize: true` en el paso o
+    `materialize=True` para todo el pipeline.
+
+    El YAML parseado, validado y compilado se reutiliza desde la cache de
+    pipelines compilados mientras el archivo no cambie.
+
+    Con `profile` (ruta del reporte JSON) se miden tiempo, CPU, memoria, filas
+    y bytes de cada paso y se escribe además un Chrome Trace junto al reporte.
+    """
+    started = time.perf_counter()
     print(f"=== Ejecutando pipeline: {path} ===")
 
-    dsl = load_dsl(path)
-    pipeline = dsl["pipeline"]
+    dsl, plan = load_compiled(path)
+    name = dsl.get("name") or dsl.get("pipeline", {}).get("name") or path
+    profiler = StepProfiler(name, enabled=bool(profile))
+
+    if "source" in dsl:
+        run_dsl_pipeline(dsl, streaming, memory_limit_mb, force, workers, profiler,
+                         plan=plan, started=started)
+    else:
+        run_action_pipeline(dsl["pipeline"], force, materialize, profiler)
+
+    if profile:
+        report_path, trace_path = profiler.write(profile)
+        print(f"Perfil: {report_path} (trace: {trace_path})")
+
+
+def run_action_pipeline(pipeline, force=False, materialize=False, profiler=None):
+    """Ejecuta los pasos de un pipeline de acciones, con handoff en memoria."""
+    cache = build_step_cache(pipeline.get("cache"))
+    memory_paths = find_handoff_paths(pipeline["steps"], materialize)
+    profiler = profiler or StepProfiler(pipeline["name"], enabled=False)
 
     print(f"Pipeline: {pipeline['name']}")
+    if memory_paths:
+        print(f"Intermedios en memoria: {', '.join(sorted(memory_paths))}")
+
+    hits_before = datasets.dataset_cache.hits
+    datasets.memory_stats.clear()
+    with datasets.handoff(memory_paths):
+        for i, step in enumerate(pipeline["steps"]):
+            _, outputs = step_io({k: v for k, v in step.items() if k not in RUNNER_KEYS})
+            with profiler.step(f"{i + 1}. {step['action']}", outputs):
+                run_action_step(step, cache, memory_paths, force)
+
+    reused = datasets.dataset_cache.hits - hits_before
+    if reused:
+        print(f"\nDatasets reutilizados desde la cache en memoria: {reused}")
+    for path, memory in sorted(datasets.memory_stats.items()):
+        print(f"Memoria de {path}: {memory['bytes'] / 1e6:.1f} MB con tipos compactos "
+              f"(~{memory['bytes_default'] / 1e6:.1f} MB sin optimizar)")
+    print("\n=== Pipeline finalizado ===")
+
 
-    for step in pipeline["steps"]:
-        action = step["action"]
-        print(f"\n--- Ejecutando paso: {action} ---")
+def run_action_step(step, cache, memory_paths=frozenset(), force=False):
+    """Ejecuta un paso de acción, restaurándolo desde la cache si corresponde."""
+    action = step["action"]
+    print(f"\n--- Ejecutando paso: {action} ---")
 
-        args = {k: v for k, v in step.items() if k != "action"}
+    args = {k: v for k, v in step.items() if k not in RUNNER_KEYS}
+    inputs, outputs = step_io(args)
 
-        result = dispatch(action, args)
-        print("Resultado:", result)
+    # Un paso que toca intermedios en memoria no tiene huella en disco
+    cacheable = not _step_references(step) & memory_paths
+    cached = cache.lookup(step, inputs, outputs) if cacheable and not force else None
+    if cached:
+        print("Resultado (cache):", cached["result"])
+        return cached["result"]
+
+    result = dispatch(action, args, use_cache=not force)
+    print("Resultado:", result)
+
+    if cacheable and isinstance(result, str) and result.startswith("[OK]"):
+        cache.store(step, inputs, outputs, result)
+    return result
+
+
+def run_dsl_pipeline(dsl, streaming=None, memory_limit_mb=None, force=False,  # pylint: disable=too-many-arguments,too-many-positional-arguments
+                     workers=None, profiler=None, *, plan=None, started=None):
+    """Ejecuta un pipeline DSL e imprime las estadísticas de la ejecución."""
+    print(f"Pipeline DSL: {dsl.get('name', 'sin nombre')}")
+
+    cache = build_step_cache(dsl.get("cache"))
+    spec = {key: dsl.get(key) for key in ("source", "steps", "output")}
+    inputs, outputs = expand_source_paths(dsl["source"]), [dsl["output"]["path"]]
+
+    profiler = profiler or StepProfiler(dsl.get("name", "dsl"), enabled=False)
+
+    with profiler.step(dsl.get("name", "dsl"), outputs) as record:
+        cached = None if force else cache.lookup(spec, inputs, outputs)
+        if cached:
+            record["cached"] = True
+            print("Resultado (cache):", cached["result"])
+            print("\n=== Pipeline finalizado ===")
+            return cached["result"]
+
+        stats = execute_dsl(dsl, streaming=streaming, memory_limit_mb=memory_limit_mb,
+                            workers=workers, plan=plan, started=started)
+        record.update(rows_in=stats["rows_in"], rows_out=stats["rows_out"],
+                      mode=stats["mode"])
+        # El motor lee las fuentes sin pasar por datasets: enteras salvo en Parquet
+        record["bytes_read"] = (stats["scan"]["bytes_read"] if "scan" in stats
+                                else sum(os.path.getsize(path) for path in inputs))
+
+    print("Resultado:", stats)
+    cache.store(spec, inputs, outputs, stats)
 
     print("\n=== Pipeline finalizado ===")
+    return stats
+
+
+def _watched_files(path, dsl):
+    """Archivos cuyo cambio dispara una nueva ejecución en modo watch."""
+    if "source" in dsl:
+        try:
+            files = expand_source_paths(dsl["source"])
+        except DSLValidationError:
+            files = []
+    else:
+        steps = dsl["pipeline"]["steps"]
+        produced = {_step_output(step) for step in steps}
+        files = [
+            inp for step in steps
+            for inp in step_io({k: v for k, v in step.items() if k not in RUNNER_KEYS})[0]
+            if inp not in produced
+        ]
+    return [path] + sorted(set(files))
+
+
+def _watch_snapshot(path, dsl):
+    return [file_fingerprint(f) for f in _watched_files(path, dsl) if os.path.isfile(f)]
+
+
+def watch_pipeline(path, interval=1.0, iterations=None, **options):
+    """
+    Re-ejecuta el pipeline cada vez que cambian sus archivos de entrada.
+
+    Los pipelines DSL con fuente CSV se ejecutan de forma incremental: si un
+    archivo solo creció se procesa únicamente lo agregado (ver dsl_incremental).
+    El resto de los pipelines se re-ejecuta con la cache de pasos, que evita
+    repetir los pasos cuyas entradas no cambiaron.
+
+    Args:
+        path (str): Ruta al pipeline YAML.
+        interval (float): Segundos entre chequeos.
+        iterations (int): Cantidad de chequeos (None = hasta Ctrl+C).
+        **options: Opciones de run_pipeline para pipelines no incrementales.
+    """
+    print(f"=== Observando pipeline: {path} (Ctrl+C para salir) ===")
+    seen = None
+    count = 0
+    try:
+        while iterations is None or count < iterations:
+            if count:
+                time.sleep(interval)
+            count += 1
+
+            try:
+                dsl, plan = load_compiled(path)
+                snapshot = _watch_snapshot(path, dsl)
+                if snapshot == seen:
+                    continue
+                seen = snapshot
+
+                if "source" in dsl and dsl["source"]["type"] == "csv":
+                    print(f"\n--- Cambios detectados: {dsl.get('name', path)} ---")
+                    print("Resultado:", run_incremental(dsl, plan=plan))
+                else:
+                    run_pipeline(path, **options)
+            except (DSLValidationError, OSError) as e:
+                print(f"[ERROR] {e}")
+    except KeyboardInterrupt:
+        print("\n=== Watch detenido ===")
+
+
+def explain_pipeline(path):
+    """Imprime el plan optimizado de un pipeline DSL sin ejecutarlo."""
+    _, plan = load_compiled(path)
+    if plan is None:
+        print("explain solo aplica a pipelines DSL (source/steps/output)")
+        return None
+
+    text = explain(plan)
+    print(text)
+    return text
 
 
 def execute_plan(plan, context_manager=None):
@@ -65,9 +312,51 @@ def execute_plan(plan, context_manager=None):
     return results
 
 
-if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Uso: python runner.py <ruta_pipeline_yaml>")
-        sys.exit(1)
+def parse_args(argv=None):
+    """Parsea los argumentos de línea de comandos del runner."""
+    parser = argparse.ArgumentParser(
+        description="Ejecuta pipelines YAML de ORION")
+    parser.add_argument("path", help="Ruta al pipeline YAML")
+    parser.add_argument(
+        "--streaming", action="store_true", default=None,
+        help="Procesa la fuente DSL en chunks de memoria acotada")
+    parser.add_argument(
+        "--memory-mb", type=float, default=None,
+        help="Límite de memoria (MB) para dimensionar los chunks en streaming")
+    parser.add_argument(
+        "--explain", action="store_true",
+        help="Muestra el plan optimizado del pipeline DSL sin ejecutarlo")
+    parser.add_argument(
+        "--force", action="store_true",
+        help="Ignora la cache de pasos y re-ejecuta todo")
+    parser.add_argument(
+        "--materialize", action="store_true",
+        help="Escribe a disco todas las salidas intermedias")
+    parser.add_argument(
+        "--workers", type=int, default=None,
+        help="Procesos para fuentes DSL multi-archivo (glob o directorio)")
+    parser.add_argument(
+        "--profile", nargs="?", const=DEFAULT_REPORT_PATH, default=None, metavar="REPORTE",
+        help="Perfila cada paso y escribe un reporte JSON y un Chrome Trace "
+             f"(por defecto {DEFAULT_REPORT_PATH})")
+    parser.add_argument(
+        "--watch", action="store_true",
+        help="Re-ejecuta el pipeline (incremental para fuentes CSV) cuando cambian sus entradas")
+    parser.add_argument(
+        "--interval", type=float, default=1.0,
+        help="Segundos entre chequeos en modo --watch")
+    return parser.parse_args(argv)
+
 
-    run_pipeline(sys.argv[1])
+if __name__ == "__main__":
+    cli_args = parse_args()
+    if cli_args.explain:
+        explain_pipeline(cli_args.path)
+    elif cli_args.watch:
+        watch_pipeline(cli_args.path, cli_args.interval, streaming=cli_args.streaming,
+                       memory_limit_mb=cli_args.memory_mb, materialize=cli_args.materialize,
+                       workers=cli_args.workers)
+    else:
+        run_pipeline(cli_args.path, cli_args.streaming, cli_args.memory_mb,
+                     force=cli_args.force, materialize=cli_args.materialize,
+                     workers=cli_args.workers, profile=cli_args.profile)
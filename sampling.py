@@ -0,0 +1,240 @@
+"""
+Muestreo para análisis interactivo sobre datasets grandes.
+
+Para preguntas exploratorias no hace falta recorrer 50M de filas: alcanza una
+muestra aleatoria y una cota del error. Hay dos formas de obtenerla:
+
+- "blocks": con un índice de offsets en bytes de cada bloque de filas del CSV
+  (`.orion_cache/offsets/`, se construye una vez con un recorrido mmap y se
+  reutiliza mientras el archivo no cambie) se leen sólo algunos bloques al
+  azar. Es lo más rápido: lee una fracción mínima del archivo.
+- "reservoir": una pasada por chunks manteniendo las `size` filas con menor
+  clave aleatoria (equivale a un reservoir sampling uniforme), con memoria
+  acotada a la muestra más un chunk.
+
+Si el dataset ya está en memoria se muestrea directamente. Las cotas de error
+son intervalos al 95%; en el muestreo por bloques se calculan entre bloques
+(muestreo por conglomerados), porque filas vecinas suelen parecerse.
+"""
+import hashlib
+import io
+import json
+import math
+import os
+import numpy as np
+import pandas as pd
+import datasets
+from csv_scan import row_offsets
+from utils import file_fingerprint
+
+DEFAULT_SAMPLE_ROWS = 100_000
+DEFAULT_BLOCK_ROWS = 2_000
+DEFAULT_CHUNK_ROWS = 100_000
+DEFAULT_OFFSETS_DIR = os.path.join(".orion_cache", "offsets")
+
+SAMPLE_METHODS = ("auto", "blocks", "reservoir")
+
+# Cuantil de la normal para intervalos al 95%
+Z_95 = 1.96
+
+
+class RowIndex:  # pylint: disable=too-few-public-methods
+    """
+    Offsets en bytes de cada bloque de `block_rows` filas de un CSV.
+
+    Args:
+        cache_dir (str): Directorio donde se guardan los índices.
+        block_rows (int): Filas por bloque.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_OFFSETS_DIR, block_rows=DEFAULT_BLOCK_ROWS):
+        self.cache_dir = cache_dir
+        self.block_rows = block_rows
+
+    def _index_path(self, path: str) -> str:
+        key = hashlib.sha256(os.path.abspath(path).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, path: str) -> dict:
+        """Índice vigente del archivo: {"offsets", "rows", "block_rows", ...}."""
+        index_path = self._index_path(path)
+        fingerprint = file_fingerprint(path)
+        if os.path.exists(index_path):
+            with open(index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            if index["fingerprint"] == fingerprint and index["block_rows"] == self.block_rows:
+                return index
+
+        offsets, rows = row_offsets(path, self.block_rows)
+        index = {"fingerprint": fingerprint, "block_rows": self.block_rows,
+                 "rows": rows, "offsets": offsets.tolist()}
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f)
+        os.replace(tmp_path, index_path)
+        return index
+
+
+row_index = RowIndex()
+
+
+class Sample:
+    """
+    Muestra de un dataset con lo necesario para acotar el error.
+
+    Args:
+        df: Filas muestreadas (el índice es el número de fila en el dataset).
+        total_rows: Filas del dataset completo.
+        method: "blocks", "reservoir" o "memoria".
+        blocks: Bloque de cada fila muestreada (sólo en "blocks").
+        total_blocks: Bloques del dataset completo (sólo en "blocks").
+    """
+
+    def __init__(self, df, total_rows, method, blocks=None, total_blocks=None):
+        self.df = df
+        self.total_rows = total_rows
+        self.method = method
+        self.blocks = blocks
+        self.total_blocks = total_blocks
+
+    @property
+    def size(self) -> int:
+        """Filas de la muestra."""
+        return len(self.df)
+
+    def mean_error(self, values: pd.Series) -> float:
+        """Semiancho del intervalo al 95% para la media de `values` (NaN se ignoran)."""
+        if self.blocks is not None:
+            # Entre bloques: la varianza de las medias de bloque ya refleja la correlación
+            means = values.groupby(self.blocks).mean().dropna()
+            n, population = len(means), self.total_blocks
+            spread = means.std(ddof=1)
+        else:
+            present = values.dropna()
+            n, population = len(present), self.total_rows
+            spread = present.std(ddof=1)
+        if n < 2:
+            return math.nan
+        # Corrección por población finita: sin error si la muestra es todo
+        fpc = math.sqrt(max(1 - n / population, 0))
+        return float(Z_95 * spread / math.sqrt(n) * fpc)
+
+    def proportion(self, mask: pd.Series):
+        """Proporción estimada de filas que cumplen `mask` y su error al 95%."""
+        indicator = mask.astype(float)
+        return float(indicator.mean()), self.mean_error(indicator)
+
+    def quantile_bounds(self, values: pd.Series, q: float):
+        """
+        Intervalo al 95% (sin suponer distribución) para el cuantil `q`.
+
+        Es el rango entre los cuantiles de la muestra en q ± 1.96·√(q(1-q)/n).
+        """
+        present = values.dropna()
+        if present.empty:
+            return math.nan, math.nan
+        spread = Z_95 * math.sqrt(q * (1 - q) / len(present))
+        low, high = present.quantile([max(q - spread, 0), min(q + spread, 1)])
+        return float(low), float(high)
+
+    def report(self) -> dict:
+        """Resumen de la muestra para incluir en la salida."""
+        return {
+            "metodo": self.method,
+            "filas_muestra": self.size,
+            "total_filas": self.total_rows,
+            "fraccion": round(self.size / self.total_rows, 6) if self.total_rows else 1.0,
+            "confianza": 0.95,
+        }
+
+    def describe(self) -> str:
+        """Texto corto para los mensajes de las funciones."""
+        return f"muestra de {self.size:,} de {self.total_rows:,} filas ({self.method})"
+
+
+def reservoir_sample(chunks, size: int, seed: int = 0):
+    """
+    Muestra uniforme de `size` filas en una sola pasada por `chunks`.
+
+    Cada fila recibe una clave aleatoria y se conservan las `size` de menor
+    clave; las filas de un chunk que no mejoran la peor clave guardada se
+    descartan sin copiarlas.
+
+    Returns:
+        tuple: (DataFrame muestreado con el número de fila como índice, filas vistas)
+    """
+    rng = np.random.default_rng(seed)
+    kept, keys, total = None, np.empty(0), 0
+    for chunk in chunks:
+        chunk = chunk.set_axis(pd.RangeIndex(total, total + len(chunk)))
+        total += len(chunk)
+        chunk_keys = rng.random(len(chunk))
+        if len(keys) >= size:
+            better = chunk_keys < keys.max()
+            chunk, chunk_keys = chunk[better], chunk_keys[better]
+        kept = chunk if kept is None else pd.concat([kept, chunk])
+        keys = np.concatenate([keys, chunk_keys])
+        if len(keys) > size:
+            best = np.argpartition(keys, size - 1)[:size]
+            kept, keys = kept.iloc[best], keys[best]
+    if kept is None:
+        return pd.DataFrame(), 0
+    return kept.sort_index(), total
+
+
+def _read_block(f, offsets: list, block: int, block_rows: int, columns: list):
+    """Lee el bloque `block` del CSV; el índice es el número de fila."""
+    f.seek(offsets[block])
+    frame = pd.read_csv(io.BytesIO(f.read(offsets[block + 1] - offsets[block])),
+                        header=None, names=columns)
+    first = block * block_rows
+    return frame.set_axis(pd.RangeIndex(first, first + len(frame)))
+
+
+def block_sample(path: str, size: int, seed: int = 0, index: RowIndex = None) -> Sample:
+    """Lee al azar los bloques de filas necesarios para ~`size` filas de un CSV."""
+    index = (index or row_index).get(path)
+    total_blocks = len(index["offsets"]) - 1
+    wanted = min(math.ceil(size / index["block_rows"]), total_blocks)
+    chosen = np.sort(np.random.default_rng(seed).choice(total_blocks, wanted, replace=False))
+
+    columns = list(datasets.read_head(path, 0).columns)
+    with open(path, "rb") as f:
+        frames = [_read_block(f, index["offsets"], int(block), index["block_rows"], columns)
+                  for block in chosen]
+    if not frames:
+        return Sample(pd.DataFrame(columns=columns), index["rows"], "blocks")
+
+    df = pd.concat(frames)
+    blocks = pd.Series(np.repeat(chosen, [len(frame) for frame in frames]), index=df.index)
+    return Sample(df, index["rows"], "blocks", blocks, total_blocks)
+
+
+def sample_dataset(path: str, size=DEFAULT_SAMPLE_ROWS, method: str = "auto",
+                   seed: int = 0) -> Sample:
+    """
+    Muestra aleatoria de un dataset.
+
+    Args:
+        path: Ruta del dataset.
+        size: Filas de la muestra (`True` usa DEFAULT_SAMPLE_ROWS).
+        method: "auto" (en memoria si ya está cargado, bloques para CSV y
+            reservoir para el resto), "blocks" o "reservoir".
+        seed: Semilla; la misma semilla da la misma muestra.
+    """
+    if method not in SAMPLE_METHODS:
+        raise ValueError(
+            f"Método de muestreo inválido: {method} (usar {', '.join(SAMPLE_METHODS)})")
+    size = DEFAULT_SAMPLE_ROWS if size is True else int(size)
+
+    loaded = datasets.loaded(path)
+    if method == "auto" and loaded is not None:
+        df = loaded.sample(min(size, len(loaded)), random_state=seed).sort_index()
+        return Sample(df, len(loaded), "memoria")
+    if method == "blocks" or (method == "auto" and path.endswith(".csv")):
+        if not path.endswith(".csv"):
+            raise ValueError(f"El muestreo por bloques necesita un CSV: {path}")
+        return block_sample(path, size, seed)
+    df, total = reservoir_sample(datasets.iter_dataset(path, DEFAULT_CHUNK_ROWS), size, seed)
+    return Sample(df, total, "reservoir")
@@ -0,0 +1,142 @@
+"""
+Tipos compactos para los CSV que carga ORION.
+
+`pd.read_csv` usa int64/float64/object por defecto. Para los CSV grandes se
+infiere sobre una muestra qué columnas de texto tienen pocos valores distintos
+y se leen directamente como `category` (`dtype=` en read_csv); el esquema
+inferido se guarda por archivo en `.orion_cache/schemas/` y se reutiliza
+mientras el archivo no cambie. Las columnas numéricas se achican después de
+leerlas, viendo todos los valores: enteros al tipo más chico que los contiene y
+flotantes a float32 solo si no pierden precisión. (Pasar `int8` a read_csv
+desbordaría en silencio si un valor fuera de la muestra no entra.)
+"""
+import hashlib
+import json
+import os
+import numpy as np
+import pandas as pd
+from utils import file_fingerprint
+
+DEFAULT_SCHEMA_DIR = os.path.join(".orion_cache", "schemas")
+DEFAULT_SAMPLE_ROWS = 50_000
+
+# Texto con menos de esta proporción de valores distintos pasa a `category`
+CATEGORY_MAX_RATIO = 0.5
+
+# CSVs más chicos se cargan con los tipos por defecto (no vale la pena inferir)
+DEFAULT_MIN_MB = 1
+
+
+def downcast_numeric(df: pd.DataFrame) -> pd.DataFrame:
+    """Achica las columnas numéricas sin cambiar ningún valor."""
+    changes = {}
+    for column in df.columns:
+        values = df[column]
+        if values.dtype == np.int64:
+            changes[column] = pd.to_numeric(values, downcast="integer")
+        elif values.dtype == np.float64:
+            narrow = values.to_numpy().astype(np.float32)
+            if np.array_equal(narrow.astype(np.float64), values.to_numpy(), equal_nan=True):
+                changes[column] = pd.Series(narrow, index=df.index, name=column)
+    return df.assign(**changes) if changes else df
+
+
+class SchemaCache:
+    """
+    Esquemas inferidos por archivo, invalidados por huella.
+
+    Cada esquema guarda los `dtype=` para read_csv y, después de la primera
+    carga completa, la memoria del DataFrame con y sin tipos compactos.
+
+    Args:
+        cache_dir (str): Directorio de la cache.
+        sample_rows (int): Filas de la muestra para inferir los tipos.
+        min_mb (float): CSVs más chicos que esto no se optimizan.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_SCHEMA_DIR, sample_rows=DEFAULT_SAMPLE_ROWS,
+                 min_mb=DEFAULT_MIN_MB):
+        self.cache_dir = cache_dir
+        self.sample_rows = sample_rows
+        self.min_bytes = int(min_mb * 1024 * 1024)
+
+    def _schema_path(self, path: str) -> str:
+        key = hashlib.sha256(os.path.abspath(path).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def eligible(self, path: str) -> bool:
+        """Si el archivo se carga con tipos compactos."""
+        return path.endswith(".csv") and os.path.getsize(path) >= self.min_bytes
+
+    def cached(self, path: str):
+        """Esquema guardado del archivo, o None si no hay o el archivo cambió."""
+        schema_path = self._schema_path(path)
+        if not os.path.exists(schema_path):
+            return None
+        with open(schema_path, "r", encoding="utf-8") as f:
+            schema = json.load(f)
+        return schema if schema["fingerprint"] == file_fingerprint(path) else None
+
+    def get(self, path: str) -> dict:
+        """Esquema vigente del archivo (lo infiere y guarda si no hay o cambió)."""
+        schema = self.cached(path)
+        if schema is None:
+            schema = self.infer(path)
+            schema["fingerprint"] = file_fingerprint(path)
+            self.save(path, schema)
+        return schema
+
+    def infer(self, path: str) -> dict:
+        """Infiere los `dtype=` de read_csv sobre las primeras filas del archivo."""
+        sample = pd.read_csv(path, nrows=self.sample_rows)
+        dtype, text_bytes = {}, {}
+        for column in sample.columns:
+            values = sample[column]
+            if pd.api.types.is_numeric_dtype(values) or pd.api.types.is_bool_dtype(values):
+                continue
+            present = values.dropna()
+            if len(present) and present.nunique() <= CATEGORY_MAX_RATIO * len(present):
+                dtype[column] = "category"
+                # Para estimar cuánto ocuparía como texto al cargar el archivo entero
+                text_bytes[column] = int(values.memory_usage(index=False, deep=True)) / len(sample)
+        return {"dtype": dtype, "text_bytes_per_row": text_bytes}
+
+    def save(self, path: str, schema: dict):
+        """Escribe el esquema de forma atómica."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        schema_path = self._schema_path(path)
+        tmp_path = schema_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(schema, f)
+        os.replace(tmp_path, schema_path)
+
+    def load(self, path: str):
+        """
+        Lee el CSV con tipos compactos y registra la memoria ahorrada en el esquema.
+
+        La primera carga achica los números después de leerlos y guarda los
+        tipos resultantes; como el esquema se invalida si el archivo cambia,
+        las cargas siguientes pasan todos los tipos a read_csv sin riesgo.
+
+        Returns:
+            tuple: (DataFrame, esquema actualizado)
+        """
+        schema = self.get(path)
+        if schema.get("verified"):
+            return pd.read_csv(path, dtype=schema["dtype"]), schema
+
+        df = pd.read_csv(path, dtype=schema["dtype"])
+        raw, read_dtypes = df.memory_usage(index=False, deep=True), df.dtypes
+        df = downcast_numeric(df)
+
+        compact = int(df.memory_usage(index=False, deep=True).sum())
+        # Sin optimizar: lo leído antes de achicar, y el texto al tamaño medido en la muestra
+        default = sum(
+            len(df) * schema["text_bytes_per_row"][column] if column in schema["dtype"]
+            else raw[column] for column in df.columns)
+        schema["memory"] = {"bytes": compact, "bytes_default": int(default)}
+        schema["dtype"] = {column: str(dtype) for column, dtype in df.dtypes.items()
+                           if column in schema["dtype"] or dtype != read_dtypes[column]}
+        schema["verified"] = True
+        self.save(path, schema)
+        return df, schema
@@ -0,0 +1,133 @@
+"""
+Copia columnar (sidecar) de los CSV leídos por ORION.
+
+Parsear CSV es lo más caro de cada función de datos. La primera vez que se lee
+un CSV se guarda una copia en Arrow/Feather sin comprimir bajo
+`.orion_cache/columnar/`; las lecturas siguientes del mismo archivo sin cambios
+la abren memory-mapped, que cuesta milisegundos en lugar de segundos.
+
+Cada entrada guarda la huella del CSV (tamaño y mtime): si el archivo cambió,
+la copia se descarta y se regenera. El tamaño total del directorio se acota
+desalojando las entradas menos usadas, igual que la cache de pasos.
+"""
+import hashlib
+import os
+import shutil
+import time
+from dir_cache import DirectoryCache
+from utils import file_fingerprint
+
+DEFAULT_CACHE_DIR = os.path.join(".orion_cache", "columnar")
+DEFAULT_MAX_MB = 4096
+
+# CSVs más chicos se parsean más rápido de lo que cuesta escribir la copia
+DEFAULT_MIN_MB = 1
+
+DATA_FILE = "data.feather"
+
+
+def _feather():
+    """pyarrow.feather, o None si pyarrow no está instalado (sidecar desactivado)."""
+    try:
+        # pylint: disable=import-outside-toplevel
+        import pyarrow.feather
+        return pyarrow.feather
+    except ImportError:
+        return None
+
+
+class SidecarCache(DirectoryCache):
+    """
+    Copias Feather de CSVs, invalidadas por huella y acotadas en tamaño.
+
+    Cada entrada es un directorio `<cache_dir>/<hash de la ruta>/` con
+    `data.feather` y un `meta.json` (ver DirectoryCache).
+
+    Args:
+        cache_dir (str): Directorio de la cache.
+        max_mb (float): Tamaño máximo del directorio antes de desalojar.
+        min_mb (float): CSVs más chicos que esto no generan copia.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_mb=DEFAULT_MAX_MB,
+                 min_mb=DEFAULT_MIN_MB):
+        super().__init__(cache_dir, max_mb)
+        self.min_bytes = int(min_mb * 1024 * 1024)
+
+    def _entry_dir(self, path: str) -> str:
+        key = hashlib.sha256(os.path.abspath(path).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, key)
+
+    def _eligible(self, path: str) -> bool:
+        return path.endswith(".csv") and os.path.getsize(path) >= self.min_bytes
+
+    def _lookup(self, path: str):
+        """Ruta de la copia válida de `path` (o None); borra copias desactualizadas."""
+        if _feather() is None or not self._eligible(path):
+            return None
+
+        entry_dir = self._entry_dir(path)
+        meta = self.read_meta(entry_dir)
+        if meta is None or meta["fingerprint"] != file_fingerprint(path):
+            if meta is not None:
+                shutil.rmtree(entry_dir, ignore_errors=True)
+            self.misses += 1
+            return None
+
+        self.touch(entry_dir)
+        self.hits += 1
+        return os.path.join(entry_dir, DATA_FILE)
+
+    def load(self, path: str):
+        """DataFrame desde la copia columnar de `path`, o None si no hay copia válida."""
+        data_path = self._lookup(path)
+        if data_path is None:
+            return None
+        return _feather().read_feather(data_path, memory_map=True)
+
+    def iter_batches(self, path: str):
+        """
+        Iterador de DataFrames (un record batch de la copia cada uno) o None.
+
+        Sirve para las lecturas por chunks: cada batch se lee del archivo
+        mapeado sin cargar el resto.
+        """
+        data_path = self._lookup(path)
+        if data_path is None:
+            return None
+
+        # pylint: disable=import-outside-toplevel
+        import pyarrow
+        import pyarrow.ipc
+
+        def batches():
+            with pyarrow.memory_map(data_path) as source:
+                reader = pyarrow.ipc.open_file(source)
+                for i in range(reader.num_record_batches):
+                    yield reader.get_batch(i).to_pandas()
+
+        return batches()
+
+    def store(self, path: str, df) -> bool:
+        """Escribe la copia columnar de un CSV recién parseado."""
+        feather = _feather()
+        if feather is None or not self._eligible(path):
+            return False
+
+        entry_dir = self._entry_dir(path)
+        os.makedirs(entry_dir, exist_ok=True)
+        tmp_path = os.path.join(entry_dir, DATA_FILE + ".tmp")
+        try:
+            feather.write_feather(df, tmp_path, compression="uncompressed")
+        except (ValueError, TypeError, NotImplementedError, OSError):
+            # Columnas que Arrow no sabe representar (ej: objetos mezclados)
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            return False
+        os.replace(tmp_path, os.path.join(entry_dir, DATA_FILE))
+
+        self.write_meta(entry_dir, {"source": os.path.abspath(path),
+                                    "fingerprint": file_fingerprint(path),
+                                    "created": time.time()})
+
+        self.evict()
+        return True
@@ -0,0 +1,63 @@
+"""
+Archivos temporales ("spill") para operaciones que no entran en memoria.
+
+El sort externo, el join y la deduplicación escriben DataFrames parciales a
+disco y los releen después por partes. Cada archivo de spill es una secuencia
+de batches serializados con pickle, así conservan sus tipos (a diferencia de un
+CSV) y se releen de a uno. Los directorios se crean dentro de
+`.orion_cache/spill/` y no en /tmp, que en muchos sistemas vive en memoria.
+"""
+import os
+import pickle
+import tempfile
+from contextlib import contextmanager
+
+DEFAULT_SPILL_DIR = os.path.join(".orion_cache", "spill")
+
+
+@contextmanager
+def spill_dir(base=None):
+    """Directorio temporal para spill que se borra al salir del bloque."""
+    base = base or DEFAULT_SPILL_DIR
+    os.makedirs(base, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=base) as tmp:
+        yield tmp
+
+
+class SpillFile:
+    """
+    Archivo de spill: se le agregan DataFrames y se releen en el mismo orden.
+
+    Args:
+        path (str): Ruta del archivo (se crea al primer `write`).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.rows = 0
+        self._file = None
+
+    def write(self, df):
+        """Agrega un batch al final del archivo."""
+        if self._file is None:
+            self._file = open(self.path, "ab")  # pylint: disable=consider-using-with
+        pickle.dump(df, self._file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.rows += len(df)
+
+    def close(self):
+        """Cierra el archivo para escritura (se puede seguir leyendo)."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def read(self):
+        """Itera los batches escritos, de a uno."""
+        self.close()
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            while True:
+                try:
+                    yield pickle.load(f)
+                except EOFError:
+                    return
@@ -0,0 +1,191 @@
+"""
+Consultas SQL sobre CSVs locales para ORION.
+
+Cada CSV se carga como una tabla SQLite con el nombre del archivo (sin
+extensión): `data/ventas.csv` se consulta como `ventas`. Dos archivos que dan
+el mismo nombre (`a/ventas.csv` y `b/ventas.csv`) no pueden ir en la misma
+consulta: una tabla taparía a la otra. La carga lee el
+archivo por chunks (datasets.iter_dataset) y los inserta con `executemany` en
+una sola transacción. Por defecto la base vive en `.orion_cache/query.db` y
+cada tabla guarda la huella de su archivo: mientras el CSV no cambie, las
+consultas siguientes la reutilizan sin volver a cargarla. Las columnas que
+la consulta usa para filtrar (WHERE) o unir (JOIN ... ON) se indexan la
+primera vez, así las consultas repetidas sobre archivos grandes no recorren
+la tabla entera.
+"""
+import json
+import os
+import re
+import sqlite3
+from contextlib import closing
+import pandas as pd
+import datasets
+from utils import file_fingerprint
+
+DEFAULT_DB_PATH = os.path.join(".orion_cache", "query.db")
+DEFAULT_CHUNK_ROWS = 50_000
+
+# Base en memoria: las tablas duran lo que dura la consulta
+MEMORY_DB = ":memory:"
+
+# Sólo consultas de lectura: la base también guarda las huellas de las tablas
+READ_ONLY_PREFIXES = ("select", "with")
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_FILTER_CLAUSE = re.compile(
+    r"\b(?:WHERE|ON)\b(.*?)(?=\bWHERE\b|\bGROUP\s+BY\b|\bORDER\s+BY\b|\bHAVING\b|\bLIMIT\b"
+    r"|\b(?:LEFT|RIGHT|INNER|OUTER|CROSS)?\s*JOIN\b|\bUNION\b|$)",
+    re.IGNORECASE | re.DOTALL)
+_IDENTIFIER = re.compile(r'"((?:[^"]|"")+)"|([A-Za-z_]\w*)')
+
+
+def table_name(path: str) -> str:
+    """Nombre de tabla de un archivo: su nombre sin extensión, como identificador SQL."""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    name = re.sub(r"\W", "_", stem)
+    return f"t_{name}" if name[:1].isdigit() else name
+
+
+def table_names(paths: list) -> list:
+    """
+    Nombres de tabla de `paths`, en orden.
+
+    Raises:
+        ValueError: Si dos archivos distintos dan el mismo nombre (SQLite no
+            distingue mayúsculas en los identificadores).
+    """
+    names, seen = [], {}
+    for path in paths:
+        name = table_name(path)
+        other = seen.setdefault(name.lower(), path)
+        if os.path.normpath(other) != os.path.normpath(path):
+            raise ValueError(f"'{other}' y '{path}' se consultarían con el mismo nombre de "
+                             f"tabla ({name}); renombrá uno de los archivos")
+        names.append(name)
+    return names
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _sqlite_type(values: pd.Series) -> str:
+    if pd.api.types.is_bool_dtype(values) or pd.api.types.is_integer_dtype(values):
+        return "INTEGER"
+    if pd.api.types.is_float_dtype(values):
+        return "REAL"
+    return "TEXT"
+
+
+def _records(chunk: pd.DataFrame):
+    """Filas del chunk como tuplas de valores de Python (SQLite guarda NaN como NULL)."""
+    columns = []
+    for column in chunk.columns:
+        values = chunk[column]
+        if pd.api.types.is_datetime64_any_dtype(values):
+            values = values.dt.strftime("%Y-%m-%d %H:%M:%S")
+        columns.append(values.tolist())
+    return zip(*columns)
+
+
+def filtered_columns(query: str) -> set:
+    """Identificadores que aparecen en las condiciones WHERE y JOIN ... ON de la consulta."""
+    query = _STRING_LITERAL.sub("''", query)
+    names = set()
+    for clause in _FILTER_CLAUSE.findall(query):
+        for quoted, plain in _IDENTIFIER.findall(clause):
+            names.add(quoted.replace('""', '"') if quoted else plain)
+    return names
+
+
+class SQLTables:
+    """
+    Tablas SQLite cargadas desde CSVs, reutilizadas mientras los archivos no cambien.
+
+    Args:
+        db_path (str): Archivo SQLite, o ":memory:" para cargar en cada consulta.
+        chunk_rows (int): Filas por chunk al cargar un CSV.
+    """
+
+    def __init__(self, db_path=DEFAULT_DB_PATH, chunk_rows=DEFAULT_CHUNK_ROWS):
+        self.db_path = db_path
+        self.chunk_rows = chunk_rows
+        self.loads = 0
+        self.reuses = 0
+
+    def _connect(self):
+        # Ruta relativa al cwd, como el resto de .orion_cache: crear en cada conexión
+        dirname = os.path.dirname(self.db_path) if self.db_path != MEMORY_DB else ""
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS _orion_tables (
+                name TEXT PRIMARY KEY,
+                path TEXT,
+                fingerprint TEXT,
+                columns TEXT
+            )
+        ''')
+        return conn
+
+    def _load(self, conn, path: str, name: str) -> list:
+        """(Re)carga el archivo en la tabla `name` y devuelve sus columnas."""
+        with conn:
+            conn.execute(f"DROP TABLE IF EXISTS {_quote(name)}")
+            columns = insert = None
+            for chunk in datasets.iter_dataset(path, self.chunk_rows):
+                if columns is None:
+                    columns = [str(column) for column in chunk.columns]
+                    definition = ", ".join(f"{_quote(column)} {_sqlite_type(chunk[column])}"
+                                           for column in columns)
+                    conn.execute(f"CREATE TABLE {_quote(name)} ({definition})")
+                    insert = (f"INSERT INTO {_quote(name)} "
+                              f"VALUES ({', '.join('?' * len(columns))})")
+                conn.executemany(insert, _records(chunk))
+            if columns is None:
+                # Archivo sin filas: la tabla igual existe, con las columnas del encabezado
+                columns = [str(column) for column in datasets.read_head(path, 0).columns]
+                conn.execute(f"CREATE TABLE {_quote(name)} "
+                             f"({', '.join(_quote(column) for column in columns)})")
+            conn.execute("INSERT OR REPLACE INTO _orion_tables VALUES (?, ?, ?, ?)",
+                         (name, path, json.dumps(file_fingerprint(path)), json.dumps(columns)))
+        self.loads += 1
+        return columns
+
+    def table(self, conn, path: str):
+        """
+        Tabla del archivo, cargándola sólo si no existe o el archivo cambió.
+
+        Returns:
+            tuple: (nombre de la tabla, columnas)
+        """
+        name = table_name(path)
+        row = conn.execute("SELECT path, fingerprint, columns FROM _orion_tables WHERE name = ?",
+                           (name,)).fetchone()
+        if row and row[0] == path and row[1] == json.dumps(file_fingerprint(path)):
+            self.reuses += 1
+            return name, json.loads(row[2])
+        return name, self._load(conn, path, name)
+
+    def query(self, query: str, paths: list) -> pd.DataFrame:
+        """Ejecuta una consulta de lectura sobre las tablas de `paths`."""
+        if not query.lstrip().lower().startswith(READ_ONLY_PREFIXES):
+            raise ValueError("Sólo se permiten consultas SELECT (o WITH ... SELECT)")
+
+        table_names(paths)
+        with closing(self._connect()) as conn:
+            filters = filtered_columns(query)
+            for path in paths:
+                name, columns = self.table(conn, path)
+                with conn:
+                    for column in filters.intersection(columns):
+                        conn.execute(
+                            f"CREATE INDEX IF NOT EXISTS {_quote(f'ix_{name}_{column}')} "
+                            f"ON {_quote(name)} ({_quote(column)})")
+            conn.execute("PRAGMA query_only = ON")
+            return pd.read_sql_query(query, conn)
+
+
+query_tables = SQLTables()
@@ -0,0 +1,123 @@
+"""
+Cache incremental de pasos de pipeline para ORION.
+
+Cada paso se identifica por una clave derivada de su especificación
+canonicalizada y de las huellas de sus archivos de entrada (tamaño, mtime y
+opcionalmente hash). Si la clave ya está en cache, el runner restaura las
+salidas guardadas en lugar de volver a ejecutar el paso (estilo make).
+El tamaño total del directorio se acota desalojando las entradas menos usadas.
+"""
+import hashlib
+import json
+import os
+import shutil
+import time
+from dir_cache import DirectoryCache
+from utils import file_fingerprint
+
+DEFAULT_CACHE_DIR = os.path.join(".orion_cache", "steps")
+DEFAULT_MAX_MB = 512
+
+# Argumentos de un paso que nombran archivos producidos por el paso
+OUTPUT_KEYS = ("output", "output_path")
+
+
+def step_io(args: dict):
+    """
+    Separa los argumentos de un paso en archivos de entrada y de salida.
+
+    Las salidas son los argumentos `output`/`output_path`; las entradas, el
+    resto de argumentos string que apuntan a archivos existentes.
+    """
+    outputs = [os.path.normpath(args[key]) for key in OUTPUT_KEYS if args.get(key)]
+    inputs = [
+        os.path.normpath(value) for key, value in sorted(args.items())
+        if key not in OUTPUT_KEYS and isinstance(value, str) and os.path.isfile(value)
+    ]
+    return inputs, outputs
+
+
+class StepCache(DirectoryCache):
+    """
+    Cache direccionada por contenido de las salidas de cada paso.
+
+    Cada entrada es un directorio `<cache_dir>/<clave>/` con copias de las
+    salidas y un `meta.json` (ver DirectoryCache).
+
+    Args:
+        cache_dir (str): Directorio de la cache.
+        max_mb (float): Tamaño máximo del directorio antes de desalojar.
+        content_hash (bool): Incluir el SHA-256 de las entradas en la clave.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_mb=DEFAULT_MAX_MB,
+                 content_hash=False):
+        super().__init__(cache_dir, max_mb)
+        self.content_hash = content_hash
+
+    def key(self, spec: dict, inputs: list) -> str:
+        """Clave del paso: hash de la spec canónica y las huellas de entrada."""
+        payload = {
+            "spec": spec,
+            "inputs": [file_fingerprint(path, self.content_hash) for path in inputs],
+        }
+        canonical = json.dumps(payload, sort_keys=True, default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def _entry_dir(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+
+    def lookup(self, spec: dict, inputs: list, outputs: list):
+        """
+        Busca el paso en la cache y, si está, restaura sus salidas.
+
+        Returns:
+            dict: Metadatos de la entrada (incluye `result`) o None si no hay hit.
+        """
+        if not outputs or not all(os.path.isfile(path) for path in inputs):
+            return None
+
+        entry_dir = self._entry_dir(self.key(spec, inputs))
+        meta = self.read_meta(entry_dir)
+        if meta is None:
+            self.misses += 1
+            return None
+
+        restored = False
+        for i, path in enumerate(meta["outputs"]):
+            # Salida intacta desde la última vez: no hay nada que hacer
+            if os.path.exists(path) and file_fingerprint(path) == meta["fingerprints"][i]:
+                continue
+            dirname = os.path.dirname(path)
+            if dirname:
+                os.makedirs(dirname, exist_ok=True)
+            shutil.copyfile(os.path.join(entry_dir, str(i)), path)
+            meta["fingerprints"][i] = file_fingerprint(path)
+            restored = True
+
+        if restored:
+            self.write_meta(entry_dir, meta)
+        else:
+            self.touch(entry_dir)
+        self.hits += 1
+        return meta
+
+    def store(self, spec: dict, inputs: list, outputs: list, result) -> bool:
+        """Guarda las salidas de un paso recién ejecutado."""
+        if not outputs or not all(os.path.isfile(path) for path in inputs + outputs):
+            return False
+
+        entry_dir = self._entry_dir(self.key(spec, inputs))
+        os.makedirs(entry_dir, exist_ok=True)
+        for i, path in enumerate(outputs):
+            shutil.copyfile(path, os.path.join(entry_dir, str(i)))
+
+        self.write_meta(entry_dir, {
+            "outputs": outputs,
+            "fingerprints": [file_fingerprint(path) for path in outputs],
+            "result": result,
+            "created": time.time(),
+        })
+
+        self.evict()
+        return True
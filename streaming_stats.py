@@ -0,0 +1,314 @@
+"""
+Estadísticas en una sola pasada para datasets más grandes que la RAM.
+
+`RunningStats` acumula count, media, desvío (Welford/Chan: cada chunk se
+resume con NumPy y se combina con el acumulado sin perder precisión), mínimo,
+máximo y nulos de una columna numérica. `QuantileSketch` es un sketch KLL:
+guarda alrededor de k valores por columna y responde cuantiles con un
+error de rango acotado (~0.2% con k=1024). Ambos son combinables (`merge`), así que
+sirven igual para chunks secuenciales que para particiones en paralelo.
+`CorrelationStats` hace lo mismo con los momentos cruzados de cada par de
+columnas, para la matriz de correlación.
+
+`analyze_chunks` arma con ellos el mismo análisis que `analyze_data` calcula
+con `describe()` sobre el DataFrame completo.
+"""
+import math
+import numpy as np
+import pandas as pd
+
+DEFAULT_SKETCH_K = 1024
+
+# Cuantiles que reporta describe()
+DESCRIBE_QUANTILES = (0.25, 0.5, 0.75)
+
+
+class RunningStats:
+    """Count, media, varianza, mínimo, máximo y nulos de una columna numérica."""
+
+    def __init__(self):
+        self.count = 0
+        self.nulls = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def update(self, values: np.ndarray):
+        """Incorpora un chunk de valores (NaN cuenta como nulo)."""
+        values = np.asarray(values, dtype=np.float64)
+        missing = np.isnan(values)
+        self.nulls += int(missing.sum())
+        values = values[~missing]
+        if len(values):
+            mean = float(values.mean())
+            self._combine(len(values), mean, float(np.square(values - mean).sum()),
+                          float(values.min()), float(values.max()))
+
+    def merge(self, other: "RunningStats"):
+        """Combina con otro acumulado (ej: de otra partición)."""
+        self.nulls += other.nulls
+        if other.count:
+            self._combine(other.count, other.mean, other.m2, other.min, other.max)
+
+    def _combine(self, count, mean, m2, minimum, maximum):
+        # Fórmula de Chan et al.: combina dos (n, media, M2) sin restar sumas grandes
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+        self.min = min(self.min, minimum)
+        self.max = max(self.max, maximum)
+
+    @property
+    def std(self) -> float:
+        """Desvío estándar muestral (ddof=1, como pandas)."""
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else math.nan
+
+
+class QuantileSketch:
+    """
+    Sketch KLL de cuantiles aproximados.
+
+    Cada nivel `i` guarda valores de peso `2**i`. Cuando un nivel supera su
+    capacidad se ordena y pasa al siguiente uno de cada dos valores (con
+    desplazamiento aleatorio), así la memoria queda en O(k) aunque entren
+    miles de millones de filas. Con pocos valores (< k) los cuantiles son exactos.
+
+    Args:
+        k (int): Capacidad del nivel más alto; más k, menos error y más memoria.
+    """
+
+    def __init__(self, k: int = DEFAULT_SKETCH_K, seed: int = 0):
+        self.k = k
+        self.count = 0
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values: np.ndarray):
+        """Incorpora un chunk de valores (los NaN se ignoran)."""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values):
+            self.count += len(values)
+            self.levels[0] = np.concatenate([self.levels[0], values])
+            self._compress()
+
+    def merge(self, other: "QuantileSketch"):
+        """Combina con otro sketch."""
+        self.count += other.count
+        for level, items in enumerate(other.levels):
+            if level == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self._compress()
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(2, int(math.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self):
+        compacted = True
+        while compacted:
+            compacted = False
+            for level, items in enumerate(self.levels):
+                if len(items) <= self._capacity(level):
+                    continue
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(items)
+                odd = len(items) % 2
+                promoted = items[odd + int(self._rng.integers(2))::2]
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+                self.levels[level] = items[:odd]
+                compacted = True
+
+    def quantiles(self, qs) -> list:
+        """Cuantiles aproximados con interpolación lineal (como pandas)."""
+        if not self.count:
+            return [math.nan for _ in qs]
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 2.0 ** level)
+                                  for level, items in enumerate(self.levels)])
+        order = np.argsort(values, kind="stable")
+        values, weights = values[order], weights[order]
+        # Rango (base 0) del centro de cada valor; con pesos 1 son 0..n-1 exactos
+        ranks = np.cumsum(weights) - weights + (weights - 1) / 2
+        total = weights.sum()
+        return [float(np.interp(q * (total - 1), ranks, values)) for q in qs]
+
+
+class CorrelationStats:
+    """
+    Momentos por par de columnas para la correlación de Pearson, combinables.
+
+    Para cada par (i, j) guarda, sobre las filas en que las dos tienen valor
+    (como `DataFrame.corr()`), n, la media y el M2 de cada columna y el
+    co-momento Σ(xi - media_i)(xj - media_j), en matrices p x p (`mean[i, j]`
+    y `m2[i, j]` son los de la columna i en el par). Cada chunk se centra en
+    sus medias antes de los productos matriciales y se combina con la fórmula
+    de Chan, como `RunningStats`: no se restan sumas grandes.
+
+    Args:
+        columns (list): Nombres de las columnas, en el orden de los valores.
+    """
+
+    def __init__(self, columns: list):
+        self.columns = list(columns)
+        size = len(self.columns)
+        self.n = np.zeros((size, size))
+        self.mean = np.zeros((size, size))
+        self.m2 = np.zeros((size, size))
+        self.comoment = np.zeros((size, size))
+
+    def update(self, values: np.ndarray):
+        """Incorpora un chunk: matriz filas x columnas (NaN cuenta como faltante)."""
+        values = np.asarray(values, dtype=np.float64)
+        present = ~np.isnan(values)
+        weights = present.astype(np.float64)
+        counts = weights.sum(axis=0)
+        shift = np.divide(np.where(present, values, 0.0).sum(axis=0), counts,
+                          out=np.zeros(len(counts)), where=counts > 0)
+        centered = np.where(present, values - shift, 0.0)
+
+        n = weights.T @ weights
+        sums = centered.T @ weights  # sums[i, j]: Σ de la columna i en las filas del par
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(n > 0, sums / n, 0.0)
+        m2 = np.square(centered).T @ weights - sums * mean
+        comoment = centered.T @ centered - sums * mean.T
+        self._combine(n, mean + shift[:, None], m2, comoment)
+
+    def merge(self, other: "CorrelationStats"):
+        """Combina con otro acumulado de las mismas columnas (ej: de otro proceso)."""
+        if other.columns != self.columns:
+            raise ValueError("Solo se combinan acumulados de las mismas columnas")
+        self._combine(other.n, other.mean, other.m2, other.comoment)
+
+    def _combine(self, n, mean, m2, comoment):
+        total = self.n + n
+        with np.errstate(invalid="ignore", divide="ignore"):
+            weight = np.where(total > 0, n / total, 0.0)
+            factor = np.where(total > 0, self.n * n / total, 0.0)
+        delta = np.where(n > 0, mean - self.mean, 0.0)
+        self.mean += delta * weight
+        self.m2 += m2 + np.square(delta) * factor
+        self.comoment += comoment + delta * delta.T * factor
+        self.n = total
+
+    def corr(self, min_periods: int = 1) -> pd.DataFrame:
+        """Matriz de correlación (NaN en pares con menos de `min_periods` filas o sin varianza)."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            matrix = self.comoment / np.sqrt(self.m2 * self.m2.T)
+        matrix = np.clip(matrix, -1.0, 1.0)
+        matrix[(self.n < max(min_periods, 1)) | ~np.isfinite(matrix)] = np.nan
+        return pd.DataFrame(matrix, index=self.columns, columns=self.columns)
+
+
+def _is_numeric(dtype) -> bool:
+    # describe() solo resume números (no booleanos)
+    return pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+
+
+def _common_dtype(dtypes: list):
+    """Tipo que tendría la columna leyendo el archivo entero."""
+    if all(dtype == dtypes[0] for dtype in dtypes):
+        return dtypes[0]
+    if all(_is_numeric(dtype) for dtype in dtypes):
+        return np.result_type(*dtypes)
+    return np.dtype(object)
+
+
+def _merge_counts(counts: dict, chunk: pd.DataFrame):
+    for column in chunk.columns:
+        current = chunk[column].value_counts(sort=False)
+        previous = counts.get(column)
+        counts[column] = current if previous is None else previous.add(current, fill_value=0)
+
+
+def _update_numeric(summaries: dict, column: str, values: pd.Series, sketch_k: int):
+    values = values.to_numpy(dtype=np.float64, na_value=np.nan)
+    if column not in summaries:
+        summaries[column] = (RunningStats(), QuantileSketch(sketch_k))
+    for summary in summaries[column]:
+        summary.update(values)
+
+
+def _describe_numeric(running: RunningStats, sketch: QuantileSketch) -> dict:
+    """Resumen de una columna numérica con las claves de describe()."""
+    quartiles = sketch.quantiles(DESCRIBE_QUANTILES)
+    empty = running.count == 0
+    return {
+        "count": float(running.count),
+        "mean": math.nan if empty else running.mean,
+        "std": running.std,
+        "min": math.nan if empty else running.min,
+        "25%": quartiles[0],
+        "50%": quartiles[1],
+        "75%": quartiles[2],
+        "max": math.nan if empty else running.max,
+    }
+
+
+def _describe_text(counts: pd.Series) -> dict:
+    """Resumen de una columna de texto (count, unique, top, freq) desde sus conteos."""
+    counts = counts[counts > 0]
+    return {
+        "count": int(counts.sum()),
+        "unique": len(counts),
+        "top": counts.idxmax() if len(counts) else math.nan,
+        "freq": int(counts.max()) if len(counts) else math.nan,
+    }
+
+
+def analyze_chunks(chunks, sketch_k: int = DEFAULT_SKETCH_K) -> dict:
+    """
+    Análisis de `analyze_data` (mismas claves y formato) en una pasada por chunks.
+
+    Las columnas numéricas usan `RunningStats` + `QuantileSketch`; los
+    percentiles son aproximados y el resto de las métricas, exactas. Si el
+    archivo no tiene columnas numéricas, como describe(), se reportan count,
+    unique, top y freq de las columnas de texto.
+    """
+    rows = 0
+    columns = None
+    dtypes, summaries, missing = {}, {}, {}
+    counts = {}  # value_counts de texto, solo mientras no aparezca un número
+
+    for chunk in chunks:
+        if columns is None:
+            columns = list(chunk.columns)
+            missing = dict.fromkeys(columns, 0)
+        rows += len(chunk)
+        for column, nulls in chunk.isnull().sum().items():
+            missing[column] += int(nulls)
+        for column in columns:
+            if chunk[column].dtype not in dtypes.setdefault(column, []):
+                dtypes[column].append(chunk[column].dtype)
+
+        numeric = [c for c in columns if all(_is_numeric(d) for d in dtypes[c])]
+        for column in numeric:
+            _update_numeric(summaries, column, chunk[column], sketch_k)
+        if numeric:
+            counts = None
+        elif counts is not None:
+            _merge_counts(counts, chunk)
+
+    columns = columns or []
+    final_dtypes = {column: _common_dtype(dtypes[column]) for column in columns}
+    numeric = [c for c in columns if _is_numeric(final_dtypes[c])]
+    if numeric:
+        estadisticas = {column: _describe_numeric(*summaries[column]) for column in numeric}
+    else:
+        estadisticas = {column: _describe_text(values)
+                        for column, values in (counts or {}).items()}
+
+    return {
+        "total_filas": rows,
+        "total_columnas": len(columns),
+        "columnas": columns,
+        "tipos_datos": final_dtypes,
+        "estadisticas": estadisticas,
+        "valores_faltantes": missing,
+    }
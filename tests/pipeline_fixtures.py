@@ -0,0 +1,34 @@
+"""Pipeline de acciones de ejemplo compartido por los tests del runner."""
+import os
+import shutil
+import tempfile
+import unittest
+
+import yaml
+
+STEPS = [
+    {"action": "transform_data", "input": "ventas.csv", "output": "out/filtradas.csv",
+     "steps": [{"filter": {"column": "Cantidad", "op": ">", "value": 10}}]},
+    {"action": "convert_csv_to_json", "input": "out/filtradas.csv",
+     "output": "out/filtradas.json"},
+]
+
+
+class PipelineDirTestCase(unittest.TestCase):
+    """Corre cada test en un directorio temporal con `ventas.csv` y `pipeline.yaml`."""
+
+    PIPELINE_NAME = "pipeline"
+
+    def setUp(self):
+        # El dispatcher normaliza rutas a relativas: trabajar dentro del temp dir
+        self.old_cwd = os.getcwd()
+        self.temp_dir = tempfile.mkdtemp()
+        os.chdir(self.temp_dir)
+        with open("ventas.csv", "w", encoding="utf-8") as f:
+            f.write("Producto,Cantidad\nManzanas,10\nNaranjas,20\nBananas,15\n")
+        with open("pipeline.yaml", "w", encoding="utf-8") as f:
+            yaml.safe_dump({"pipeline": {"name": self.PIPELINE_NAME, "steps": STEPS}}, f)
+
+    def tearDown(self):
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.temp_dir)
@@ -0,0 +1,96 @@
+import unittest
+import json
+import os
+import sys
+import tempfile
+import shutil
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+# Local imports
+# pylint: disable=wrong-import-position
+import datasets
+from core.plugins.data_analyzer.plugin import DataAnalyzerPlugin
+from correlation import correlation
+from registry import get_function
+from streaming_stats import CorrelationStats
+
+
+class TestCorrelation(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        rng = np.random.default_rng(2)
+        base = rng.normal(0, 1, 4_000)
+        self.df = pd.DataFrame({
+            "x": base,
+            "y": 0.6 * base + rng.normal(0, 1, 4_000),
+            "z": rng.integers(0, 100, 4_000),
+            "region": rng.choice(["norte", "sur"], 4_000),
+            "constante": 3.0,
+        })
+        self.df.loc[rng.random(4_000) < 0.1, "y"] = np.nan
+        self.df.loc[rng.random(4_000) < 0.05, "x"] = np.nan
+        self.csv_path = os.path.join(self.temp_dir, "medidas.csv")
+        self.df.to_csv(self.csv_path, index=False)
+        datasets.dataset_cache.clear()
+
+    def tearDown(self):
+        datasets.dataset_cache.clear()
+        shutil.rmtree(self.temp_dir)
+
+    def _expected(self):
+        return self.df.select_dtypes(include="number").corr()
+
+    def test_chunks_and_merge_match_pandas(self):
+        values = self.df[["x", "y", "z", "constante"]].to_numpy(dtype=np.float64)
+        chunked = CorrelationStats(["x", "y", "z", "constante"])
+        for start in range(0, len(values), 333):
+            chunked.update(values[start:start + 333])
+        first, second = CorrelationStats(chunked.columns), CorrelationStats(chunked.columns)
+        first.update(values[:1_500])
+        second.update(values[1_500:])
+        first.merge(second)
+        for stats in (chunked, first):
+            pd.testing.assert_frame_equal(stats.corr(), self._expected(), atol=1e-12)
+        with self.assertRaises(ValueError):
+            first.merge(CorrelationStats(["x"]))
+
+    def test_stable_with_large_offset(self):
+        values = 1e9 + self.df[["x", "y"]].to_numpy(dtype=np.float64)
+        stats = CorrelationStats(["x", "y"])
+        for start in range(0, len(values), 500):
+            stats.update(values[start:start + 500])
+        self.assertAlmostEqual(stats.corr().loc["x", "y"], self._expected().loc["x", "y"],
+                               places=6)
+
+    def test_file_correlation_sequential_and_parallel(self):
+        for workers in (1, 2):
+            result = correlation(self.csv_path, chunk_rows=700, workers=workers)
+            pd.testing.assert_frame_equal(result, self._expected(), atol=1e-12)
+
+        # Una columna que trae texto más adelante no es numérica en el archivo
+        mixed = self.df.assign(z=self.df["z"].astype(object))
+        mixed.loc[3_900, "z"] = "n/d"
+        mixed.to_csv(self.csv_path, index=False)
+        self.assertEqual(list(correlation(self.csv_path, chunk_rows=700).columns),
+                         ["x", "y", "constante"])
+
+    def test_correlation_matrix_function(self):
+        DataAnalyzerPlugin().register_functions()
+        output_path = os.path.join(self.temp_dir, "corr.json")
+        for streaming in (False, True):
+            result = get_function("correlation_matrix")["function"](
+                self.csv_path, output_path, streaming=streaming, chunk_rows=500)
+            self.assertIn("'x', 'y', 'z', 'constante'", result)
+            with open(output_path, "r", encoding="utf-8") as f:
+                matrix = pd.DataFrame(json.load(f))
+            self.assertAlmostEqual(matrix.loc["x", "y"], self._expected().loc["x", "y"],
+                                   places=12)
+
+
+if __name__ == '__main__':
+    unittest.main()
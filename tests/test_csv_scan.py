@@ -0,0 +1,95 @@
+import unittest
+import os
+import sys
+import json
+import tempfile
+import shutil
+
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+# Local imports
+# pylint: disable=wrong-import-position
+import datasets
+from csv_scan import count_lines, record_end
+from functions.data_ops import analyze_data, count_rows, preview_data
+
+
+class TestCountLines(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "datos.csv")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _write(self, content: bytes):
+        with open(self.path, "wb") as f:
+            f.write(content)
+
+    def test_trailing_newlines_and_missing_final_newline(self):
+        for content, expected in [(b"", 0), (b"\n\n", 0), (b"a,b\n", 1), (b"a,b\n1,2", 2),
+                                  (b"a,b\r\n1,2\r\n\r\n", 2)]:
+            self._write(content)
+            self.assertEqual(count_lines(self.path), expected, content)
+
+    def test_quoted_newlines_across_blocks(self):
+        texto = ['linea 1\nlinea "2"\n' if i % 7 == 0 else "x" for i in range(300)]
+        df = pd.DataFrame({"id": range(300), "texto": texto})
+        df.to_csv(self.path, index=False)
+        # Bloques chicos: las comillas abiertas cruzan de un bloque al siguiente
+        for chunk_bytes in (5, 64, 1 << 20):
+            self.assertEqual(count_lines(self.path, chunk_bytes=chunk_bytes), len(df) + 1)
+        self.assertGreater(count_lines(self.path, quoted=False), len(df) + 1)
+
+    def test_record_end_skips_quoted_newlines(self):
+        content = b'id,nota\n1,a\n2,"uno\ndos"\n3,"abierta\nsigue'
+        self._write(content)
+        after_two = content.index(b"3,")
+        for chunk_bytes in (3, 1 << 20):
+            self.assertEqual(record_end(self.path, 0, len(content), chunk_bytes), after_two)
+            self.assertEqual(record_end(self.path, after_two, len(content), chunk_bytes),
+                             after_two)
+        self.assertEqual(record_end(self.path, 0, content.index(b"2,") + 5), 12)
+
+
+class TestCountAndPreview(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.csv_path = os.path.join(self.temp_dir, "ventas.csv")
+        self.df = pd.DataFrame({"region": ["norte", "sur"] * 50, "cantidad": range(100)})
+        self.df.to_csv(self.csv_path, index=False)
+        datasets.dataset_cache.clear()
+
+    def tearDown(self):
+        datasets.dataset_cache.clear()
+        shutil.rmtree(self.temp_dir)
+
+    def test_count_rows_without_parsing(self):
+        datasets.reset_io_stats()
+        self.assertEqual(count_rows(self.csv_path), f"{self.csv_path} tiene 100 filas")
+        self.assertEqual(datasets.io_stats["reads"], 0)
+
+        ndjson_path = os.path.join(self.temp_dir, "ventas.ndjson")
+        self.df.to_json(ndjson_path, orient="records", lines=True)
+        self.assertEqual(datasets.count_rows(ndjson_path), 100)
+
+    def test_preview_reads_only_first_rows(self):
+        result = preview_data(self.csv_path, rows=3)
+        self.assertTrue(result.startswith(f"Primeras 3 filas de {self.csv_path}"))
+        self.assertIn("norte", result)
+        self.assertEqual(len(datasets.read_head(self.csv_path, 3)), 3)
+
+    def test_analyze_counts_only(self):
+        output_path = os.path.join(self.temp_dir, "conteo.json")
+        analyze_data(self.csv_path, output_path, counts_only=True)
+        with open(output_path, "r", encoding="utf-8") as f:
+            analysis = json.load(f)
+        self.assertEqual(analysis, {"total_filas": 100, "total_columnas": 2,
+                                    "columnas": ["region", "cantidad"]})
+
+
+if __name__ == '__main__':
+    unittest.main()
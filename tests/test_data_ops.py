@@ -0,0 +1,70 @@
+import unittest
+import json
+import os
+import sys
+import tempfile
+import shutil
+
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+# Local imports
+# pylint: disable=wrong-import-position
+import datasets
+from functions.data_ops import convert_csv_to_json
+
+
+class TestConvertCsvToJson(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.csv_path = os.path.join(self.temp_dir, "ventas.csv")
+        self.df = pd.DataFrame({
+            "producto": ["manzanas", None, "ñandú", "peras/kg"] * 5,
+            "cantidad": range(20),
+            "precio": [1.25, 2.5, None, 0.1] * 5,
+        })
+        self.df.to_csv(self.csv_path, index=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _path(self, name):
+        return os.path.join(self.temp_dir, name)
+
+    def test_chunked_array_matches_source(self):
+        for compact in (False, True):
+            output = self._path("ventas.json")
+            convert_csv_to_json(self.csv_path, output, compact=compact, chunk_rows=3)
+            with open(output, "r", encoding="utf-8") as f:
+                text = f.read()
+            self.assertEqual("\n" in text.strip(), not compact)
+            pd.testing.assert_frame_equal(pd.DataFrame(json.loads(text)),
+                                          pd.read_csv(self.csv_path))
+
+    def test_ndjson_by_extension(self):
+        output = self._path("ventas.ndjson")
+        result = convert_csv_to_json(self.csv_path, output, chunk_rows=7)
+        self.assertIn("NDJSON", result)
+        with open(output, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        self.assertEqual(len(lines), 20)
+        self.assertEqual(json.loads(lines[2])["producto"], "ñandú")
+        pd.testing.assert_frame_equal(datasets.load_dataset(output), pd.read_csv(self.csv_path))
+
+    def test_empty_csv_and_invalid_format(self):
+        empty = self._path("vacio.csv")
+        with open(empty, "w", encoding="utf-8") as f:
+            f.write("a,b\n")
+        output = self._path("vacio.json")
+        convert_csv_to_json(empty, output)
+        with open(output, "r", encoding="utf-8") as f:
+            self.assertEqual(json.load(f), [])
+
+        with self.assertRaises(ValueError):
+            convert_csv_to_json(self.csv_path, output, output_format="xml")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+import os
+import sys
+import tempfile
+import shutil
+
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+# Local imports
+# pylint: disable=wrong-import-position
+import datasets
+from datasets import DatasetCache
+from core.plugins.data_analyzer import DataAnalyzerPlugin
+from functions.data_ops import analyze_data
+from registry import get_function
+
+
+class TestDatasetCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.csv_path = os.path.join(self.temp_dir, "ventas.csv")
+        pd.DataFrame({"producto": ["a", "b", "c"], "cantidad": [1, 200, 3]}).to_csv(
+            self.csv_path, index=False)
+        datasets.dataset_cache.clear()
+        datasets.reset_io_stats()
+
+    def tearDown(self):
+        datasets.dataset_cache.clear()
+        shutil.rmtree(self.temp_dir)
+
+    def test_second_load_is_a_hit(self):
+        first = datasets.load_dataset(self.csv_path)
+        second = datasets.load_dataset(self.csv_path)
+        self.assertIs(first, second)
+        self.assertEqual(datasets.io_stats["reads"], 1)
+        stats = datasets.dataset_cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["entries"]), (1, 1, 1))
+
+    def test_changed_file_is_reloaded(self):
+        datasets.load_dataset(self.csv_path)
+        with open(self.csv_path, "a", encoding="utf-8") as f:
+            f.write("d,4\n")
+        self.assertEqual(len(datasets.load_dataset(self.csv_path)), 4)
+        self.assertEqual(datasets.dataset_cache.stats()["entries"], 1)
+
+    def test_save_invalidates(self):
+        datasets.load_dataset(self.csv_path)
+        datasets.save_dataset(pd.DataFrame({"x": [1]}), self.csv_path,
+                              lambda df, path: df.to_csv(path, index=False))
+        self.assertEqual(list(datasets.load_dataset(self.csv_path).columns), ["x"])
+
+    def test_lru_eviction_under_budget(self):
+        paths = []
+        for i in range(3):
+            path = os.path.join(self.temp_dir, f"parte_{i}.csv")
+            pd.DataFrame({"valor": range(1000)}).to_csv(path, index=False)
+            paths.append(path)
+        cache = DatasetCache(max_mb=0.02)  # entran dos DataFrames de ~8 KB
+        for path in paths:
+            cache.put(path, pd.read_csv(path))
+        cache.get(paths[1])
+
+        self.assertEqual(cache.stats()["evictions"], 1)
+        self.assertIsNone(cache.get(paths[0]))
+        self.assertIsNotNone(cache.get(paths[1]))
+
+    def test_session_parses_file_once(self):
+        DataAnalyzerPlugin().register_functions()
+        analyze_data(self.csv_path, os.path.join(self.temp_dir, "analisis.json"))
+        get_function("detect_outliers")["function"](self.csv_path, "cantidad")
+        get_function("correlation_matrix")["function"](
+            self.csv_path, os.path.join(self.temp_dir, "corr.json"))
+
+        self.assertEqual(datasets.io_stats["reads"], 1)
+        self.assertEqual(datasets.dataset_cache.stats()["hits"], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+import os
+import sys
+import tempfile
+import shutil
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+# Local imports
+# pylint: disable=wrong-import-position
+import datasets
+from dedupe import BloomFilter, Deduplicator, HashSet
+from functions.data_ops import dedupe_csv
+from hash_join import key_hashes
+
+
+class TestDedupe(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.spill_base = os.path.join(self.temp_dir, "spill")
+        self.csv_path = os.path.join(self.temp_dir, "eventos.csv")
+        rng = np.random.default_rng(5)
+        self.df = pd.DataFrame({
+            "usuario": rng.integers(0, 40, 3_000),
+            "accion": rng.choice(["click", "vista", None], 3_000),
+            # Con nulos sólo en algunos chunks: int en unos, float en otros
+            "valor": np.where(np.arange(3_000) < 500, np.nan, rng.integers(0, 3, 3_000)),
+        })
+        self.df.to_csv(self.csv_path, index=False)
+        datasets.dataset_cache.clear()
+
+    def tearDown(self):
+        datasets.dataset_cache.clear()
+        shutil.rmtree(self.temp_dir)
+
+    def test_matches_drop_duplicates(self):
+        for columns in (None, ["usuario", "accion"], "valor"):
+            expected = self.df.drop_duplicates(columns).reset_index(drop=True)
+            # El presupuesto ínfimo fuerza las particiones a disco
+            for memory_mb, partitioned in ((512, False), (0.001, True)):
+                deduplicator = Deduplicator(columns, memory_mb=memory_mb, chunk_rows=400,
+                                            spill_base=self.spill_base)
+                result = pd.concat(list(deduplicator.run(self.csv_path)), ignore_index=True)
+                pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+                self.assertEqual(deduplicator.partitioned, partitioned)
+                self.assertEqual(deduplicator.duplicates, len(self.df) - len(expected))
+        self.assertEqual(os.listdir(self.spill_base), [])
+
+    def test_hashes_ignore_int_or_float_reading(self):
+        as_int = pd.DataFrame({"a": [5, 7], "b": ["x", "y"]})
+        as_float = pd.DataFrame({"a": [5.0, np.nan], "b": pd.Categorical(["x", None])})
+        hashes = key_hashes(as_int, ["a", "b"]), key_hashes(as_float, ["a", "b"])
+        self.assertEqual(hashes[0][0], hashes[1][0])
+        self.assertNotEqual(hashes[0][1], hashes[1][1])
+
+    def test_hash_set_and_bloom_filter(self):
+        values = np.random.default_rng(1).integers(0, 2**63, 10_000).astype(np.uint64)
+        seen = HashSet()
+        for start in range(0, 5_000, 700):
+            seen.add(values[start:min(start + 700, 5_000)])
+        self.assertEqual(len(seen), 5_000)
+        self.assertLessEqual(len(seen.runs), 4)
+        self.assertTrue(seen.contains(values[:5_000]).all())
+        self.assertFalse(seen.contains(values[5_000:]).any())
+
+        bloom = BloomFilter(5_000, error_rate=0.01)
+        self.assertFalse(bloom.add(values[:5_000]).all())
+        self.assertTrue(bloom.add(values[:100]).all())
+        # Los falsos positivos quedan cerca de la tasa pedida
+        self.assertLess(bloom.add(values[5_000:]).mean(), 0.03)
+
+    def test_dedupe_csv_function(self):
+        output_path = os.path.join(self.temp_dir, "unicos.csv")
+        result = dedupe_csv(self.csv_path, output_path, columns=["usuario", "accion"])
+        expected = self.df.drop_duplicates(["usuario", "accion"])
+        self.assertIn(f"{len(expected)} filas en {output_path}", result)
+        self.assertEqual(len(pd.read_csv(output_path)), len(expected))
+
+        estimate = dedupe_csv(self.csv_path, columns="usuario", approximate=True)
+        self.assertIn(f"~{len(self.df) - 40} filas duplicadas de {len(self.df)}", estimate)
+
+        with self.assertRaises(ValueError):
+            dedupe_csv(self.csv_path)
+        with self.assertRaises(KeyError):
+            dedupe_csv(self.csv_path, output_path, columns="no_existe")
+
+
+if __name__ == '__main__':
+    unittest.main()
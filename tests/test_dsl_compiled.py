@@ -0,0 +1,83 @@
+import unittest
+from unittest.mock import patch
+import os
+import sys
+import tempfile
+import shutil
+
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+# Local imports
+# pylint: disable=wrong-import-position
+from dsl import dsl_compiled
+from dsl.dsl_compiled import compile_stats, load_compiled
+from dsl.dsl_engine import execute_dsl
+from dsl.dsl_parser import DSLValidationError
+
+
+class TestCompiledCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.temp_dir, "compiled")
+        self.csv_path = os.path.join(self.temp_dir, "ventas.csv")
+        self.yaml_path = os.path.join(self.temp_dir, "pipeline.yaml")
+        pd.DataFrame({"region": ["norte", "sur"], "cantidad": [4, 6]}).to_csv(
+            self.csv_path, index=False)
+        self._write_pipeline(">")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _write_pipeline(self, op):
+        with open(self.yaml_path, "w", encoding="utf-8") as f:
+            f.write(
+                f"source: {{type: csv, path: {self.csv_path}}}\n"
+                "steps:\n"
+                f"  - filter: {{column: cantidad, op: '{op}', value: 5}}\n"
+                f"output: {{type: csv, path: {os.path.join(self.temp_dir, 'out.csv')}}}\n"
+            )
+
+    def test_second_load_skips_parse_and_validate(self):
+        load_compiled(self.yaml_path, self.cache_dir)
+        hits = compile_stats["hits"]
+        with patch("dsl.dsl_compiled.yaml.safe_load") as safe_load, \
+                patch("dsl.dsl_compiled.plan_dsl") as plan_dsl:
+            dsl, plan = load_compiled(self.yaml_path, self.cache_dir)
+            safe_load.assert_not_called()
+            plan_dsl.assert_not_called()
+        self.assertEqual(compile_stats["hits"], hits + 1)
+
+        stats = execute_dsl(dsl, plan=plan)
+        self.assertEqual(stats["rows_out"], 1)
+        self.assertIsNotNone(stats["first_row_s"])
+
+    def test_file_change_or_engine_version_recompiles(self):
+        _, first = load_compiled(self.yaml_path, self.cache_dir)
+        self._write_pipeline("<")
+        _, second = load_compiled(self.yaml_path, self.cache_dir)
+        self.assertNotEqual(first.steps, second.steps)
+
+        misses = compile_stats["misses"]
+        with patch.object(dsl_compiled, "ENGINE_VERSION", "otra"):
+            load_compiled(self.yaml_path, self.cache_dir)
+        self.assertEqual(compile_stats["misses"], misses + 1)
+
+    def test_invalid_pipeline_is_not_cached(self):
+        self._write_pipeline("~")
+        with self.assertRaises(DSLValidationError):
+            load_compiled(self.yaml_path, self.cache_dir)
+        self.assertFalse(os.path.isdir(self.cache_dir))
+
+    def test_action_pipeline_has_no_plan(self):
+        with open(self.yaml_path, "w", encoding="utf-8") as f:
+            f.write("pipeline:\n  name: acciones\n  steps: []\n")
+        dsl, plan = load_compiled(self.yaml_path, self.cache_dir)
+        self.assertEqual(dsl["pipeline"]["name"], "acciones")
+        self.assertIsNone(plan)
+
+
+if __name__ == '__main__':
+    unittest.main()
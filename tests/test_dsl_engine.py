@@ -0,0 +1,450 @@
+import unittest
+import json
+import os
+import sys
+import tempfile
+import shutil
+
+import pandas as pd
+
+try:
+    import pyarrow.parquet
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+# Local imports
+# pylint: disable=wrong-import-position
+from dsl.dsl_parser import DSLValidationError
+from dsl.dsl_engine import (
+    execute_dsl,
+    estimate_chunk_rows,
+    expand_source_paths,
+    merge_partials,
+    partial_aggregate,
+    finalize_aggregate,
+    plan_dsl,
+)
+from dsl.dsl_optimizer import required_columns
+from dsl.dsl_aggregate import group_ids
+
+
+class TestDSLEngine(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.csv_path = os.path.join(self.temp_dir, "ventas.csv")
+        pd.DataFrame({
+            "region": ["norte", "sur", "este", "oeste"] * 250,
+            "cantidad": [i % 17 for i in range(1000)],
+            "precio": [float(i % 13) + 0.5 for i in range(1000)],
+        }).to_csv(self.csv_path, index=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _dsl(self, steps, output_type="csv"):
+        return {
+            "source": {"type": "csv", "path": self.csv_path},
+            "steps": steps,
+            "output": {
+                "type": output_type,
+                "path": os.path.join(self.temp_dir, f"out.{output_type}"),
+            },
+        }
+
+    def test_row_wise_streaming_matches_batch(self):
+        steps = [
+            {"filter": {"column": "cantidad", "op": ">", "value": 3}},
+            {"select_columns": {"columns": ["region", "precio"]}},
+            {"rename_column": {"from": "precio", "to": "importe"}},
+        ]
+        dsl = self._dsl(steps)
+
+        execute_dsl(dsl, streaming=False)
+        batch = pd.read_csv(dsl["output"]["path"])
+
+        stats = execute_dsl(dsl, streaming=True, chunk_rows=64)
+        streamed = pd.read_csv(dsl["output"]["path"])
+
+        self.assertGreater(stats["chunks"], 1)
+        self.assertEqual(stats["rows_out"], len(batch))
+        pd.testing.assert_frame_equal(batch, streamed)
+
+    def test_streaming_aggregate_matches_pandas(self):
+        steps = [{
+            "aggregate": {
+                "group_by": "region",
+                "metrics": {"cantidad": "sum", "precio": "mean"},
+            }
+        }]
+        dsl = self._dsl(steps, output_type="json")
+
+        execute_dsl(dsl, streaming=True, chunk_rows=37)
+        with open(dsl["output"]["path"], "r", encoding="utf-8") as f:
+            result = pd.DataFrame(json.load(f)).set_index("region")
+
+        expected = pd.read_csv(self.csv_path).groupby("region").agg(
+            {"cantidad": "sum", "precio": "mean"})
+        pd.testing.assert_frame_equal(
+            result.sort_index(), expected.sort_index(), check_dtype=False)
+
+    def test_merge_partials_global_aggregate(self):
+        params = {"metrics": {"precio": "max", "cantidad": "count"}}
+        df = pd.read_csv(self.csv_path)
+        partial = merge_partials([
+            partial_aggregate(df.iloc[:300], params),
+            partial_aggregate(df.iloc[300:], params),
+        ])
+        result = finalize_aggregate(partial, params)
+
+        self.assertEqual(len(result), 1)
+        self.assertEqual(result["precio"][0], df["precio"].max())
+        self.assertEqual(result["cantidad"][0], 1000)
+
+    def test_memory_limit_bounds_chunk_rows(self):
+        plan = plan_dsl(self._dsl([]))
+        small = estimate_chunk_rows(plan, memory_limit_mb=1)
+        large = estimate_chunk_rows(plan, memory_limit_mb=100)
+        self.assertLess(small, large)
+
+    def test_streaming_json_requires_lines(self):
+        json_path = os.path.join(self.temp_dir, "datos.json")
+        pd.read_csv(self.csv_path).to_json(json_path, orient="records")
+        dsl = self._dsl([])
+        dsl["source"] = {"type": "json", "path": json_path}
+
+        with self.assertRaises(DSLValidationError):
+            execute_dsl(dsl, streaming=True)
+
+
+class TestWindowOperations(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.csv_path = os.path.join(self.temp_dir, "lecturas.csv")
+        times = pd.date_range("2024-01-01", periods=500, freq="37min")
+        self.df = pd.DataFrame({
+            "ts": times,
+            "sensor": ["a", "b", "c", "b", "a"] * 100,
+            "valor": [float((i * 7) % 23) for i in range(500)],
+        })
+        # Un hueco de más de un día para que resample genere intervalos vacíos
+        self.df = self.df[(self.df.index < 200) | (self.df.index > 260)]
+        self.df.to_csv(self.csv_path, index=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _run(self, steps, streaming):
+        out_path = os.path.join(self.temp_dir, f"out_{streaming}.csv")
+        execute_dsl({
+            "source": {"type": "csv", "path": self.csv_path},
+            "steps": steps,
+            "output": {"type": "csv", "path": out_path},
+        }, streaming=streaming, chunk_rows=1000 if not streaming else 1000 // 7 + 1)
+        return pd.read_csv(out_path)
+
+    def test_rolling_streaming_matches_batch_and_pandas(self):
+        steps = [{"rolling": {"column": "valor", "window": 5, "func": "mean",
+                              "group_by": "sensor", "as": "media"}}]
+        batch = self._run(steps, streaming=False)
+        streamed = self._run(steps, streaming=True)
+        pd.testing.assert_frame_equal(batch, streamed)
+
+        expected = self.df.groupby("sensor")["valor"].transform(
+            lambda s: s.rolling(5).mean())
+        pd.testing.assert_series_equal(batch["media"], expected.reset_index(drop=True),
+                                       check_names=False)
+
+    def test_rolling_after_filter_without_groups(self):
+        steps = [{"filter": {"column": "valor", "op": ">", "value": 3}},
+                 {"rolling": {"column": "valor", "window": 4, "func": "std",
+                              "min_periods": 2}}]
+        pd.testing.assert_frame_equal(self._run(steps, streaming=False),
+                                      self._run(steps, streaming=True))
+
+    def test_resample_streaming_matches_pandas(self):
+        steps = [{"resample": {"time_column": "ts", "rule": "6h", "group_by": "sensor",
+                               "metrics": {"valor": "sum"}}}]
+        batch = self._run(steps, streaming=False)
+        streamed = self._run(steps, streaming=True)
+        pd.testing.assert_frame_equal(batch, streamed)
+
+        expected = (self.df.set_index("ts").groupby("sensor")["valor"]
+                    .resample("6h").sum().reset_index())
+        self.assertEqual(len(batch), len(expected))
+        self.assertEqual(batch["valor"].tolist(), expected["valor"].tolist())
+
+    def test_resample_calendar_rule_and_mean(self):
+        steps = [{"resample": {"time_column": "ts", "rule": "W",
+                               "metrics": {"valor": "mean"}}}]
+        batch = self._run(steps, streaming=False)
+        streamed = self._run(steps, streaming=True)
+        pd.testing.assert_frame_equal(batch, streamed)
+
+        weeks = self.df.set_index("ts")["valor"].resample("W").mean()
+        self.assertEqual(pd.to_datetime(batch["ts"]).tolist(), weeks.index.tolist())
+        for got, expected in zip(batch["valor"], weeks):
+            self.assertAlmostEqual(got, expected)
+
+    def test_resample_multiples_and_anchored_rules_match_pandas(self):
+        # Casi dos años desordenados: los intervalos no dependen del orden de los chunks
+        self.df = pd.DataFrame({
+            "ts": pd.date_range("2023-01-03 05:00", periods=3000, freq="5h"),
+            "sensor": ["a", "b", "c"] * 1000,
+            "valor": [float(i % 31) for i in range(3000)],
+        }).sample(frac=1, random_state=3)
+        self.df.to_csv(self.csv_path, index=False)
+
+        for rule in ("2W", "ME", "MS", "QS"):
+            for group_by in (None, "sensor"):
+                params = {"time_column": "ts", "rule": rule,
+                          "metrics": {"valor": ["sum", "mean"]}}
+                by_time = self.df.set_index("ts")
+                if group_by:
+                    params["group_by"] = group_by
+                    by_time = by_time.groupby(group_by)
+                batch = self._run([{"resample": params}], streaming=False)
+                streamed = self._run([{"resample": params}], streaming=True)
+                pd.testing.assert_frame_equal(batch, streamed)
+
+                expected = by_time["valor"].resample(rule).agg(["sum", "mean"]).reset_index()
+                self.assertEqual(pd.to_datetime(batch["ts"]).tolist(),
+                                 expected["ts"].tolist(), rule)
+                self.assertEqual(batch["valor_sum"].tolist(), expected["sum"].tolist(), rule)
+
+    def test_resample_rule_validation(self):
+        for rule, valid in (("ME", True), ("2W", True), ("M", False), ("bh", False),
+                            ("-1h", False)):
+            dsl = {"source": {"type": "csv", "path": self.csv_path},
+                   "steps": [{"resample": {"time_column": "ts", "rule": rule,
+                                           "metrics": {"valor": "sum"}}}],
+                   "output": {"type": "csv", "path": "x.csv"}}
+            if valid:
+                plan_dsl(dsl)
+            else:
+                with self.assertRaises(DSLValidationError):
+                    plan_dsl(dsl)
+
+    def test_invalid_rolling_window(self):
+        with self.assertRaises(DSLValidationError):
+            plan_dsl({
+                "source": {"type": "csv", "path": self.csv_path},
+                "steps": [{"rolling": {"column": "valor", "window": 0}}],
+                "output": {"type": "csv", "path": "x.csv"},
+            })
+
+
+class TestHashAggregate(unittest.TestCase):
+    def setUp(self):
+        self.df = pd.DataFrame({
+            "region": ["norte", "sur", None, "este", "sur", "norte"] * 50,
+            "canal": ["web", "tienda", "web", "web", None, "tienda"] * 50,
+            "cantidad": list(range(300)),
+            "precio": [1.5, None, 2.0, 3.25, 4.0, 0.5] * 50,
+        })
+        self.params = {"group_by": ["region", "canal"],
+                       "metrics": {"cantidad": ["sum", "max"],
+                                   "precio": ["mean", "min", "count"]}}
+
+    def _expected(self):
+        expected = self.df.groupby(["region", "canal"]).agg(
+            {"cantidad": ["sum", "max"], "precio": ["mean", "min", "count"]})
+        expected.columns = [f"{col}_{func}" for col, func in expected.columns]
+        return expected.reset_index()
+
+    def test_multiple_functions_per_column_match_pandas(self):
+        result = finalize_aggregate(partial_aggregate(self.df, self.params), self.params)
+        pd.testing.assert_frame_equal(result, self._expected(), check_dtype=False)
+
+    def test_chunked_merge_matches_batch(self):
+        partials = [partial_aggregate(self.df.iloc[i:i + 70], self.params)
+                    for i in range(0, len(self.df), 70)]
+        result = finalize_aggregate(merge_partials(partials), self.params)
+        pd.testing.assert_frame_equal(result, self._expected(), check_dtype=False)
+
+    def test_categorical_keys_skip_unused_categories(self):
+        df = self.df.astype({"region": pd.CategoricalDtype(["oeste", "norte", "sur", "este"])})
+        ids, ngroups, index = group_ids([df["region"]])
+        self.assertEqual(ngroups, 3)
+        self.assertEqual(int((ids == -1).sum()), 50)
+        self.assertEqual(sorted(index), ["este", "norte", "sur"])
+
+        params = {"group_by": "region", "metrics": {"cantidad": "sum"}}
+        result = finalize_aggregate(partial_aggregate(df, params), params)
+        expected = df.groupby("region", observed=True, as_index=False).agg({"cantidad": "sum"})
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False,
+                                      check_categorical=False)
+
+    def test_list_metrics_in_dsl(self):
+        temp_dir = tempfile.mkdtemp()
+        try:
+            input_path = os.path.join(temp_dir, "in.csv")
+            output_path = os.path.join(temp_dir, "out.csv")
+            self.df.to_csv(input_path, index=False)
+            dsl = {"source": {"type": "csv", "path": input_path},
+                   "steps": [{"aggregate": self.params}],
+                   "output": {"type": "csv", "path": output_path}}
+            for streaming in (False, True):
+                execute_dsl(dsl, streaming=streaming, chunk_rows=64)
+                pd.testing.assert_frame_equal(pd.read_csv(output_path), self._expected(),
+                                              check_dtype=False)
+        finally:
+            shutil.rmtree(temp_dir)
+
+
+class TestPartitionedSource(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.parts_dir = os.path.join(self.temp_dir, "diario")
+        os.makedirs(self.parts_dir)
+        self.df = pd.DataFrame({
+            "region": ["norte", "sur", "este"] * 100,
+            "cantidad": [i % 11 for i in range(300)],
+            "precio": [float(i % 7) + 0.25 for i in range(300)],
+        })
+        for day in range(3):
+            self.df.iloc[day * 100:(day + 1) * 100].to_csv(
+                os.path.join(self.parts_dir, f"ventas_{day}.csv"), index=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _dsl(self, path, steps):
+        return {
+            "source": {"type": "csv", "path": path},
+            "steps": steps,
+            "output": {"type": "csv", "path": os.path.join(self.temp_dir, "out.csv")},
+        }
+
+    def test_expand_glob_and_directory(self):
+        by_dir = expand_source_paths({"type": "csv", "path": self.parts_dir})
+        by_glob = expand_source_paths(
+            {"type": "csv", "path": os.path.join(self.parts_dir, "ventas_*.csv")})
+        self.assertEqual(len(by_dir), 3)
+        self.assertEqual(by_dir, by_glob)
+
+        with self.assertRaises(DSLValidationError):
+            expand_source_paths({"type": "csv", "path": os.path.join(self.parts_dir, "*.tsv")})
+
+    def test_partitioned_aggregate_matches_single_file(self):
+        steps = [
+            {"filter": {"column": "cantidad", "op": ">", "value": 2}},
+            {"aggregate": {"group_by": "region",
+                           "metrics": {"cantidad": "sum", "precio": "mean"}}},
+        ]
+        for workers in (1, 2):
+            stats = execute_dsl(self._dsl(self.parts_dir, steps), workers=workers)
+            self.assertEqual(stats["partitions"], 3)
+            self.assertEqual(stats["rows_in"], 300)
+            result = pd.read_csv(os.path.join(self.temp_dir, "out.csv"))
+
+            expected = (self.df[self.df["cantidad"] > 2].groupby("region", as_index=False)
+                        .agg({"cantidad": "sum", "precio": "mean"}))
+            pd.testing.assert_frame_equal(
+                result.sort_values("region").reset_index(drop=True),
+                expected.sort_values("region").reset_index(drop=True),
+                check_dtype=False)
+
+    def test_rolling_crosses_partition_boundaries(self):
+        steps = [{"rolling": {"column": "cantidad", "window": 3, "func": "sum", "as": "suma"}}]
+        stats = execute_dsl(self._dsl(self.parts_dir, steps), workers=2)
+        result = pd.read_csv(os.path.join(self.temp_dir, "out.csv"))
+
+        self.assertEqual(stats["rows_in"], 300)
+        expected = self.df["cantidad"].rolling(3).sum()
+        pd.testing.assert_series_equal(result["suma"], expected, check_names=False)
+
+    def test_partitioned_row_wise_streaming(self):
+        steps = [{"filter": {"column": "cantidad", "op": "==", "value": 0}}]
+        stats = execute_dsl(self._dsl(self.parts_dir, steps), streaming=True,
+                            chunk_rows=1000, workers=2)
+        result = pd.read_csv(os.path.join(self.temp_dir, "out.csv"))
+        self.assertEqual(stats["rows_out"], len(result))
+        self.assertEqual(len(result), int((self.df["cantidad"] == 0).sum()))
+
+
+class TestParquetPushdown(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.parquet_path = os.path.join(self.temp_dir, "ventas.parquet")
+        self.df = pd.DataFrame({
+            "dia": list(range(1000)),
+            "region": ["norte", "sur"] * 500,
+            "precio": [float(i) for i in range(1000)],
+            "descripcion": ["x" * 20] * 1000,
+        })
+        if HAS_PYARROW:
+            self.df.to_parquet(self.parquet_path, index=False, row_group_size=100)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _dsl(self, steps):
+        return {
+            "source": {"type": "parquet", "path": self.parquet_path},
+            "steps": steps,
+            "output": {"type": "parquet",
+                       "path": os.path.join(self.temp_dir, "out.parquet")},
+        }
+
+    def test_required_columns(self):
+        steps = [
+            {"filter": {"column": "dia", "op": ">", "value": 3}},
+            {"rename_column": {"from": "precio", "to": "importe"}},
+            {"select_columns": {"columns": ["region", "importe"]}},
+        ]
+        self.assertEqual(required_columns(steps), {"dia", "region", "precio"})
+        self.assertIsNone(required_columns(steps[:2]))
+
+    @unittest.skipUnless(HAS_PYARROW, "requiere pyarrow")
+    def test_filter_prunes_row_groups(self):
+        dsl = self._dsl([
+            {"filter": {"column": "dia", "op": ">=", "value": 950}},
+            {"select_columns": {"columns": ["dia", "precio"]}},
+        ])
+        for streaming in (False, True):
+            stats = execute_dsl(dsl, streaming=streaming, chunk_rows=30)
+            self.assertEqual(stats["scan"]["row_groups_read"], 1)
+            self.assertEqual(stats["scan"]["columns_read"], 2)
+
+            result = pd.read_parquet(dsl["output"]["path"])
+            self.assertEqual(list(result.columns), ["dia", "precio"])
+            self.assertEqual(result["dia"].tolist(), list(range(950, 1000)))
+
+    @unittest.skipUnless(HAS_PYARROW, "requiere pyarrow")
+    def test_not_equal_keeps_row_groups_with_nulls(self):
+        self.df["region"] = [None] * 100 + ["norte"] * 900
+        self.df.to_parquet(self.parquet_path, index=False, row_group_size=100)
+        dsl = self._dsl([{"filter": {"column": "region", "op": "!=", "value": "norte"}}])
+
+        stats = execute_dsl(dsl, streaming=False)
+        self.assertEqual(stats["scan"]["row_groups_read"], 1)
+        self.assertEqual(stats["rows_out"], 100)
+
+    @unittest.skipUnless(HAS_PYARROW, "requiere pyarrow")
+    def test_sink_promotes_types_across_chunks(self):
+        csv_path = os.path.join(self.temp_dir, "deriva.csv")
+        pd.DataFrame({
+            "id": range(3000),
+            # Vacía en el primer chunk (float64) y con texto después
+            "codigo": [None] * 1999 + [f"x{i}" for i in range(1999, 3000)],
+            "cantidad": [1] * 1000 + [1.5] * 2000,
+        }).to_csv(csv_path, index=False)
+        dsl = self._dsl([])
+        dsl["source"] = {"type": "csv", "path": csv_path}
+
+        execute_dsl(dsl, streaming=True, chunk_rows=1000)
+        result = pd.read_parquet(dsl["output"]["path"])
+        expected = pd.read_csv(csv_path)
+        self.assertEqual(len(result), 3000)
+        self.assertTrue(result["codigo"].isna()[:1999].all())
+        self.assertEqual(result["codigo"].iloc[1999], "x1999")
+        self.assertEqual(result["cantidad"].tolist(), expected["cantidad"].tolist())
+        self.assertEqual(pyarrow.parquet.ParquetFile(dsl["output"]["path"]).num_row_groups, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
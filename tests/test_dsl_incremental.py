@@ -0,0 +1,148 @@
+import unittest
+import json
+import os
+import sys
+import tempfile
+import shutil
+
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+# Local imports
+# pylint: disable=wrong-import-position
+from dsl.dsl_incremental import run_incremental
+from runner import watch_pipeline
+
+
+class TestIncrementalRun(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.state_dir = os.path.join(self.temp_dir, "state")
+        self.log_path = os.path.join(self.temp_dir, "ventas.csv")
+        self._write("w", "region,cantidad\nnorte,5\nsur,3\nnorte,2\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _write(self, mode, text):
+        with open(self.log_path, mode, encoding="utf-8") as f:
+            f.write(text)
+
+    def _run(self, steps, output_type="csv"):
+        dsl = {
+            "source": {"type": "csv", "path": self.log_path},
+            "steps": steps,
+            "output": {"type": output_type,
+                       "path": os.path.join(self.temp_dir, f"out.{output_type}")},
+        }
+        return run_incremental(dsl, state_dir=self.state_dir, chunk_rows=2)
+
+    def _aggregate(self):
+        stats = self._run([{"aggregate": {"group_by": "region",
+                                          "metrics": {"cantidad": "sum"}}}])
+        result = pd.read_csv(os.path.join(self.temp_dir, "out.csv"))
+        return stats, dict(zip(result["region"], result["cantidad"]))
+
+    def test_append_merges_aggregate(self):
+        stats, totals = self._aggregate()
+        self.assertEqual(stats["mode"], "full")
+        self.assertEqual(totals, {"norte": 7, "sur": 3})
+
+        self._write("a", "sur,10\neste,1\n")
+        stats, totals = self._aggregate()
+        self.assertEqual(stats["mode"], "incremental")
+        self.assertEqual(stats["rows_in"], 2)
+        self.assertEqual(totals, {"norte": 7, "sur": 13, "este": 1})
+
+        stats, _ = self._aggregate()
+        self.assertEqual(stats["rows_in"], 0)
+
+    def test_partial_line_waits_for_newline(self):
+        self._aggregate()
+        self._write("a", "sur,10\nsur,")
+        _, totals = self._aggregate()
+        self.assertEqual(totals["sur"], 13)
+
+        self._write("a", "100\n")
+        _, totals = self._aggregate()
+        self.assertEqual(totals["sur"], 113)
+
+    def test_quoted_newline_is_not_a_record_end(self):
+        steps = [{"select_columns": {"columns": ["region", "cantidad"]}}]
+        self._run(steps)
+        # El único salto de línea agregado está dentro de comillas
+        self._write("a", 'sur,10\n"oeste\ncentro",')
+        stats = self._run(steps)
+        self.assertEqual(stats["rows_in"], 1)
+
+        self._write("a", "4\n")
+        stats = self._run(steps)
+        self.assertEqual(stats["rows_in"], 1)
+        result = pd.read_csv(os.path.join(self.temp_dir, "out.csv"))
+        self.assertEqual(result["region"].tolist()[-2:], ["sur", "oeste\ncentro"])
+        self.assertEqual(result["cantidad"].tolist()[-2:], [10, 4])
+
+    def test_rewrite_triggers_full_recompute(self):
+        self._aggregate()
+        self._write("w", "region,cantidad\nnorte,1\nnorte,1\nnorte,1\nnorte,1\n")
+        stats, totals = self._aggregate()
+        self.assertEqual(stats["mode"], "full")
+        self.assertEqual(totals, {"norte": 4})
+
+    def test_rolling_continues_across_appends(self):
+        steps = [{"rolling": {"column": "cantidad", "window": 2, "func": "sum",
+                              "group_by": "region", "as": "suma"}}]
+        self._run(steps)
+        self._write("a", "sur,10\nnorte,1\n")
+        stats = self._run(steps)
+
+        self.assertEqual(stats["mode"], "incremental")
+        result = pd.read_csv(os.path.join(self.temp_dir, "out.csv"))
+        self.assertEqual(result["suma"].tolist()[-2:], [13.0, 3.0])
+
+    def test_row_wise_json_appends(self):
+        steps = [{"filter": {"column": "cantidad", "op": ">", "value": 2}}]
+        self._run(steps, "json")
+        self._write("a", "este,9\noeste,1\n")
+        stats = self._run(steps, "json")
+
+        self.assertEqual(stats["rows_out"], 1)
+        with open(os.path.join(self.temp_dir, "out.json"), "r", encoding="utf-8") as f:
+            records = json.load(f)
+        self.assertEqual([r["region"] for r in records], ["norte", "sur", "este"])
+
+
+class TestWatch(unittest.TestCase):
+    def setUp(self):
+        self.old_cwd = os.getcwd()
+        self.temp_dir = tempfile.mkdtemp()
+        os.chdir(self.temp_dir)
+        with open("ventas.csv", "w", encoding="utf-8") as f:
+            f.write("region,cantidad\nnorte,5\n")
+        with open("pipeline.yaml", "w", encoding="utf-8") as f:
+            f.write(
+                "name: watch\n"
+                "source: {type: csv, path: ventas.csv}\n"
+                "steps:\n"
+                "  - aggregate: {group_by: region, metrics: {cantidad: sum}}\n"
+                "output: {type: csv, path: out/totales.csv}\n"
+            )
+
+    def tearDown(self):
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.temp_dir)
+
+    def test_single_poll_runs_incrementally(self):
+        watch_pipeline("pipeline.yaml", iterations=1)
+        self.assertEqual(pd.read_csv("out/totales.csv")["cantidad"].tolist(), [5])
+
+        with open("ventas.csv", "a", encoding="utf-8") as f:
+            f.write("norte,4\n")
+        watch_pipeline("pipeline.yaml", iterations=1)
+        self.assertEqual(pd.read_csv("out/totales.csv")["cantidad"].tolist(), [9])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,192 @@
+import unittest
+import os
+import sys
+import tempfile
+import shutil
+
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+# Local imports
+# pylint: disable=wrong-import-position
+from dsl.dsl_engine import apply_steps, execute_dsl, plan_dsl
+from dsl.dsl_optimizer import (
+    compile_plan,
+    explain,
+    filters_first,
+    fuse_renames,
+    fuse_selects,
+    prune_dead_converts,
+    reader_dtypes,
+    required_columns,
+)
+
+
+class TestRewriteRules(unittest.TestCase):
+    def test_fuse_renames_composes_chain(self):
+        steps = [
+            {"rename_column": {"from": "a", "to": "b"}},
+            {"rename_column": {"from": "b", "to": "c"}},
+            {"rename_column": {"from": "x", "to": "y"}},
+        ]
+        self.assertEqual(fuse_renames(steps),
+                         [{"rename_column": {"mapping": {"a": "c", "x": "y"}}}])
+
+    def test_fuse_renames_drops_identity(self):
+        steps = [
+            {"rename_column": {"from": "a", "to": "b"}},
+            {"rename_column": {"from": "b", "to": "a"}},
+        ]
+        self.assertEqual(fuse_renames(steps), [])
+
+    def test_fuse_selects_only_subsets(self):
+        steps = [
+            {"select_columns": {"columns": ["a", "b", "c"]}},
+            {"select_columns": {"columns": ["a", "c"]}},
+        ]
+        self.assertEqual(fuse_selects(steps), steps[1:])
+        steps[1]["select_columns"]["columns"].append("z")
+        self.assertEqual(fuse_selects(steps), steps)
+
+    def test_filter_moves_before_other_converts(self):
+        steps = [
+            {"convert_type": {"column": "a", "to": "float"}},
+            {"convert_type": {"column": "b", "to": "float"}},
+            {"filter": {"column": "a", "op": ">", "value": 1}},
+        ]
+        reordered = filters_first(steps)
+        self.assertEqual(reordered[1], steps[2])
+        self.assertEqual(reordered[0], steps[0])
+
+    def test_prune_dead_converts(self):
+        steps = [
+            {"convert_type": {"column": "a", "to": "float"}},
+            {"convert_type": {"column": "b", "to": "str"}},
+            {"select_columns": {"columns": ["a"]}},
+        ]
+        self.assertEqual(prune_dead_converts(steps), [steps[0], steps[2]])
+
+    def test_reader_dtypes_stop_at_row_filters(self):
+        steps = [
+            {"convert_type": {"column": "a", "to": "str"}},
+            {"convert_type": {"column": "b", "to": "float"}},
+            {"filter": {"column": "a", "op": "!=", "value": "TOTAL"}},
+            {"convert_type": {"column": "c", "to": "float"}},
+        ]
+        remaining, dtypes = reader_dtypes(steps)
+        self.assertEqual(dtypes, {"b": "float64"})
+        self.assertEqual(remaining, [steps[0], steps[2], steps[3]])
+
+        steps = [{"drop_na": {"columns": ["a"]}}, {"convert_type": {"column": "b", "to": "float"}}]
+        self.assertEqual(reader_dtypes(steps), (steps, {}))
+
+    def test_required_columns_with_chained_and_swapped_renames(self):
+        chained = fuse_renames([
+            {"rename_column": {"from": "precio", "to": "precio_viejo"}},
+            {"rename_column": {"from": "precio_nuevo", "to": "precio"}},
+            {"select_columns": {"columns": ["precio_viejo", "precio"]}},
+        ])
+        self.assertEqual(required_columns(chained), {"precio", "precio_nuevo"})
+
+        swapped = fuse_renames([
+            {"rename_column": {"from": "a", "to": "t"}},
+            {"rename_column": {"from": "b", "to": "a"}},
+            {"rename_column": {"from": "t", "to": "b"}},
+            {"select_columns": {"columns": ["a"]}},
+        ])
+        self.assertEqual(required_columns(swapped), {"b"})
+
+
+class TestOptimizedExecution(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.csv_path = os.path.join(self.temp_dir, "datos.csv")
+        pd.DataFrame({
+            "id": range(200),
+            "region": ["norte", "sur"] * 100,
+            "cantidad": [i % 9 for i in range(200)],
+            "precio": [i * 1.5 for i in range(200)],
+            "nota": ["texto"] * 200,
+        }).to_csv(self.csv_path, index=False)
+        self.dsl = {
+            "name": "optimizable",
+            "source": {"type": "csv", "path": self.csv_path},
+            "steps": [
+                {"convert_type": {"column": "nota", "to": "str"}},
+                {"convert_type": {"column": "precio", "to": "float"}},
+                {"convert_type": {"column": "id", "to": "str"}},
+                {"filter": {"column": "cantidad", "op": ">=", "value": 4}},
+                {"rename_column": {"from": "precio", "to": "importe"}},
+                {"rename_column": {"from": "importe", "to": "total"}},
+                {"select_columns": {"columns": ["region", "cantidad", "total"]}},
+            ],
+            "output": {"type": "csv", "path": os.path.join(self.temp_dir, "out.csv")},
+        }
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_plan_is_rewritten(self):
+        plan = plan_dsl(self.dsl)
+        self.assertEqual(plan.columns, {"region", "cantidad", "precio"})
+        self.assertEqual(plan.dtypes, {"precio": "float64"})
+        self.assertEqual(plan.steps[0], {"filter": {"column": "cantidad", "op": ">=", "value": 4}})
+        self.assertNotIn("convert_type", [next(iter(s)) for s in plan.steps])
+
+        text = explain(plan)
+        self.assertIn("Scan[csv", text)
+        self.assertIn("Rename[precio -> total]", text)
+        self.assertIn("projection_pushdown", text)
+
+    def test_optimized_result_matches_naive(self):
+        expected = apply_steps(pd.read_csv(self.csv_path), self.dsl["steps"])
+        for streaming in (False, True):
+            execute_dsl(self.dsl, streaming=streaming, chunk_rows=50)
+            result = pd.read_csv(self.dsl["output"]["path"])
+            pd.testing.assert_frame_equal(result, expected.reset_index(drop=True))
+
+    def test_reader_conversions_match_naive_text(self):
+        with open(self.csv_path, "w", encoding="utf-8") as f:
+            f.write("a,b\n01,1.50\n,2\n3,\n")
+        self.dsl["steps"] = [{"convert_type": {"column": "a", "to": "str"}},
+                             {"convert_type": {"column": "b", "to": "float"}}]
+        self.assertEqual(plan_dsl(self.dsl).dtypes, {"b": "float64"})
+
+        # Mismo texto de salida con el plan optimizado y con el plan sin optimizar
+        for streaming in (False, True):
+            outputs = []
+            for plan in (plan_dsl(self.dsl), compile_plan(self.dsl)):
+                execute_dsl(self.dsl, streaming=streaming, chunk_rows=2, plan=plan)
+                with open(self.dsl["output"]["path"], "r", encoding="utf-8") as f:
+                    outputs.append(f.read())
+            self.assertEqual(outputs[0], outputs[1])
+        self.assertEqual(outputs[0].splitlines()[1], "1.0,1.5")
+
+    def test_chained_renames_keep_projected_columns(self):
+        self.dsl["steps"] = [
+            {"rename_column": {"from": "precio", "to": "precio_viejo"}},
+            {"rename_column": {"from": "cantidad", "to": "precio"}},
+            {"select_columns": {"columns": ["precio_viejo", "precio"]}},
+        ]
+        expected = apply_steps(pd.read_csv(self.csv_path), self.dsl["steps"])
+        for streaming in (False, True):
+            execute_dsl(self.dsl, streaming=streaming, chunk_rows=50)
+            pd.testing.assert_frame_equal(pd.read_csv(self.dsl["output"]["path"]), expected)
+
+    def test_filter_before_convert_keeps_conversion_out_of_reader(self):
+        # La fila de totales no es numérica: sólo se puede convertir tras el filtro
+        with open(self.csv_path, "w", encoding="utf-8") as f:
+            f.write("region,precio\nnorte,1.5\nsur,2\nTOTAL,suma\n")
+        self.dsl["steps"] = [{"filter": {"column": "region", "op": "!=", "value": "TOTAL"}},
+                             {"convert_type": {"column": "precio", "to": "float"}}]
+        self.assertEqual(plan_dsl(self.dsl).dtypes, {})
+        for streaming in (False, True):
+            execute_dsl(self.dsl, streaming=streaming, chunk_rows=2)
+            result = pd.read_csv(self.dsl["output"]["path"])
+            self.assertEqual(result["precio"].tolist(), [1.5, 2.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
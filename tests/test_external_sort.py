@@ -0,0 +1,90 @@
+import unittest
+import os
+import sys
+import tempfile
+import shutil
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+# Local imports
+# pylint: disable=wrong-import-position
+import datasets
+from external_sort import external_sort
+from functions.data_ops import sort_csv
+from spill import SpillFile
+
+
+class TestExternalSort(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.spill_base = os.path.join(self.temp_dir, "spill")
+        self.csv_path = os.path.join(self.temp_dir, "ventas.csv")
+        rng = np.random.default_rng(7)
+        self.df = pd.DataFrame({
+            "id": range(2_000),
+            "region": rng.choice(["norte", "sur", "este"], 2_000),
+            "precio": np.where(rng.random(2_000) < 0.05, np.nan, rng.integers(0, 50, 2_000)),
+        })
+        self.df.to_csv(self.csv_path, index=False)
+        datasets.dataset_cache.clear()
+
+    def tearDown(self):
+        datasets.dataset_cache.clear()
+        shutil.rmtree(self.temp_dir)
+
+    def _sorted(self, by, ascending=True, **kwargs):
+        chunks = external_sort(self.csv_path, by, ascending, spill_base=self.spill_base, **kwargs)
+        return pd.concat(list(chunks), ignore_index=True)
+
+    def test_matches_stable_pandas_sort(self):
+        for by, ascending in [("precio", True), (["region", "precio"], True), ("precio", False)]:
+            expected = self.df.sort_values(by, ascending=ascending, kind="stable",
+                                           na_position="last").reset_index(drop=True)
+            result = self._sorted(by, ascending, run_rows=150, merge_rows=20)
+            pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+    def test_parallel_runs_and_cleanup(self):
+        expected = self.df.sort_values("precio", kind="stable", na_position="last")
+        result = self._sorted("precio", run_rows=300, workers=2, merge_rows=50)
+        pd.testing.assert_frame_equal(result, expected.reset_index(drop=True), check_dtype=False)
+        # Los runs se borran al terminar
+        self.assertEqual(os.listdir(self.spill_base), [])
+
+    def test_sort_csv_function(self):
+        output_path = os.path.join(self.temp_dir, "ordenado.csv")
+        result = sort_csv(self.csv_path, "precio", output_path, ascending=False, run_rows=500)
+        self.assertIn("ordenado por precio", result)
+        written = pd.read_csv(output_path)
+        self.assertEqual(len(written), len(self.df))
+        self.assertTrue(written["precio"].dropna().is_monotonic_decreasing)
+        with self.assertRaises(KeyError):
+            sort_csv(self.csv_path, "no_existe", output_path)
+
+    def test_key_with_numbers_and_text_across_runs(self):
+        # Los primeros runs sólo ven números; los últimos, texto
+        with open(self.csv_path, "w", encoding="utf-8") as f:
+            f.write("codigo,nota\n")
+            f.writelines(f"{i},n{i}\n" for i in range(30, 0, -1))
+            f.write("A7,a\nB2,b\n10,c\n,d\n")
+        for workers in (1, 2):
+            expected = pd.read_csv(self.csv_path).sort_values(
+                "codigo", kind="stable", na_position="last").reset_index(drop=True)
+            result = self._sorted("codigo", run_rows=10, merge_rows=4, workers=workers)
+            pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+            self.assertEqual(result["codigo"].tolist()[:3], ["1", "10", "10"])
+
+    def test_spill_file_roundtrip(self):
+        spill = SpillFile(os.path.join(self.temp_dir, "parte.pkl"))
+        spill.write(self.df.iloc[:10])
+        spill.write(self.df.iloc[10:25])
+        batches = list(spill.read())
+        self.assertEqual([len(batch) for batch in batches], [10, 15])
+        self.assertEqual(spill.rows, 25)
+
+
+if __name__ == '__main__':
+    unittest.main()
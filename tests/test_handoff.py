@@ -0,0 +1,52 @@
+import unittest
+import json
+import os
+import sys
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+# Local imports
+# pylint: disable=wrong-import-position
+from pipeline_fixtures import STEPS, PipelineDirTestCase
+import datasets
+from runner import find_handoff_paths, run_pipeline
+
+
+class TestHandoffDetection(unittest.TestCase):
+    def test_chain_is_kept_in_memory(self):
+        self.assertEqual(find_handoff_paths(STEPS), {"out/filtradas.csv"})
+
+    def test_materialize_disables_handoff(self):
+        self.assertEqual(find_handoff_paths(STEPS, materialize_all=True), set())
+        steps = [dict(STEPS[0], materialize=True), STEPS[1]]
+        self.assertEqual(find_handoff_paths(steps), set())
+
+    def test_non_dataset_consumer_forces_disk(self):
+        steps = STEPS + [{"action": "list_files", "path": "out/filtradas.csv"}]
+        self.assertEqual(find_handoff_paths(steps), set())
+
+    def test_final_output_is_not_intermediate(self):
+        self.assertEqual(find_handoff_paths(STEPS[:1]), set())
+
+
+class TestHandoffExecution(PipelineDirTestCase):
+    PIPELINE_NAME = "handoff"
+
+    def test_intermediate_not_written(self):
+        datasets.reset_io_stats()
+        run_pipeline("pipeline.yaml", force=True)
+
+        self.assertFalse(os.path.exists("out/filtradas.csv"))
+        self.assertEqual(datasets.io_stats["memory_reads"], 1)
+        with open("out/filtradas.json", "r", encoding="utf-8") as f:
+            records = json.load(f)
+        self.assertEqual([r["Producto"] for r in records], ["Naranjas", "Bananas"])
+
+    def test_materialize_writes_intermediate(self):
+        run_pipeline("pipeline.yaml", force=True, materialize=True)
+        self.assertTrue(os.path.exists("out/filtradas.csv"))
+
+
+if __name__ == '__main__':
+    unittest.main()
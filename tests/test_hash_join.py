@@ -0,0 +1,101 @@
+import unittest
+import os
+import sys
+import tempfile
+import shutil
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+# Local imports
+# pylint: disable=wrong-import-position
+import datasets
+from functions.data_ops import join_csv
+from hash_join import HashTable, hash_join
+
+
+class TestHashJoin(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.spill_base = os.path.join(self.temp_dir, "spill")
+        rng = np.random.default_rng(3)
+        self.ventas = pd.DataFrame({
+            "cliente": rng.integers(0, 60, 1_500),
+            "canal": rng.choice(["web", "local"], 1_500),
+            "monto": rng.integers(1, 100, 1_500),
+        })
+        self.clientes = pd.DataFrame({
+            "cliente": np.arange(30, 90).repeat(2),
+            "canal": ["web", "local"] * 60,
+            "monto": rng.integers(1, 10, 120),
+            "nombre": [f"c{i}" for i in range(120)],
+        })
+        self.ventas_path = os.path.join(self.temp_dir, "ventas.csv")
+        self.clientes_path = os.path.join(self.temp_dir, "clientes.csv")
+        self.ventas.to_csv(self.ventas_path, index=False)
+        self.clientes.to_csv(self.clientes_path, index=False)
+        datasets.dataset_cache.clear()
+
+    def tearDown(self):
+        datasets.dataset_cache.clear()
+        shutil.rmtree(self.temp_dir)
+
+    def _assert_like_merge(self, left, right, on, how, **kwargs):
+        expected = pd.merge(pd.read_csv(left), pd.read_csv(right), on=on, how=how)
+        chunks = hash_join(left, right, on, how, spill_base=self.spill_base, **kwargs)
+        result = pd.concat(list(chunks), ignore_index=True)
+        self.assertEqual(list(result.columns), list(expected.columns))
+        columns = list(expected.columns)
+        pd.testing.assert_frame_equal(
+            result.sort_values(columns).reset_index(drop=True),
+            expected.sort_values(columns).reset_index(drop=True), check_dtype=False)
+
+    def test_matches_pandas_merge_in_memory(self):
+        # El lado chico es el build tanto si está a la izquierda como a la derecha
+        for left, right in [(self.ventas_path, self.clientes_path),
+                            (self.clientes_path, self.ventas_path)]:
+            for how in ("inner", "left", "right", "outer"):
+                self._assert_like_merge(left, right, "cliente", how, chunk_rows=200)
+
+    def test_grace_partitions_match_pandas_merge(self):
+        # Un presupuesto ínfimo obliga a particionar a disco
+        for how in ("inner", "outer"):
+            self._assert_like_merge(self.ventas_path, self.clientes_path, ["cliente", "canal"],
+                                    how, memory_mb=0.001, chunk_rows=300)
+        self.assertEqual(os.listdir(self.spill_base), [])
+
+    def test_hash_table_probe_with_duplicate_keys(self):
+        table = HashTable(pd.DataFrame({"k": [1, 2, 2], "v": ["a", "b", "c"]}), ["k"])
+        probe_rows, build_rows = table.probe(pd.DataFrame({"k": [2, 3, 1]}), keep_unmatched=True)
+        self.assertEqual(probe_rows["k"].tolist(), [2, 2, 3, 1])
+        self.assertEqual(build_rows["v"].tolist()[:2], ["b", "c"])
+        self.assertTrue(pd.isna(build_rows["v"].iloc[2]))
+        self.assertTrue(table.unmatched().empty)
+
+    def test_join_csv_function(self):
+        output_path = os.path.join(self.temp_dir, "unido.csv")
+        result = join_csv(self.ventas_path, self.clientes_path, "cliente", output_path,
+                          how="left", chunk_rows=400)
+        self.assertIn("left por cliente", result)
+        written = pd.read_csv(output_path)
+        self.assertEqual(len(written), len(pd.merge(self.ventas, self.clientes, on="cliente",
+                                                    how="left")))
+        self.assertIn("nombre", written.columns)
+
+        # Sin filas en común la salida conserva el encabezado
+        pd.DataFrame({"cliente": [999], "nombre": ["x"]}).to_csv(self.clientes_path, index=False)
+        join_csv(self.ventas_path, self.clientes_path, "cliente", output_path)
+        self.assertEqual(list(pd.read_csv(output_path).columns), ["cliente", "canal", "monto",
+                                                                   "nombre"])
+
+        with self.assertRaises(KeyError):
+            join_csv(self.ventas_path, self.clientes_path, "no_existe", output_path)
+        with self.assertRaises(ValueError):
+            join_csv(self.ventas_path, self.clientes_path, "cliente", output_path, how="cross")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+import json
+import os
+import sys
+import tempfile
+import shutil
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+# Local imports
+# pylint: disable=wrong-import-position
+import datasets
+from core.plugins.data_analyzer.plugin import DataAnalyzerPlugin
+from outliers import find_outliers, frame_bounds, streaming_bounds
+from registry import get_function
+
+
+def _chunks(df, size):
+    return (df.iloc[i:i + size] for i in range(0, len(df), size))
+
+
+class TestOutliers(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        rng = np.random.default_rng(11)
+        self.df = pd.DataFrame({
+            "precio": rng.normal(100, 10, 5_000),
+            "cantidad": rng.integers(0, 50, 5_000),
+            "region": rng.choice(["norte", "sur"], 5_000),
+            "activo": rng.random(5_000) < 0.5,
+        })
+        self.df.loc[[3, 40], "precio"] = [500.0, -300.0]
+        self.df.loc[7, "cantidad"] = 10_000
+        self.df.loc[::50, "precio"] = np.nan
+        self.csv_path = os.path.join(self.temp_dir, "ventas.csv")
+        self.df.to_csv(self.csv_path, index=False)
+        datasets.dataset_cache.clear()
+
+    def tearDown(self):
+        datasets.dataset_cache.clear()
+        shutil.rmtree(self.temp_dir)
+
+    def _pandas_outliers(self, column, method):
+        values = self.df[column]
+        if method == "iqr":
+            q1, q3 = values.quantile(0.25), values.quantile(0.75)
+            low, high = q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
+        else:
+            low, high = values.mean() - 3 * values.std(), values.mean() + 3 * values.std()
+        return int(((values < low) | (values > high)).sum())
+
+    def test_all_columns_match_per_column_pandas(self):
+        for method in ("iqr", "zscore"):
+            summary = find_outliers([self.df], frame_bounds(self.df, method))
+            self.assertEqual(list(summary), ["precio", "cantidad"])
+            for column, info in summary.items():
+                self.assertEqual(info["atipicos"],
+                                 self._pandas_outliers(column, method), (column, method))
+        self.assertEqual(summary["precio"]["valores"], self.df["precio"].count())
+        self.assertEqual(summary["precio"]["ejemplos"][:2],
+                         [{"fila": 3, "valor": 500.0}, {"fila": 40, "valor": -300.0}])
+
+    def test_streaming_matches_in_memory(self):
+        exact = find_outliers([self.df], frame_bounds(self.df, "iqr"))
+        bounds = streaming_bounds(_chunks(self.df, 700), "iqr", sketch_k=256)
+        approx = find_outliers(_chunks(self.df, 700), bounds)
+        for column, info in exact.items():
+            spread = info["q3"] - info["q1"]
+            self.assertAlmostEqual(approx[column]["q1"], info["q1"], delta=0.05 * spread)
+            self.assertAlmostEqual(approx[column]["media"], info["media"], places=9)
+            self.assertLessEqual(abs(approx[column]["atipicos"] - info["atipicos"]), 5)
+        # Las posiciones de fila siguen el archivo a través de los chunks
+        self.assertIn({"fila": 7, "valor": 10_000.0}, approx["cantidad"]["ejemplos"])
+
+    def test_invalid_method(self):
+        with self.assertRaises(ValueError):
+            frame_bounds(self.df, "mad")
+
+    def test_detect_outliers_all_function(self):
+        DataAnalyzerPlugin().register_functions()
+        detect = get_function("detect_outliers_all")["function"]
+        output_path = os.path.join(self.temp_dir, "atipicos.json")
+        for streaming in (False, True):
+            result = detect(self.csv_path, output_path, method="zscore", streaming=streaming,
+                            chunk_rows=1_000)
+            self.assertIn("cantidad: 1 de 5000", result)
+            with open(output_path, "r", encoding="utf-8") as f:
+                summary = json.load(f)
+            self.assertEqual(summary["precio"]["atipicos"], self._pandas_outliers("precio",
+                                                                                  "zscore"))
+
+        self.assertIn("Detectados", get_function("detect_outliers")["function"](
+            self.csv_path, "cantidad"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+import json
+import os
+import sys
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+# Local imports
+# pylint: disable=wrong-import-position
+from pipeline_fixtures import PipelineDirTestCase
+from profiler import StepProfiler, trace_path_for
+from runner import run_pipeline
+
+
+class TestStepProfiler(unittest.TestCase):
+    def test_disabled_records_nothing(self):
+        profiler = StepProfiler("p", enabled=False)
+        with profiler.step("paso"):
+            pass
+        self.assertEqual(profiler.records, [])
+
+    def test_records_metrics_and_trace(self):
+        profiler = StepProfiler("p")
+        with profiler.step("paso") as record:
+            record["rows_in"] = 5
+            buffer = [0] * 100_000
+            del buffer
+
+        step = profiler.report()["steps"][0]
+        self.assertEqual(step["rows_in"], 5)
+        self.assertGreater(step["peak_mb"], 0)
+        for key in ("wall_s", "cpu_s", "rows_out", "bytes_read", "bytes_written"):
+            self.assertIn(key, step)
+
+        events = profiler.chrome_trace()["traceEvents"]
+        self.assertEqual(events[0]["ph"], "X")
+        self.assertEqual(events[0]["name"], "paso")
+
+
+class TestRunnerProfile(PipelineDirTestCase):
+    PIPELINE_NAME = "perfil"
+
+    def test_writes_report_and_trace(self):
+        run_pipeline("pipeline.yaml", force=True, profile="perfil/reporte.json")
+
+        with open("perfil/reporte.json", "r", encoding="utf-8") as f:
+            report = json.load(f)
+        self.assertEqual(report["pipeline"], "perfil")
+        first, second = report["steps"]
+        self.assertEqual((first["rows_in"], first["rows_out"]), (3, 2))
+        self.assertEqual(first["bytes_read"], os.path.getsize("ventas.csv"))
+        # El intermedio pasa en memoria: el segundo paso no lee nada de disco
+        self.assertEqual(second["bytes_read"], 0)
+        self.assertEqual(second["bytes_written"], os.path.getsize("out/filtradas.json"))
+
+        with open(trace_path_for("perfil/reporte.json"), "r", encoding="utf-8") as f:
+            trace = json.load(f)
+        self.assertEqual(len([e for e in trace["traceEvents"] if e["ph"] == "X"]), 2)
+
+    def test_cached_dataset_reads_no_bytes(self):
+        run_pipeline("pipeline.yaml", force=True)
+        # Mismo proceso y mismo archivo: la lectura sale de la cache en memoria
+        run_pipeline("pipeline.yaml", force=True, profile="perfil/reporte.json")
+
+        with open("perfil/reporte.json", "r", encoding="utf-8") as f:
+            first = json.load(f)["steps"][0]
+        self.assertEqual(first["rows_in"], 3)
+        self.assertEqual(first["bytes_read"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+from unittest.mock import patch
+import os
+import sys
+import sqlite3
+import tempfile
+import shutil
+
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+# Local imports
+# pylint: disable=wrong-import-position
+import datasets
+import sql_tables
+from functions.data_ops import query_data
+from sql_tables import SQLTables, filtered_columns, table_name, table_names
+
+
+class TestQueryData(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.ventas = os.path.join(self.temp_dir, "ventas.csv")
+        self.regiones = os.path.join(self.temp_dir, "regiones.csv")
+        pd.DataFrame({"id": range(6), "region": ["norte", "sur", "norte", "este", "sur", None],
+                      "precio": [10.0, 20.0, 30.0, None, 50.0, 60.0]}).to_csv(
+                          self.ventas, index=False)
+        pd.DataFrame({"region": ["norte", "sur", "este"],
+                      "gerente": ["Ana", "Luis", "Sol"]}).to_csv(self.regiones, index=False)
+        self.db_path = os.path.join(self.temp_dir, "query.db")
+        self.tables = SQLTables(db_path=self.db_path, chunk_rows=2)
+        datasets.dataset_cache.clear()
+
+    def tearDown(self):
+        datasets.dataset_cache.clear()
+        shutil.rmtree(self.temp_dir)
+
+    def test_join_across_files(self):
+        df = self.tables.query(
+            "SELECT r.gerente, SUM(v.precio) AS total FROM ventas v "
+            "JOIN regiones r ON v.region = r.region GROUP BY r.gerente ORDER BY r.gerente",
+            [self.ventas, self.regiones])
+        self.assertEqual(df["gerente"].tolist(), ["Ana", "Luis", "Sol"])
+        self.assertEqual(df["total"].tolist()[:2], [40.0, 70.0])
+        self.assertTrue(pd.isna(df["total"][2]))
+
+    def test_tables_are_reused_until_the_file_changes(self):
+        query = "SELECT COUNT(*) AS n FROM ventas WHERE region = 'norte'"
+        self.assertEqual(self.tables.query(query, [self.ventas])["n"][0], 2)
+        self.assertEqual(self.tables.query(query, [self.ventas])["n"][0], 2)
+        self.assertEqual((self.tables.loads, self.tables.reuses), (1, 1))
+
+        with sqlite3.connect(self.db_path) as conn:
+            indexes = conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'ventas'")
+            self.assertEqual([row[0] for row in indexes], ["ix_ventas_region"])
+
+        pd.DataFrame({"id": [1], "region": ["norte"], "precio": [1.0]}).to_csv(
+            self.ventas, index=False)
+        self.assertEqual(self.tables.query(query, [self.ventas])["n"][0], 1)
+        self.assertEqual(self.tables.loads, 2)
+
+    def test_only_read_queries(self):
+        with self.assertRaises(ValueError):
+            self.tables.query("DROP TABLE ventas", [self.ventas])
+        with self.assertRaises(pd.errors.DatabaseError):
+            self.tables.query("WITH x AS (SELECT 1) DELETE FROM ventas", [self.ventas])
+
+    def test_query_data_writes_output(self):
+        output_path = os.path.join(self.temp_dir, "norte.csv")
+        with patch.object(sql_tables, "query_tables", self.tables):
+            result = query_data(f"{self.ventas},{self.regiones}",
+                                "SELECT id FROM ventas WHERE precio > 25", output_path)
+        self.assertTrue(result.startswith("Consulta sobre ventas, regiones: 3 filas"))
+        self.assertEqual(pd.read_csv(output_path)["id"].tolist(), [2, 4, 5])
+
+        in_memory = query_data([self.ventas], "SELECT COUNT(*) AS n FROM ventas", cache=False)
+        self.assertIn("6", in_memory)
+
+    def test_same_table_name_is_rejected(self):
+        other_dir = os.path.join(self.temp_dir, "otro")
+        os.makedirs(other_dir)
+        for other in ("ventas.csv", "Ventas.csv", "ventas.parquet"):
+            other = os.path.join(other_dir, other)
+            with self.assertRaises(ValueError):
+                self.tables.query("SELECT * FROM ventas", [self.ventas, other])
+        self.assertEqual(self.tables.loads, 0)
+        self.assertEqual(table_names([self.ventas, self.ventas, self.regiones]),
+                         ["ventas", "ventas", "regiones"])
+
+    def test_helpers(self):
+        self.assertEqual(table_name("data/2024-ventas.csv"), "t_2024_ventas")
+        self.assertEqual(
+            filtered_columns("SELECT a FROM t JOIN u ON t.k = u.k "
+                             "WHERE \"b c\" > 1 AND d = 'e' GROUP BY a"),
+            {"t", "k", "u", "b c", "d", "AND"})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import unittest
+from unittest.mock import patch
+import os
+import sys
+import tempfile
+import shutil
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+# Local imports
+# pylint: disable=wrong-import-position
+import datasets
+import dispatcher
+from core.plugins.data_analyzer.plugin import DataAnalyzerPlugin
+from registry import register_function
+from result_cache import ResultCache
+
+CALLS = []
+
+
+@register_function(
+    name="_contar_filas_test",
+    description="Cuenta filas (función pura de prueba)",
+    argument_types={"input_path": "str", "output_path": "str"},
+    pure=True
+)
+def _contar_filas_test(input_path, output_path):
+    CALLS.append(input_path)
+    with open(input_path, "r", encoding="utf-8") as f:
+        rows = len(f.read().splitlines()) - 1
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(str(rows))
+    return f"{rows} filas"
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        # El dispatcher normaliza rutas a relativas: trabajar dentro del temp dir
+        self.old_cwd = os.getcwd()
+        self.temp_dir = tempfile.mkdtemp()
+        os.chdir(self.temp_dir)
+        self.cache = ResultCache(db_path="results.db")
+        self.input_path = "ventas.csv"
+        self.output_path = "conteo.txt"
+        self._write(self.input_path, "a,b\n1,2\n3,4\n")
+        self.args = {"input_path": self.input_path, "output_path": self.output_path}
+        CALLS.clear()
+
+    def tearDown(self):
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.temp_dir)
+
+    @staticmethod
+    def _write(path, content):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+
+    def test_store_lookup_and_restore_output(self):
+        self.assertIsNone(self.cache.lookup("f", self.args))
+        self._write(self.output_path, "2")
+        self.assertTrue(self.cache.store("f", self.args, "2 filas"))
+
+        os.remove(self.output_path)
+        self.assertEqual(self.cache.lookup("f", self.args), "2 filas")
+        with open(self.output_path, "r", encoding="utf-8") as f:
+            self.assertEqual(f.read(), "2")
+
+    def test_input_change_misses_and_eviction(self):
+        self._write(self.output_path, "2")
+        self.cache.store("f", self.args, "2 filas")
+        self._write(self.input_path, "a,b\n1,2\n")
+        self.assertIsNone(self.cache.lookup("f", self.args))
+
+        self.cache.max_bytes = 1
+        self.assertFalse(self.cache.store("f", self.args, "1 fila"))
+
+    def test_dispatch_marks_hits_and_respects_use_cache(self):
+        with patch.object(dispatcher, "result_cache", self.cache):
+            first = dispatcher.dispatch("_contar_filas_test", dict(self.args))
+            second = dispatcher.dispatch("_contar_filas_test", dict(self.args))
+            forced = dispatcher.dispatch("_contar_filas_test", dict(self.args), use_cache=False)
+
+        self.assertEqual(first, "[OK] 2 filas")
+        self.assertEqual(second, "[OK] (cache) 2 filas")
+        self.assertEqual(forced, "[OK] 2 filas")
+        self.assertEqual(len(CALLS), 2)
+
+    def test_in_memory_inputs_are_not_cached(self):
+        with patch.object(dispatcher, "result_cache", self.cache), \
+                datasets.handoff([self.input_path]):
+            dispatcher.dispatch("_contar_filas_test", dict(self.args))
+            result = dispatcher.dispatch("_contar_filas_test", dict(self.args))
+        self.assertEqual(result, "[OK] 2 filas")
+        self.assertEqual(len(CALLS), 2)
+
+    def test_declared_outputs_are_restored(self):
+        # correlation_matrix escribe <output_path>_correlation.json/.png, no output_path
+        DataAnalyzerPlugin().register_functions()
+        self._write(self.input_path, "a,b\n1,2\n3,5\n4,4\n")
+        args = {"csv_path": self.input_path, "output_path": "out/ventas"}
+        written = ["out/ventas_correlation.json", "out/ventas_correlation.png"]
+        with patch.object(dispatcher, "result_cache", self.cache):
+            first = dispatcher.dispatch("correlation_matrix", dict(args))
+            for path in written:
+                os.remove(path)
+            second = dispatcher.dispatch("correlation_matrix", dict(args))
+
+        self.assertTrue(first.startswith("[OK] Matriz"), first)
+        self.assertTrue(second.startswith("[OK] (cache)"), second)
+        self.assertTrue(all(os.path.exists(path) for path in written))
+
+
+if __name__ == '__main__':
+    unittest.main()
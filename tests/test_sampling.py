@@ -0,0 +1,94 @@
+import unittest
+from unittest.mock import patch
+import os
+import sys
+import json
+import tempfile
+import shutil
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+# Local imports
+# pylint: disable=wrong-import-position
+import datasets
+import sampling
+from core.plugins.data_analyzer.plugin import DataAnalyzerPlugin
+from functions.data_ops import analyze_data
+from registry import get_function
+
+
+class TestSampling(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.csv_path = os.path.join(self.temp_dir, "ventas.csv")
+        rng = np.random.default_rng(1)
+        self.df = pd.DataFrame({
+            "id": range(20_000),
+            "nota": ['dice "hola"\ny chau' if i % 97 == 0 else "ok" for i in range(20_000)],
+            "precio": rng.normal(100, 10, 20_000),
+        })
+        self.df.to_csv(self.csv_path, index=False)
+        self.index = sampling.RowIndex(cache_dir=os.path.join(self.temp_dir, "offsets"),
+                                       block_rows=100)
+        datasets.dataset_cache.clear()
+
+    def tearDown(self):
+        datasets.dataset_cache.clear()
+        shutil.rmtree(self.temp_dir)
+
+    def test_reservoir_is_uniform_size_and_deterministic(self):
+        chunks = (self.df.iloc[i:i + 3_000] for i in range(0, len(self.df), 3_000))
+        sample, total = sampling.reservoir_sample(chunks, 2_000, seed=3)
+        self.assertEqual(total, len(self.df))
+        self.assertEqual(len(sample), 2_000)
+        self.assertTrue(sample.index.is_unique)
+        pd.testing.assert_frame_equal(sample, self.df.loc[sample.index])
+        # Filas de todo el archivo, no sólo del principio
+        self.assertGreater(sample.index.max(), 18_000)
+
+        again, _ = sampling.reservoir_sample([self.df], 2_000, seed=3)
+        pd.testing.assert_index_equal(again.index, sample.index)
+
+    def test_block_sample_reads_the_right_rows(self):
+        drawn = sampling.block_sample(self.csv_path, 1_000, index=self.index)
+        self.assertEqual(drawn.size, 1_000)
+        self.assertEqual(drawn.total_rows, len(self.df))
+        pd.testing.assert_frame_equal(drawn.df, self.df.loc[drawn.df.index])
+
+    def test_error_bounds_cover_true_mean(self):
+        with patch.object(sampling, "row_index", self.index):
+            for method in ("blocks", "reservoir"):
+                drawn = sampling.sample_dataset(self.csv_path, 2_000, method)
+                error = drawn.mean_error(drawn.df["precio"])
+                self.assertLess(abs(drawn.df["precio"].mean() - self.df["precio"].mean()),
+                                error, method)
+                low, high = drawn.quantile_bounds(drawn.df["precio"], 0.5)
+                self.assertLess(low, self.df["precio"].median())
+                self.assertGreater(high, self.df["precio"].median())
+
+        whole = sampling.sample_dataset(self.csv_path, 50_000, "reservoir")
+        self.assertEqual(whole.mean_error(whole.df["precio"]), 0)
+
+    def test_functions_report_sample(self):
+        output_path = os.path.join(self.temp_dir, "analisis.json")
+        with patch.object(sampling, "row_index", self.index):
+            message = analyze_data(self.csv_path, output_path, sample=1_000)
+            DataAnalyzerPlugin().register_functions()
+            outliers = get_function("detect_outliers")["function"](
+                self.csv_path, "precio", sample=1_000)
+
+        self.assertIn("muestra de 1,000 de 20,000 filas (blocks)", message)
+        with open(output_path, "r", encoding="utf-8") as f:
+            analysis = json.load(f)
+        self.assertEqual(analysis["total_filas"], 20_000)
+        self.assertEqual(analysis["muestra"]["filas_muestra"], 1_000)
+        self.assertGreater(analysis["muestra"]["error_media"]["precio"], 0)
+        self.assertIn("Estimación sobre muestra de 1,000", outliers)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+from unittest.mock import patch
+import os
+import sys
+import tempfile
+import shutil
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+# Local imports
+# pylint: disable=wrong-import-position
+import datasets
+from schemas import SchemaCache, downcast_numeric
+
+
+class TestDowncast(unittest.TestCase):
+    def test_values_are_preserved(self):
+        df = pd.DataFrame({"chico": [1, 2, 3], "grande": [1, 2, 10 ** 12],
+                           "mitades": [0.5, 1.5, np.nan], "precio": [0.1, 0.2, 0.3]})
+        result = downcast_numeric(df)
+        self.assertEqual(result["chico"].dtype, np.int8)
+        self.assertEqual(result["grande"].dtype, np.int64)
+        self.assertEqual(result["mitades"].dtype, np.float32)
+        self.assertEqual(result["precio"].dtype, np.float64)
+        pd.testing.assert_frame_equal(result, df, check_dtype=False)
+
+
+class TestSchemaCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = SchemaCache(cache_dir=os.path.join(self.temp_dir, "schemas"),
+                                 sample_rows=10, min_mb=0)
+        self.csv_path = os.path.join(self.temp_dir, "ventas.csv")
+        self.df = pd.DataFrame({
+            "region": ["norte", "sur", "este"] * 10,
+            "codigo": [f"c{i}" for i in range(30)],
+            "cantidad": [1] * 29 + [100_000],
+            "precio": [1.25, 2.5, 3.75] * 10,
+        })
+        self.df.to_csv(self.csv_path, index=False)
+        datasets.dataset_cache.clear()
+
+    def tearDown(self):
+        datasets.dataset_cache.clear()
+        shutil.rmtree(self.temp_dir)
+
+    def test_infer_on_sample(self):
+        schema = self.cache.infer(self.csv_path)
+        self.assertEqual(schema["dtype"], {"region": "category"})
+
+    def test_load_downcasts_safely_and_reuses_schema(self):
+        df, schema = self.cache.load(self.csv_path)
+        # El valor grande está fuera de la muestra: no debe desbordar
+        self.assertEqual(df["cantidad"].dtype, np.int32)
+        self.assertEqual(df["cantidad"].max(), 100_000)
+        self.assertTrue(schema["verified"])
+        self.assertLess(schema["memory"]["bytes"], schema["memory"]["bytes_default"])
+
+        again, _ = self.cache.load(self.csv_path)
+        pd.testing.assert_frame_equal(again, df)
+        pd.testing.assert_frame_equal(df, self.df, check_dtype=False, check_categorical=False)
+
+        self.df.assign(cantidad=self.df["cantidad"] * 100_000).to_csv(self.csv_path, index=False)
+        self.assertIsNone(self.cache.cached(self.csv_path))
+        changed, _ = self.cache.load(self.csv_path)
+        self.assertEqual(changed["cantidad"].max(), 10 ** 10)
+
+    def test_datasets_reports_memory_saved(self):
+        with patch.object(datasets, "schema_cache", self.cache), \
+                patch.object(datasets.sidecar_cache, "min_bytes", 10 ** 12):
+            df = datasets.load_dataset(self.csv_path)
+        self.assertIsInstance(df["region"].dtype, pd.CategoricalDtype)
+        memory = datasets.memory_saved(self.csv_path)
+        self.assertGreater(memory["bytes_default"], memory["bytes"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+from unittest.mock import patch
+import importlib.util
+import os
+import sys
+import tempfile
+import shutil
+
+import pandas as pd
+
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+# Local imports
+# pylint: disable=wrong-import-position
+import datasets
+from sidecar import SidecarCache
+
+
+@unittest.skipUnless(HAS_PYARROW, "pyarrow no instalado")
+class TestSidecarCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = SidecarCache(cache_dir=os.path.join(self.temp_dir, "cache"), min_mb=0)
+        self.csv_path = os.path.join(self.temp_dir, "ventas.csv")
+        self.df = pd.DataFrame({"region": ["norte", "sur", None] * 10,
+                                "cantidad": range(30), "precio": [1.5, None, 2.25] * 10})
+        self.df.to_csv(self.csv_path, index=False)
+        datasets.dataset_cache.clear()
+
+    def tearDown(self):
+        datasets.dataset_cache.clear()
+        shutil.rmtree(self.temp_dir)
+
+    def test_roundtrip_and_invalidation(self):
+        self.assertIsNone(self.cache.load(self.csv_path))
+        self.assertTrue(self.cache.store(self.csv_path, pd.read_csv(self.csv_path)))
+        pd.testing.assert_frame_equal(self.cache.load(self.csv_path), pd.read_csv(self.csv_path))
+
+        with open(self.csv_path, "a", encoding="utf-8") as f:
+            f.write("este,99,3.0\n")
+        self.assertIsNone(self.cache.load(self.csv_path))
+        self.assertEqual(self.cache.entries(), [])
+
+    def test_small_files_and_size_cap(self):
+        self.cache.min_bytes = 10 ** 9
+        self.assertFalse(self.cache.store(self.csv_path, self.df))
+
+        self.cache.min_bytes = 0
+        self.cache.max_bytes = 1
+        self.cache.store(self.csv_path, self.df)
+        self.assertEqual(self.cache.entries(), [])
+
+    def test_datasets_reads_through_sidecar(self):
+        with patch.object(datasets, "sidecar_cache", self.cache):
+            datasets.reset_io_stats()
+            first = datasets.load_dataset(self.csv_path)
+
+            # Otro proceso: sin la cache en memoria, pero con la copia en disco
+            datasets.dataset_cache.clear()
+            second = datasets.load_dataset(self.csv_path)
+            datasets.dataset_cache.clear()
+            chunks = list(datasets.iter_dataset(self.csv_path, chunk_rows=10))
+
+        pd.testing.assert_frame_equal(first, second)
+        pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), first)
+        self.assertEqual(datasets.io_stats["reads"], 1)
+        self.assertEqual(datasets.io_stats["sidecar_reads"], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
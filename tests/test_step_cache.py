@@ -0,0 +1,101 @@
+import unittest
+from unittest.mock import patch
+import os
+import sys
+import tempfile
+import shutil
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+# Local imports
+# pylint: disable=wrong-import-position
+from step_cache import StepCache, step_io
+import runner
+
+
+class TestStepCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = StepCache(cache_dir=os.path.join(self.temp_dir, "cache"))
+        self.input_path = os.path.join(self.temp_dir, "in.csv")
+        self.output_path = os.path.join(self.temp_dir, "out.json")
+        self._write(self.input_path, "a,b\n1,2\n")
+        self._write(self.output_path, "[{\"a\": 1}]")
+        self.spec = {"action": "convert", "input": self.input_path}
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    @staticmethod
+    def _write(path, content):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+
+    def test_step_io(self):
+        inputs, outputs = step_io({"input": self.input_path, "output": self.output_path,
+                                   "chart_type": "bar"})
+        self.assertEqual(len(inputs), 1)
+        self.assertEqual(len(outputs), 1)
+
+    def test_hit_restores_missing_output(self):
+        inputs, outputs = [self.input_path], [self.output_path]
+        self.assertIsNone(self.cache.lookup(self.spec, inputs, outputs))
+        self.assertTrue(self.cache.store(self.spec, inputs, outputs, "[OK] listo"))
+
+        os.remove(self.output_path)
+        meta = self.cache.lookup(self.spec, inputs, outputs)
+        self.assertEqual(meta["result"], "[OK] listo")
+        with open(self.output_path, "r", encoding="utf-8") as f:
+            self.assertEqual(f.read(), "[{\"a\": 1}]")
+
+    def test_input_change_or_spec_change_misses(self):
+        inputs, outputs = [self.input_path], [self.output_path]
+        self.cache.store(self.spec, inputs, outputs, "[OK]")
+
+        self.assertIsNone(self.cache.lookup({**self.spec, "extra": 1}, inputs, outputs))
+        self._write(self.input_path, "a,b\n1,2\n3,4\n")
+        self.assertIsNone(self.cache.lookup(self.spec, inputs, outputs))
+
+    def test_lru_eviction(self):
+        self.cache.max_bytes = 1
+        inputs, outputs = [self.input_path], [self.output_path]
+        self.cache.store(self.spec, inputs, outputs, "[OK]")
+        self.assertEqual(self.cache.entries(), [])
+
+
+class TestRunnerCache(unittest.TestCase):
+    def setUp(self):
+        # El dispatcher normaliza rutas a relativas: trabajar dentro del temp dir
+        self.old_cwd = os.getcwd()
+        self.temp_dir = tempfile.mkdtemp()
+        os.chdir(self.temp_dir)
+        self.pipeline_path = "pipeline.yaml"
+        with open("ventas.csv", "w", encoding="utf-8") as f:
+            f.write("Producto,Cantidad\nManzanas,10\n")
+        with open(self.pipeline_path, "w", encoding="utf-8") as f:
+            f.write(
+                "pipeline:\n"
+                "  name: cache_test\n"
+                "  steps:\n"
+                "    - action: convert_csv_to_json\n"
+                "      input: ventas.csv\n"
+                "      output: out/ventas.json\n"
+            )
+
+    def tearDown(self):
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.temp_dir)
+
+    def test_second_run_skips_dispatch_unless_forced(self):
+        with patch("runner.dispatch", wraps=runner.dispatch) as mock_dispatch:
+            runner.run_pipeline(self.pipeline_path)
+            runner.run_pipeline(self.pipeline_path)
+            self.assertEqual(mock_dispatch.call_count, 1)
+
+            runner.run_pipeline(self.pipeline_path, force=True)
+            self.assertEqual(mock_dispatch.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
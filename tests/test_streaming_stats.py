@@ -0,0 +1,126 @@
+import unittest
+import json
+import os
+import sys
+import tempfile
+import shutil
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+# Local imports
+# pylint: disable=wrong-import-position
+from functions.data_ops import analyze_data
+from streaming_stats import QuantileSketch, RunningStats, analyze_chunks
+
+
+def _chunks(df, size):
+    return (df.iloc[i:i + size] for i in range(0, len(df), size))
+
+
+class TestRunningStats(unittest.TestCase):
+    def test_matches_numpy_with_large_offset(self):
+        rng = np.random.default_rng(0)
+        values = 1e9 + rng.normal(0, 1, 10_000)
+        values[::13] = np.nan
+        stats = RunningStats()
+        for i in range(0, len(values), 999):
+            stats.update(values[i:i + 999])
+
+        clean = values[~np.isnan(values)]
+        self.assertEqual(stats.count, len(clean))
+        self.assertEqual(stats.nulls, int(np.isnan(values).sum()))
+        self.assertAlmostEqual(stats.mean, clean.mean(), places=6)
+        self.assertAlmostEqual(stats.std, clean.std(ddof=1), places=6)
+        self.assertEqual((stats.min, stats.max), (clean.min(), clean.max()))
+
+    def test_merge_equals_single_pass(self):
+        values = np.arange(100, dtype=float)
+        left, right, single = RunningStats(), RunningStats(), RunningStats()
+        left.update(values[:30])
+        right.update(values[30:])
+        single.update(values)
+        left.merge(right)
+        self.assertAlmostEqual(left.std, single.std)
+        self.assertAlmostEqual(left.mean, single.mean)
+
+
+class TestQuantileSketch(unittest.TestCase):
+    def test_exact_below_capacity(self):
+        values = np.random.default_rng(1).random(500)
+        sketch = QuantileSketch(k=1024)
+        sketch.update(values)
+        self.assertEqual(sketch.quantiles([0.25, 0.5]),
+                         list(np.quantile(values, [0.25, 0.5])))
+
+    def test_rank_error_is_bounded_and_mergeable(self):
+        values = np.random.default_rng(2).random(400_000)
+        left, right = QuantileSketch(seed=1), QuantileSketch(seed=2)
+        for i in range(0, 200_000, 20_000):
+            left.update(values[i:i + 20_000])
+            right.update(values[200_000 + i:200_000 + i + 20_000])
+        left.merge(right)
+
+        self.assertEqual(left.count, len(values))
+        self.assertLess(sum(len(items) for items in left.levels), 3 * left.k)
+        for q, estimate in zip((0.1, 0.5, 0.9), left.quantiles([0.1, 0.5, 0.9])):
+            self.assertLess(abs(estimate - q), 0.01)
+
+
+class TestStreamingAnalysis(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        rng = np.random.default_rng(3)
+        self.df = pd.DataFrame({
+            "region": rng.choice(["norte", "sur"], 5000),
+            "cantidad": rng.integers(0, 100, 5000),
+            "precio": rng.normal(50, 10, 5000),
+        })
+        self.df.loc[::9, "precio"] = np.nan
+        self.csv_path = os.path.join(self.temp_dir, "ventas.csv")
+        self.df.to_csv(self.csv_path, index=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_same_format_as_describe(self):
+        analysis = analyze_chunks(_chunks(self.df, 700))
+        expected = self.df.describe().to_dict()
+
+        self.assertEqual(analysis["total_filas"], 5000)
+        self.assertEqual(analysis["tipos_datos"], self.df.dtypes.to_dict())
+        self.assertEqual(analysis["valores_faltantes"], self.df.isnull().sum().to_dict())
+        self.assertEqual(list(analysis["estadisticas"]), list(expected))
+        for column, stats in expected.items():
+            self.assertEqual(list(analysis["estadisticas"][column]), list(stats))
+            for key in ("count", "mean", "std", "min", "max"):
+                self.assertAlmostEqual(analysis["estadisticas"][column][key], stats[key])
+            self.assertAlmostEqual(analysis["estadisticas"][column]["50%"], stats["50%"],
+                                   delta=0.02 * (stats["max"] - stats["min"]))
+
+    def test_text_only_dataset(self):
+        text = self.df[["region"]]
+        analysis = analyze_chunks(_chunks(text, 700))
+        expected = text.describe().to_dict()["region"]
+        self.assertEqual(analysis["estadisticas"]["region"], expected)
+
+    def test_analyze_data_streaming_writes_report(self):
+        output = os.path.join(self.temp_dir, "analisis.json")
+        result = analyze_data(self.csv_path, output, streaming=True, chunk_rows=1000)
+        self.assertIn("5000 filas x 3 columnas (streaming)", result)
+
+        with open(output, "r", encoding="utf-8") as f:
+            streamed = json.load(f)
+        analyze_data(self.csv_path, output, streaming=False)
+        with open(output, "r", encoding="utf-8") as f:
+            batch = json.load(f)
+        self.assertEqual(streamed.keys(), batch.keys())
+        self.assertEqual(streamed["tipos_datos"], batch["tipos_datos"])
+        self.assertEqual(streamed["valores_faltantes"], batch["valores_faltantes"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,8 @@
 """
 Utilidades generales para ORION.
 """
+import hashlib
+import os
 
 
 def normalize_path(path: str) -> str:
@@ -28,3 +30,25 @@ def normalize_path(path: str) -> str:
     clean_path = clean_path.strip()
 
     return clean_path
+
+
+def file_fingerprint(path: str, content_hash: bool = False) -> dict:
+    """
+    Huella de un archivo para invalidar caches: tamaño y mtime, y opcionalmente
+    el SHA-256 del contenido (más lento, pero inmune a cambios de mtime).
+    """
+    stat = os.stat(path)
+    fingerprint = {
+        "path": os.path.normpath(path),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+    }
+
+    if content_hash:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        fingerprint["sha256"] = digest.hexdigest()
+
+    return fingerprint